@@ -0,0 +1,166 @@
+from __future__ import annotations
+import argparse
+import time
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from itertools import combinations, combinations_with_replacement
+from typing import Dict, List, Optional, Tuple
+
+from card_data import CardData
+from computer_player import ComputerPlayer
+from game import Game
+from heuristics import get_card_priority, DEFAULT_PARAMS
+from opening_book import OpeningBook, CARD_CLASSES, HandKey, get_card_class, get_hand_key, get_land_key
+from util import create_rng
+
+# the book is built by self-play against ComputerPlayer without a book: the candidates of one decision race on the
+# same games (seed substreams), every round the better half plays twice as many games, the rest drops out
+# the first candidate is always the empty book (the heuristics) and wins the ties, so an entry gets into the book only
+# when it beat the heuristics
+DEFAULT_MAX_ROUNDS = 300
+DEFAULT_FIRST_GAMES = 8
+DEFAULT_MAX_GAMES = 128
+DEFAULT_DEALS = 5000
+DEFAULT_HAND_CANDIDATES = 10
+DEFAULT_BOOK_PATH = 'opening_book.json'
+
+CLASS_PRIORITIES: Dict[str, float] = {cardClass: max((get_card_priority(card) for card in
+                                                      CardData.create_playable_catalog()
+                                                      if get_card_class(card) == cardClass), default=0.0)
+                                      for cardClass in CARD_CLASSES}
+
+
+def play_opening(book: OpeningBook, seat: int, seed: int, stream: int,
+                 maxRounds: Optional[int]=DEFAULT_MAX_ROUNDS) -> float:
+    # 1 the player with the book in the seat (1 or 2) won, 0 lost, 0.5 nobody won
+    players = [partial(ComputerPlayer, book=book), ComputerPlayer]
+    if seat == 2:
+        players.reverse()
+    game = Game(*players, headless=True, seed=seed, stream=stream)
+    winner = game.play(maxRounds)
+    if winner is None:
+        return 0.5
+    return 1.0 if winner.number == seat else 0.0
+
+
+def race(executor: Executor, books: List[OpeningBook], seat: int, seed: int, streams: List[int],
+         firstGames: int=DEFAULT_FIRST_GAMES, maxRounds: Optional[int]=DEFAULT_MAX_ROUNDS) -> Tuple[int, float, int]:
+    # successive halving, returns the index of the best book, its score and the number of its games
+    scores = [0.0] * len(books)
+    alive = list(range(len(books)))
+    played, games = 0, firstGames
+    while True:
+        batch = streams[played:games]
+        futures = [(idx, executor.submit(play_opening, books[idx], seat, seed, stream, maxRounds))
+                   for idx in alive for stream in batch]
+        for idx, future in futures:
+            scores[idx] += future.result()
+        played += len(batch)
+        if len(alive) == 1 or played >= len(streams):
+            break
+        # sorted() is stable -> the earlier candidates win the ties
+        alive = sorted(alive, key=lambda idx: -scores[idx])[:max(len(alive) // 2, 1)]
+        games *= 2
+    best = max(alive, key=lambda idx: scores[idx])
+    return best, scores[best] / max(played, 1), played
+
+
+def get_land_candidates(landIds: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+    # the two lands in the middle and the pairs on the sides, the order inside a column and the side of a pair are
+    # taken for symmetric -> 15 * 3 arrangements of six lands
+    candidates = []
+    for middle in combinations(landIds, 2):
+        rest = [land for land in landIds if land not in middle]
+        for partner in rest[1:]:
+            right = (rest[0], partner)
+            left = tuple(land for land in rest[1:] if land != partner)
+            candidates.append(middle + right + left)
+    return candidates
+
+
+def get_hand_candidates(key: HandKey, count: int=DEFAULT_HAND_CANDIDATES) -> List[Tuple[str, ...]]:
+    # the hands of the best value by the class priorities, a class twice loses the duplicate penalty
+    def value(hand: Tuple[str, ...]) -> float:
+        return sum(CLASS_PRIORITIES[cardClass] for cardClass in hand) - \
+            DEFAULT_PARAMS.duplicatePenalty * (len(hand) - len(set(hand)))
+
+    hands = sorted(combinations_with_replacement(key, 3), key=value, reverse=True)
+    return hands[:count]
+
+
+def build_land_book(executor: Executor, seed: int, maxGames: int=DEFAULT_MAX_GAMES,
+                    firstGames: int=DEFAULT_FIRST_GAMES, maxRounds: Optional[int]=DEFAULT_MAX_ROUNDS,
+                    verbose: bool=False) -> OpeningBook:
+    book = OpeningBook()
+    game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=seed)
+    for seat, player in [(1, game.player1), (2, game.player2)]:
+        key = get_land_key(player.landscapeCards)
+        arrangements = get_land_candidates(key)
+        books = [OpeningBook()] + [OpeningBook(lands={key: arrangement}) for arrangement in arrangements]
+        best, score, played = race(executor, books, seat, seed, list(range(maxGames)), firstGames, maxRounds)
+        book.update(books[best])
+        if verbose:
+            print(f'lands of player{seat}: {books[best].lands.get(key, "as dealt")}, '
+                  f'score {score:.3f} in {played} games', flush=True)
+    return book
+
+
+def find_hand_streams(seed: int, deals: int) -> Dict[HandKey, List[int]]:
+    # the deals (seed substreams) by the pile player1 takes the starting cards from
+    streams: Dict[HandKey, List[int]] = defaultdict(list)
+    for stream in range(deals):
+        game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=seed, stream=stream)
+        streams[get_hand_key(game.player1.select_pile())].append(stream)
+    return streams
+
+
+def build_hand_book(executor: Executor, seed: int, deals: int=DEFAULT_DEALS, maxGames: int=DEFAULT_MAX_GAMES,
+                    firstGames: int=DEFAULT_FIRST_GAMES, candidates: int=DEFAULT_HAND_CANDIDATES,
+                    maxKeys: Optional[int]=None, maxRounds: Optional[int]=DEFAULT_MAX_ROUNDS,
+                    verbose: bool=False) -> OpeningBook:
+    # only player1 is played, its pile is the one dealt; the piles seen in fewer than firstGames deals are skipped
+    book = OpeningBook()
+    keys = sorted(find_hand_streams(seed, deals).items(), key=lambda item: len(item[1]), reverse=True)
+    keys = [(key, streams) for key, streams in keys if len(streams) >= firstGames][:maxKeys]
+    for key, streams in keys:
+        books = [OpeningBook()] + [OpeningBook(hands={key: hand}) for hand in get_hand_candidates(key, candidates)]
+        best, score, played = race(executor, books, 1, seed, streams[:maxGames], firstGames, maxRounds)
+        book.update(books[best])
+        if verbose:
+            print(f'pile {key}: {books[best].hands.get(key, "heuristics")}, score {score:.3f} in {played} games',
+                  flush=True)
+    return book
+
+
+def main():
+    parser = argparse.ArgumentParser(description='build the opening book of the computer player by self-play')
+    parser.add_argument('-o', '--output', default=DEFAULT_BOOK_PATH, help='JSON file of the book')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='worker processes (default: cpu count)')
+    parser.add_argument('-s', '--seed', type=int, default=None, help='seed of the whole run (default: random)')
+    parser.add_argument('-n', '--games', type=int, default=DEFAULT_MAX_GAMES,
+                        help='games of the best candidate of a decision at most')
+    parser.add_argument('--first-games', type=int, default=DEFAULT_FIRST_GAMES,
+                        help='games of every candidate before the worse half drops out')
+    parser.add_argument('--deals', type=int, default=DEFAULT_DEALS, help='deals searched for the starting piles')
+    parser.add_argument('--candidates', type=int, default=DEFAULT_HAND_CANDIDATES,
+                        help='starting hands tried for a pile')
+    parser.add_argument('--max-piles', type=int, default=None, help='most frequent starting piles in the book')
+    parser.add_argument('--max-rounds', type=int, default=DEFAULT_MAX_ROUNDS,
+                        help='games not decided after this many rounds have no winner')
+    args = parser.parse_args()
+
+    _, seed = create_rng(args.seed)
+    print(f'building the opening book, seed {seed}', flush=True)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        book = build_land_book(executor, seed, args.games, args.first_games, args.max_rounds, verbose=True)
+        book.update(build_hand_book(executor, seed, args.deals, args.games, args.first_games, args.candidates,
+                                    args.max_piles, args.max_rounds, verbose=True))
+    book.save(args.output)
+    print(f'{len(book.lands)} land setups and {len(book.hands)} starting hands written to {args.output}, '
+          f'{time.perf_counter() - start:.0f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -32,6 +32,8 @@ class Landscape(Card):
         self.resource: Resource = resource
         self.diceNumber = diceNumber
         self.resourcesHeld = 0
+        # index of the card in CardData.LANDSCAPE_CARD_LIST (counts expanded), -1 for cards not made by CardData
+        self.cardId: int = -1
         self.pos: Optional[Pos] = None
         self.player: Optional[Player] = None
         self.settlements: List[Settlement] = []
@@ -71,6 +73,8 @@ class Playable(Card, ABC):
     def __init__(self, name: str):
         super().__init__(name)
         self.player: Optional[Player] = None
+        # index of the card in CardData.create_playable_catalog(), -1 for cards not made by CardData
+        self.cardId: int = -1
 
 class Action(Playable):
     def __init__(self, name: str):
@@ -101,3 +105,4 @@ class Fleet(Buildable):
         super().__init__(name, cost)
         self.affectedResource: Resource = affectedResource
         self.tradePoints: int = tradePoints
+
@@ -1,4 +1,4 @@
-import random
+from random import Random
 from typing import List, TypedDict, Optional, Set
 import config
 from card import Landscape, Event, Playable, Fleet, Knight, Building, Action
@@ -50,7 +50,7 @@ class NamedData(TypedDict):
 
 class CardData:
     @staticmethod
-    def create_landscape_cards(player1: Player, player2: Player) -> List[Landscape]:
+    def create_landscape_cards(player1: Player, player2: Player, rng: Random) -> List[Landscape]:
         cards: List[Landscape] = []
 
         for landscapeCard in CardData.LANDSCAPE_CARD_LIST:
@@ -60,6 +60,7 @@ class CardData:
                     landscapeCard['resource'],
                     landscapeCard['dice']
                 )
+                card.cardId = len(cards)
 
                 if landscapeCard['player'] is None:
                     pass
@@ -71,22 +72,22 @@ class CardData:
                     raise ValueError(f"invalid player: {landscapeCard['player']}")
 
                 cards.append(card)
-        random.shuffle(cards)
+        rng.shuffle(cards)
         return cards
 
     @staticmethod
-    def create_event_cards() -> List[Event]:
+    def create_event_cards(rng: Random) -> List[Event]:
         cards: List[Event] = []
         for eventCard in CardData.EVENT_CARD_LIST:
             for _ in range(eventCard['count']):
                 cards.append(Event(eventCard['name']))
-        random.shuffle(cards)
+        rng.shuffle(cards)
         return cards
 
     @staticmethod
-    def prepare_piles() -> List[Pile]:
+    def prepare_piles(rng: Random) -> List[Pile]:
         cardPiles: List[Pile] = [[] for _ in range(config.PILE_COUNT)]
-        cards: List[Playable] = CardData.create_playable_cards()
+        cards: List[Playable] = CardData.create_playable_cards(rng)
         pileSize = len(cards) // len(cardPiles)
         extraCards = len(cards) % len(cardPiles)
         startIdx, endIdx = 0, pileSize
@@ -101,7 +102,14 @@ class CardData:
         return cardPiles
 
     @staticmethod
-    def create_playable_cards() -> List[Playable]:
+    def create_playable_cards(rng: Random) -> List[Playable]:
+        cards = CardData.create_playable_catalog()
+        rng.shuffle(cards)
+        return cards
+
+    @staticmethod
+    def create_playable_catalog() -> List[Playable]:
+        # all playable cards in a fixed order, position in the list is the card id
         cards: List[Playable] = []
         for fleetData in CardData.FLEET_LIST:
             cards.append(Fleet(
@@ -133,7 +141,8 @@ class CardData:
             for _ in range(actionCardData['count']):
                 cards.append(Action(actionCardData['name']))
 
-        random.shuffle(cards)
+        for cardId, card in enumerate(cards):
+            card.cardId = cardId
         return cards
 
     KNIGHT_LIST: List[KnightData] = [
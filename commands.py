@@ -0,0 +1,236 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Tuple, TYPE_CHECKING
+
+from config import MAX_LAND_RESOURCES
+from enums import ActionType
+from game_state import GameState, PLAYABLE_CARDS, BOARD_WIDTH, EMPTY, SLOT, PATH, VILLAGE, TOWN, PLAYABLE_BASE, \
+    VILLAGE_IDX, PATH_IDX, TOWN_IDX
+from move_generator import Move, INFRA_COSTS, PLAYABLE_COSTS, TOWN_ONLY, LAND_RESOURCE_IDX, RESOURCES, GOLD_IDX, \
+    get_resource_vector, get_trade_rates, can_afford
+
+if TYPE_CHECKING:
+    from game import Game
+
+# x of the starting path of both players, new villages get their lands on the side away from it
+MID_COLUMN = BOARD_WIDTH // 2
+SCOUT_CARDS = frozenset(idx for idx, card in enumerate(PLAYABLE_CARDS) if card.name == 'scout')
+
+
+def pay_cost(state: GameState, player: int, cost: Tuple[int, ...]) -> None:
+    # each resource is paid from the fullest land first, the same choice as ComputerPlayer.select_card_to_pay
+    for resourceIdx, amount in enumerate(cost):
+        for _ in range(amount):
+            lands = [land for land in state.get_lands(player)
+                     if LAND_RESOURCE_IDX[land] == resourceIdx and state.landHeld[land] > 0]
+            assert lands, f'cannot pay {RESOURCES[resourceIdx].value}'
+            land = max(lands, key=lambda l: state.landHeld[l])
+            state.set_land_held(land, state.landHeld[land] - 1)
+
+def take_new_land(state: GameState, player: int) -> int:
+    # like Player.place_new_land with the choices of ComputerPlayer: a scout in hand is always used (and kept), it picks
+    # the land as select_new_land does, without a scout the land comes from the end of the deck
+    if SCOUT_CARDS.isdisjoint(state.hands[player]):
+        return state.landDeck[-1]
+    owned = [LAND_RESOURCE_IDX[land] for land in state.get_lands(player)]
+    return min(state.landDeck,
+               key=lambda land: (owned.count(LAND_RESOURCE_IDX[land]), LAND_RESOURCE_IDX[land] != GOLD_IDX))
+
+def is_own_mid_row(state: GameState, player: int, pos: int) -> bool:
+    return pos // BOARD_WIDTH == state.midRows[player]
+
+def is_next_to(state: GameState, pos: int, codes: Tuple[int, ...]) -> bool:
+    x, y = pos % BOARD_WIDTH, pos // BOARD_WIDTH
+    row = state.board[y]
+    return (x > 0 and row[x - 1] in codes) or (x + 1 < BOARD_WIDTH and row[x + 1] in codes)
+
+
+class Command(ABC):
+    # one pre-decided action of the current player
+    # validate() tells whether the action is legal in the state, apply() changes the state and expects a valid action
+    actionType: ActionType
+
+    @abstractmethod
+    def validate(self, state: GameState) -> bool:
+        pass
+
+    @abstractmethod
+    def apply(self, state: GameState) -> None:
+        pass
+
+    @abstractmethod
+    def to_move(self) -> Move:
+        pass
+
+    def execute(self, game: Game) -> None:
+        # applies the action to a running game, nobody is asked for any decision
+        # the moves may come from a replay or the network -> checked even under python -O
+        state = game.get_state()
+        if not self.validate(state):
+            raise ValueError(f'{self} is not valid')
+        self.apply(state)
+        game.set_state(state)
+
+
+@dataclass(frozen=True)
+class PlayCard(Command):
+    card: int
+    pos: int
+    actionType = ActionType.BUILD_FROM_HAND
+
+    def validate(self, state: GameState) -> bool:
+        player = state.current
+        cost = PLAYABLE_COSTS[self.card]
+        if cost is None or self.card not in state.hands[player]:
+            return False
+        x, y = self.pos % BOARD_WIDTH, self.pos // BOARD_WIDTH
+        midRow = state.midRows[player]
+        if not 1 <= abs(y - midRow) <= 2 or state.board[y][x] != SLOT:
+            return False
+        settlement = state.board[midRow][x]
+        if settlement != TOWN and (settlement != VILLAGE or abs(y - midRow) == 2 or TOWN_ONLY[self.card]):
+            return False
+        return can_afford(get_resource_vector(state, player), cost)
+
+    def apply(self, state: GameState) -> None:
+        player = state.current
+        state.remove_from_hand(player, self.card)
+        state.set_square(self.pos % BOARD_WIDTH, self.pos // BOARD_WIDTH, PLAYABLE_BASE + self.card)
+        cost = PLAYABLE_COSTS[self.card]
+        assert cost is not None
+        pay_cost(state, player, cost)
+
+    def to_move(self) -> Move:
+        return self.actionType, self.card, self.pos
+
+
+@dataclass(frozen=True)
+class BuildVillage(Command):
+    pos: int
+    actionType = ActionType.BUILD_VILLAGE
+
+    def validate(self, state: GameState) -> bool:
+        player = state.current
+        x = self.pos % BOARD_WIDTH
+        return is_own_mid_row(state, player, self.pos) and 0 < x < BOARD_WIDTH - 1 \
+            and state.board[self.pos // BOARD_WIDTH][x] == EMPTY and is_next_to(state, self.pos, (PATH,)) \
+            and state.infraLeft[VILLAGE_IDX] > 0 and len(state.landDeck) >= 2 \
+            and can_afford(get_resource_vector(state, player), INFRA_COSTS[VILLAGE_IDX])
+
+    def apply(self, state: GameState) -> None:
+        player = state.current
+        x, y = self.pos % BOARD_WIDTH, self.pos // BOARD_WIDTH
+        state.use_infra(VILLAGE_IDX)
+        pay_cost(state, player, INFRA_COSTS[VILLAGE_IDX])
+        state.set_square(x, y, VILLAGE)
+        landX = x + 1 if x > MID_COLUMN else x - 1
+        for dy in (-1, 1):
+            state.set_square(x, y + dy, SLOT)
+            state.place_land(take_new_land(state, player), player, landX, y + dy)
+
+    def to_move(self) -> Move:
+        return self.actionType, -1, self.pos
+
+
+@dataclass(frozen=True)
+class BuildTown(Command):
+    pos: int
+    actionType = ActionType.BUILD_TOWN
+
+    def validate(self, state: GameState) -> bool:
+        player = state.current
+        return is_own_mid_row(state, player, self.pos) \
+            and state.board[self.pos // BOARD_WIDTH][self.pos % BOARD_WIDTH] == VILLAGE \
+            and state.infraLeft[TOWN_IDX] > 0 \
+            and can_afford(get_resource_vector(state, player), INFRA_COSTS[TOWN_IDX])
+
+    def apply(self, state: GameState) -> None:
+        x, y = self.pos % BOARD_WIDTH, self.pos // BOARD_WIDTH
+        state.use_infra(TOWN_IDX)
+        pay_cost(state, state.current, INFRA_COSTS[TOWN_IDX])
+        state.set_square(x, y, TOWN)
+        for dy in (-2, 2):
+            state.set_square(x, y + dy, SLOT)
+
+    def to_move(self) -> Move:
+        return self.actionType, -1, self.pos
+
+
+@dataclass(frozen=True)
+class BuildPath(Command):
+    pos: int
+    actionType = ActionType.BUILD_PATH
+
+    def validate(self, state: GameState) -> bool:
+        player = state.current
+        return is_own_mid_row(state, player, self.pos) \
+            and state.board[self.pos // BOARD_WIDTH][self.pos % BOARD_WIDTH] == EMPTY \
+            and is_next_to(state, self.pos, (VILLAGE, TOWN)) and state.infraLeft[PATH_IDX] > 0 \
+            and can_afford(get_resource_vector(state, player), INFRA_COSTS[PATH_IDX])
+
+    def apply(self, state: GameState) -> None:
+        state.use_infra(PATH_IDX)
+        pay_cost(state, state.current, INFRA_COSTS[PATH_IDX])
+        state.set_square(self.pos % BOARD_WIDTH, self.pos // BOARD_WIDTH, PATH)
+
+    def to_move(self) -> Move:
+        return self.actionType, -1, self.pos
+
+
+@dataclass(frozen=True)
+class BankTrade(Command):
+    # pays the trade rate of the resource, the land gets one resource of its kind
+    land: int
+    resource: int
+    actionType = ActionType.BANK_TRADE
+
+    def validate(self, state: GameState) -> bool:
+        player = state.current
+        rate = get_trade_rates(state, player)[self.resource]
+        return state.landOwner[self.land] == player and state.landHeld[self.land] < MAX_LAND_RESOURCES \
+            and LAND_RESOURCE_IDX[self.land] != self.resource \
+            and get_resource_vector(state, player)[self.resource] >= rate
+
+    def apply(self, state: GameState) -> None:
+        player = state.current
+        cost = [0] * len(RESOURCES)
+        cost[self.resource] = get_trade_rates(state, player)[self.resource]
+        pay_cost(state, player, tuple(cost))
+        state.set_land_held(self.land, state.landHeld[self.land] + 1)
+
+    def to_move(self) -> Move:
+        return self.actionType, self.land, self.resource
+
+
+@dataclass(frozen=True)
+class EndTurn(Command):
+    # passes the turn only, refilling the hand and the dice of the next turn are not part of the command
+    actionType = ActionType.END_TURN
+
+    def validate(self, state: GameState) -> bool:
+        return True
+
+    def apply(self, state: GameState) -> None:
+        state.end_turn()
+
+    def to_move(self) -> Move:
+        return self.actionType, -1, -1
+
+
+def create_command(move: Move) -> Command:
+    actionType, card, pos = move
+    if actionType == ActionType.BUILD_FROM_HAND:
+        return PlayCard(card, pos)
+    if actionType == ActionType.BUILD_VILLAGE:
+        return BuildVillage(pos)
+    if actionType == ActionType.BUILD_TOWN:
+        return BuildTown(pos)
+    if actionType == ActionType.BUILD_PATH:
+        return BuildPath(pos)
+    if actionType == ActionType.BANK_TRADE:
+        return BankTrade(card, pos)
+    if actionType == ActionType.END_TURN:
+        return EndTurn()
+    # action cards toss dice and ask both players for decisions, they are played through Player.play_action_card
+    raise ValueError(f'no command for {actionType}')
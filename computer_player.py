@@ -1,24 +1,34 @@
 from __future__ import annotations
 
-from copy import deepcopy
-from typing import TYPE_CHECKING, Optional, Type
-from card import Town, Path, Village, Playable, Action, Landscape, Buildable, Building, Knight, Fleet
-from config import MAX_LAND_RESOURCES, RESOURCE_LIST
+from typing import TYPE_CHECKING, Callable, Optional, Type, List, Tuple
+from card import Town, Path, Village, Playable, Action, Landscape, Buildable, Building, Knight, Fleet, SettlementSlot
+from config import MAX_LAND_RESOURCES
 from custom_types import Pile
 from enums import Resource
+from heuristics import HeuristicParams, DEFAULT_PARAMS, get_card_priority
+from opening_book import OpeningBook, get_card_class
 from player import Player
 from time import sleep
+from util import Pos, is_protected_from_civil_war
 
 if TYPE_CHECKING:
     from game import Game
-    from util import Pos, Cost
+    from util import Cost
     from board import Board
 
 class ComputerPlayer(Player):
-    def __init__(self, game: Game, handBoard: Board, number: int, midPos: Pos):
+    def __init__(self, game: Game, handBoard: Board, number: int, midPos: Pos,
+                 params: HeuristicParams=DEFAULT_PARAMS, book: Optional[OpeningBook]=None):
         super().__init__(game, handBoard, number, False, midPos)
 
+        # the priorities and the build order, e.g. Game(partial(ComputerPlayer, params=tunedParams), ComputerPlayer)
+        self.params: HeuristicParams = params
+        # the opening decisions found in the book are not decided by the params
+        self.book: Optional[OpeningBook] = book
+
         self.hasEmptyPath = False
+        # bank trades (resource to pay, resource to get) decided in advance and consumed by Player.trade
+        self.tradePlan: List[Tuple[Resource, Resource]] = []
 
     def __str__(self) -> str:
         return 'computer'
@@ -26,11 +36,13 @@ class ComputerPlayer(Player):
     __repr__ = __str__
 
 
-    def initial_land_setup(self) -> None:
-        # TODO - move gold to the middle
-        pass
+    def initial_land_setup(self, deadline: Optional[float]=None) -> None:
+        # without a book the lands stay as dealt
+        arrangement = self.book.get_land_arrangement(self.landscapeCards) if self.book is not None else None
+        if arrangement is not None:
+            self.arrange_initial_lands(list(arrangement))
 
-    def select_pile(self, unavailablePile: Optional[Pile]=None) -> Pile:
+    def select_pile(self, unavailablePile: Optional[Pile]=None, deadline: Optional[float]=None) -> Pile:
         # TODO
         # always selects the pile with most cards, that is suitable for first select but needs to improve
         # for subsequent selections - at least pick those that haven't been picked (longest), or those we know/think
@@ -41,38 +53,27 @@ class ComputerPlayer(Player):
                 maxLen, resIdx = len(pile), idx
         return self.game.cardPiles[resIdx]
 
-    def pick_starting_cards(self) -> None:
-        # priorities: warehouse, mills 5
+    def pick_starting_cards(self, deadline: Optional[float]=None) -> None:
+        # priorities by default (see HeuristicParams):
+        #             warehouse, mills 5
         #             cloister, scout 4
         #             knight 4 - cost (i.e. 3, 2 or 1)
         #             fleet 2
         #             smithy 1
         #             red building, actions (except scout) 0
 
-        pile = self.select_pile()
-        priorities: dict[Playable, int] = {}
-        for card in pile:
-            if card.name.endswith('mill') or card.name == 'warehouse':
-                priorities[card] = 5
-            elif card.name in ['cloister', 'scout']:
-                priorities[card] = 4
-            elif card.name in ['smithy']:
-                priorities[card] = 1
-            elif isinstance(card, Knight):
-                # knights are ok but we prefer cheaper ones
-                priorities[card] = max(4 - card.cost.total(), 1)
-            elif isinstance(card, Fleet):
-                priorities[card] = 2
-            else:
-                priorities[card] = 0
+        pile = self.select_pile(deadline=deadline)
+        priorities: dict[Playable, float] = {card: self._get_card_priority(card) for card in pile}
+        penalty = self.params.duplicatePenalty
+        # classes of the cards to take by the book
+        bookHand = list(self.book.get_hand(pile) or []) if self.book is not None else []
 
         while len(self.cardsInHand) < self.cardsInHandDefaultCnt:
-            # take a card with the highest priority
-            maxidx, maxprio = -1, -1
-            for idx, card in enumerate(pile):
-                if priorities[card] > maxprio:
-                    maxidx, maxprio = idx, priorities[card]
-            assert maxidx != -1 and maxprio != -1
+            # take a card with the highest priority (of the class the book says)
+            maxidx = self._find_card_to_pick(pile, priorities, bookHand.pop(0) if bookHand else None)
+            if maxidx == -1:
+                maxidx = self._find_card_to_pick(pile, priorities)
+            assert maxidx != -1
             self.cardsInHand.append(pile.pop(maxidx))
 
             # but we don't want any card twice (different mills are not the same card) or two knights or fleets
@@ -80,30 +81,29 @@ class ComputerPlayer(Player):
             chosenCard = self.cardsInHand[-1]
             for card in pile:
                 if card.name == chosenCard.name:
-                    priorities[card] -= 2
+                    priorities[card] -= penalty
                 elif isinstance(card, Knight) and isinstance(chosenCard, Knight):
-                    priorities[card] -= 2
+                    priorities[card] -= penalty
                 elif isinstance(card, Fleet) and isinstance(chosenCard, Fleet):
-                    priorities[card] -= 2
+                    priorities[card] -= penalty
 
         self.refresh_hand_board()
 
     def throw_dice(self) -> None:
-        print('opponent throwing dice')
+        self.game.logger.log('throwing_dice', self.number)
         event = self.game.throw_event_dice()
-        print(f'event: {event}')
+        self.game.logger.log('event_dice', event)
         self.game.handle_dice_events(event)
         diceNumber = self.game.throw_yield_dice()
-        print(f'yield: {diceNumber}')
+        self.game.logger.log('yield_dice', diceNumber)
         self.game.land_yield(diceNumber)
 
-    def pay(self, cost: Cost | int) -> None:
-        pass
-
     def wait_for_ok(self) -> None:
-        sleep(1)
+        # the pause only gives a human watcher time to read the screen
+        if not self.game.headless:
+            sleep(1)
 
-    def grab_any_resource_if_possible(self) -> None:
+    def grab_any_resource_if_possible(self, deadline: Optional[float]=None) -> None:
         if not self.can_grab_resource_from_opponent():
             return
 
@@ -113,40 +113,31 @@ class ComputerPlayer(Player):
             if opponentLand.resourcesHeld > 0:
                 for myLand in self.landscapeCards:
                     if myLand.resource == opponentLand.resource and myLand.resourcesHeld < MAX_LAND_RESOURCES:
-                        opponentLand.resourcesHeld -= 1
-                        myLand.resourcesHeld += 1
-                        assert myLand.pos is not None and opponentLand.pos is not None
-                        self.game.mainBoard.refresh_square(myLand.pos)
-                        self.game.mainBoard.refresh_square(opponentLand.pos)
+                        self.move_resource(opponentLand, myLand)
                         return
 
-    def give_any_resource(self) -> None:
+    def give_any_resource(self, deadline: Optional[float]=None) -> None:
         # TODO - improve, currently it gives anything available
         assert self.opponent is not None
         for opponentLand in self.opponent.landscapeCards:
             if opponentLand.resourcesHeld < MAX_LAND_RESOURCES:
                 for myLand in self.landscapeCards:
                     if myLand.resource == opponentLand.resource and myLand.resourcesHeld > 0:
-                        opponentLand.resourcesHeld += 1
-                        myLand.resourcesHeld -= 1
-                        assert myLand.pos is not None and opponentLand.pos is not None
-                        self.game.mainBoard.refresh_square(myLand.pos)
-                        self.game.mainBoard.refresh_square(opponentLand.pos)
+                        self.move_resource(myLand, opponentLand)
                         return
 
-    def pick_any_resource(self) -> None:
+    def pick_any_resource(self, deadline: Optional[float]=None) -> None:
         # TODO - improve
         for land in self.landscapeCards:
             if land.resourcesHeld < MAX_LAND_RESOURCES:
-                land.resourcesHeld += 1
-                assert land.pos is not None
-                self.game.mainBoard.refresh_square(land.pos)
+                self.move_resource(None, land)
                 return
 
-    def decide_browse_pile(self) -> bool:
+    def decide_browse_pile(self, deadline: Optional[float]=None) -> bool:
         return False
 
-    def select_new_card_position(self, infraType: Type[Village | Path | Town | Playable], townOnly=False) -> Optional[Pos]:
+    def select_new_card_position(self, infraType: Type[Village | Path | Town | Playable], townOnly=False,
+                                 deadline: Optional[float]=None) -> Optional[Pos]:
         if infraType == Village:
             return self._find_place_for_village()
         if infraType == Town:
@@ -154,190 +145,239 @@ class ComputerPlayer(Player):
         if infraType == Path:
             return self._find_place_for_path()
 
-    def select_card_to_pay(self, resource: Optional[Cost]=None) -> Landscape:
-        pass
+    def select_card_to_pay(self, resource: Optional[Cost]=None, deadline: Optional[float]=None) -> Landscape:
+        # pay from the fullest land, the emptier ones are more likely to use their next yield
+        lands = [land for land in self.landscapeCards
+                 if land.resourcesHeld > 0 and (resource is None or resource.get(land.resource) > 0)]
+        assert lands, f'cannot pay {resource}'
+        return max(lands, key=lambda land: land.resourcesHeld)
 
-    def decide_swap_one_card(self) -> bool:
+    def decide_swap_one_card(self, deadline: Optional[float]=None) -> bool:
         return False
 
-    def select_card_to_throw_away(self) -> Playable:
+    def select_card_to_throw_away(self, deadline: Optional[float]=None) -> Playable:
         return self.cardsInHand[0]
 
-    def select_card_from_choice(self, pile: Pile) -> Playable:
-        pass
+    def select_card_from_choice(self, pile: Pile, deadline: Optional[float]=None) -> Playable:
+        assert pile, 'cannot select a card from an empty pile'
+        return max(pile, key=self._get_card_priority)
 
-    def select_opponents_unit_to_remove(self) -> Buildable:
+    def select_opponents_unit_to_remove(self, deadline: Optional[float]=None) -> Buildable:
         for knight in self.opponent.knightsPlayed:
-            if not self.game.is_protected_from_civil_war(knight):
+            if not is_protected_from_civil_war(knight):
                 return knight
 
         for fleet in self.opponent.fleetPlayed:
-            if not self.game.is_protected_from_civil_war(fleet):
+            if not is_protected_from_civil_war(fleet):
                 return fleet
 
         assert False, 'opponent has no knight or fleet to remove'
 
-    def decide_use_defence(self, againstCard: str) -> bool:
+    def decide_use_defence(self, againstCard: str, deadline: Optional[float]=None) -> bool:
         return True
 
-    def select_building_to_burn(self) -> Building:
+    def select_building_to_burn(self, deadline: Optional[float]=None) -> Building:
         assert self.opponent.buildingsPlayed, f"cannot burn anything"
         return self.opponent.buildingsPlayed[0]
 
-    def select_knight_to_kill(self) -> Knight:
+    def select_knight_to_kill(self, deadline: Optional[float]=None) -> Knight:
         assert self.opponent.knightsPlayed, f"cannot kill anyone"
         return self.opponent.knightsPlayed[0]
 
-    def select_opponents_card_to_discard(self) -> Playable:
+    def select_opponents_card_to_discard(self, deadline: Optional[float]=None) -> Playable:
         card = self.game.choiceBoard.get_square(Pos(0, 0))
         assert isinstance(card, Playable), f'choice board has invalid content'
         return card
 
-    def trade_with_caravan(self) -> None:
-        pass
-
-    def select_resource_to_trade_for(self) -> Optional[Resource]:
-        pass
-
-    def select_resource_to_purchase(self) -> Landscape:
-        pass
-
-    def select_card_to_steal_by_spy(self) -> Knight | Fleet | Action:
-        pass
-
-    def decide_use_scout(self) -> bool:
-        return True
-
-    def select_new_land(self) -> Landscape:
-        pass
-
-    def do_actions(self) -> None:
-        while True:
-            if self.can_cover_cost(Town.cost) and self._find_place_for_town() is not None:
-                self.build_infrastructure(Town)
-                continue
-
-            if not self.hasEmptyPath and self.can_cover_cost(Path.cost) and self._find_place_for_path() is not None:
-                self.build_infrastructure(Path)
-                self.hasEmptyPath = True
-                continue
-
-            if self.hasEmptyPath and self.can_cover_cost(Village.cost) and self._find_place_for_village() is not None:
-                self.build_infrastructure(Village)
-                self.hasEmptyPath = False
-                continue
-
-            cardToBuild = self._find_something_to_build()
-            if cardToBuild is not None:
-                pos = self._find_pos_for_building(cardToBuild)
-                if pos is not None:
-                    self.play_card_from_hand(cardToBuild, pos)
-                    continue
+    def trade_with_caravan(self, deadline: Optional[float]=None) -> None:
+        # swaps the most plentiful resource for the scarcest one, regardless of what is going to be built
+        landToPay = max(self.landscapeCards, key=lambda land: land.resourcesHeld)
+        landsToGet = [land for land in self.landscapeCards
+                      if land.resource != landToPay.resource and land.resourcesHeld < MAX_LAND_RESOURCES]
+        if not landsToGet or landToPay.resourcesHeld < 1:
+            return
+        landToGet = min(landsToGet, key=lambda land: land.resourcesHeld)
 
-            actionCardToPlay = self._find_action_card_to_play()
-            if actionCardToPlay is not None:
-                self.play_card_from_hand(actionCardToPlay)
-                continue
+        self.move_resource(landToPay, landToGet)
 
-            if self._can_cover_cost_with_trade(Town.cost) and self._find_place_for_town() is not None:
-                self.trade_to_cover_cost(Town.cost)
-                self.build_infrastructure(Town)
-                continue
+    def select_resource_to_trade_for(self, deadline: Optional[float]=None) -> Optional[Resource]:
+        if not self.tradePlan:
+            return None
+        return self.tradePlan[0][0]
 
-            if not self.hasEmptyPath and self._can_cover_cost_with_trade(Path.cost) and self._find_place_for_path() is not None:
-                self.trade_to_cover_cost(Path.cost)
-                self.build_infrastructure(Path)
-                self.hasEmptyPath = True
-                continue
+    def select_resource_to_purchase(self, deadline: Optional[float]=None) -> Landscape:
+        _, resource = self.tradePlan.pop(0)
+        for land in self.landscapeCards:
+            if land.resource == resource and land.resourcesHeld < MAX_LAND_RESOURCES:
+                return land
+        assert False, f'no land can take more {resource}'
 
-            if self.hasEmptyPath and self._can_cover_cost_with_trade(Village.cost) and self._find_place_for_village() is not None:
-                self.trade_to_cover_cost(Village.cost)
-                self.build_infrastructure(Village)
-                self.hasEmptyPath = False
-                continue
+    def select_card_to_steal_by_spy(self, deadline: Optional[float]=None) -> Knight | Fleet | Action:
+        for card in self.opponent.cardsInHand:
+            if isinstance(card, (Knight, Fleet, Action)):
+                return card
+        assert False, 'opponent has nothing to steal'
 
-            cardToBuild = self._find_something_to_build_with_trade()
-            if cardToBuild is not None:
-                pos = self._find_pos_for_building(cardToBuild)
-                if pos is not None:
-                    self.trade_to_cover_cost(cardToBuild)
-                    self.play_card_from_hand(cardToBuild, pos)
-                    continue
+    def decide_use_scout(self, deadline: Optional[float]=None) -> bool:
+        return True
 
-            return
+    def select_new_land(self, deadline: Optional[float]=None) -> Landscape:
+        # prefer resources we do not produce yet, then gold
+        owned = [land.resource for land in self.landscapeCards]
+        return min(self.game.landscapeCards, key=lambda land: (owned.count(land.resource), land.resource != Resource.GOLD))
+
+    def do_actions(self, deadline: Optional[float]=None) -> None:
+        # the builds paid without trading and the action cards in the order of the params, then the builds needing
+        # trades in the same order, after every successful step it starts over
+        params = self.params
+        steps: List[Tuple[float, Callable[[], bool]]] = [
+            (params.townOrder, lambda: self._try_build_town(False)),
+            (params.pathOrder, lambda: self._try_build_path(False)),
+            (params.villageOrder, lambda: self._try_build_village(False)),
+            (params.cardOrder, lambda: self._try_build_card(False)),
+            (params.actionOrder, self._try_play_action_card),
+        ]
+        tradeSteps: List[Tuple[float, Callable[[], bool]]] = [
+            (params.townOrder, lambda: self._try_build_town(True)),
+            (params.pathOrder, lambda: self._try_build_path(True)),
+            (params.villageOrder, lambda: self._try_build_village(True)),
+            (params.cardOrder, lambda: self._try_build_card(True)),
+        ]
+        # sorted() is stable, equal orders keep the default order
+        orderedSteps = [step for _, step in sorted(steps, key=lambda item: item[0])] + \
+            [step for _, step in sorted(tradeSteps, key=lambda item: item[0])]
+        while any(step() for step in orderedSteps):
+            pass
+
+    def trade_to_cover_cost(self, cost: Cost) -> None:
+        tradePlan = self._plan_trades(cost)
+        assert tradePlan is not None, f'cannot trade to cover {cost}'
+        self.tradePlan = tradePlan
+        while self.tradePlan:
+            self.trade()
 
     ####################################################################################################################
     #################   PRIVATE FUNCTIONS   ############################################################################
     ####################################################################################################################
 
-    def _can_trade_resources_with_opponent(self, cost: Cost) -> Cost:
-        opponentResources = self.opponent.get_resources_available()
-        resCost = Cost()
-        for resource in RESOURCE_LIST:
-            resCost.set(resource, min(cost.get(resource), opponentResources.get(resource) > 0))
-        return resCost
-
-    def _choose_what_to_pay_trader(self) -> Resource:
-        pass
-
-    def _choose_what_to_pay_caravan(self) -> Resource:
-        pass
+    def _get_card_priority(self, card: Playable) -> float:
+        return get_card_priority(card, self.params)
 
-    def _can_cover_cost_with_trade(self, cost: Cost) -> bool:
-        if self.can_cover_cost(cost):
-            return True
+    def _find_card_to_pick(self, pile: Pile, priorities: dict[Playable, float], cardClass: Optional[str]=None) -> int:
+        maxidx, maxprio = -1, 0.0
+        for idx, card in enumerate(pile):
+            if cardClass is not None and get_card_class(card) != cardClass:
+                continue
+            if maxidx == -1 or priorities[card] > maxprio:
+                maxidx, maxprio = idx, priorities[card]
+        return maxidx
+
+    def _can_cover(self, cost: Cost, withTrade: bool) -> bool:
+        return self._can_cover_cost_with_trade(cost) if withTrade else self.can_cover_cost(cost)
+
+    def _pay(self, cost: Cost, withTrade: bool) -> None:
+        if withTrade:
+            self.trade_to_cover_cost(cost)
+
+    def _build(self, card: Type[Town | Village | Path] | Buildable, pos: Pos, withTrade: bool) -> None:
+        # observed before the trades, the decision is made from the position without them
+        self.observe_build(card, pos)
+        self._pay(card.cost, withTrade)
+        if isinstance(card, Buildable):
+            self.play_card_from_hand(card, pos)
+        else:
+            self.build_infrastructure(card, pos)
+
+    def _try_build_town(self, withTrade: bool) -> bool:
+        if self._can_build(Town) and self._can_cover(Town.cost, withTrade):
+            pos = self._find_place_for_town()
+            if pos is not None:
+                self._build(Town, pos, withTrade)
+                return True
+        return False
 
-        # step 1 - what can cover by myself
-        resourcesAvail: Cost = self.get_resources_available()
-        missing: int = 0
-        for resource in RESOURCE_LIST:
-            diff = resourcesAvail.get(resource) - cost.get(resource)
-            if diff >= 0:
-                resourcesAvail.take(resource, diff)
-                cost.take(resource, diff)
-            else:
-                resourcesAvail.set(resource, 0)
-                missing -= diff
-                cost.take(resource, -diff)
-
-        # step 2 - what can I cover with trader
-        if self.card_in_hand('trader') and resourcesAvail.total() > 0:
-            tradable = self._can_trade_resources_with_opponent(deepcopy(cost))
-            if tradable.total() > 0:
-                cost.take_any(max(tradable.total(), 2, cost.total()))
-                resourcesAvail.take(self._choose_what_to_pay_trader())
-
-        if cost.is_zero():
-            return True
+    def _try_build_path(self, withTrade: bool) -> bool:
+        if not self.hasEmptyPath and self._can_build(Path) and self._can_cover(Path.cost, withTrade):
+            pos = self._find_place_for_path()
+            if pos is not None:
+                self._build(Path, pos, withTrade)
+                self.hasEmptyPath = True
+                return True
+        return False
 
-        wildcardResources = 0
-        # step 3 - what can I cover with mint
-        if 'mint' in map(lambda x: x.name, self.buildingsPlayed):
-            wildcardResources += resourcesAvail.get(Resource.GOLD)
-            resourcesAvail.set(Resource.GOLD, 0)
+    def _try_build_village(self, withTrade: bool) -> bool:
+        if self.hasEmptyPath and self._can_build(Village) and self._can_cover(Village.cost, withTrade):
+            pos = self._find_place_for_village()
+            if pos is not None:
+                self._build(Village, pos, withTrade)
+                self.hasEmptyPath = False
+                return True
+        return False
 
-        # step 4 - what can I cover with caravan
-        if self.card_in_hand('caravan') and resourcesAvail.total() > 0:
-            cost.take_any(max(2, cost.total()))
-            resourcesAvail.take(self._choose_what_to_pay_caravan())
+    def _try_build_card(self, withTrade: bool) -> bool:
+        cardToBuild = self._find_something_to_build_with_trade() if withTrade else self._find_something_to_build()
+        if cardToBuild is not None:
+            pos = self._find_pos_for_building(cardToBuild)
+            if pos is not None:
+                self._build(cardToBuild, pos, withTrade)
+                return True
+        return False
 
-        if cost.is_zero():
+    def _try_play_action_card(self) -> bool:
+        actionCardToPlay = self._find_action_card_to_play()
+        if actionCardToPlay is not None:
+            self.play_card_from_hand(actionCardToPlay)
             return True
+        return False
 
-        # step 5 - what can I cover with fleets
-        for fleet in self.fleetPlayed:
-            r = resourcesAvail.get(fleet.affectedResource)
-            if r >= 2 and cost.get(fleet.affectedResource) > 0:
-                costToTake = max(r // 2, cost.get(fleet.affectedResource))
-                cost.take(fleet.affectedResource, costToTake)
-                resourcesAvail.take(fleet.affectedResource, costToTake * 2)
+    def _can_build(self, infraType: Type[Town | Village | Path]) -> bool:
+        return self.game.infraCardsLeft[infraType] > 0
 
-        if cost.is_zero():
-            return True
+    def _plan_trades(self, cost: Cost) -> Optional[List[Tuple[Resource, Resource]]]:
+        # bank trades that make the cost affordable, None if there are not enough resources
+        # only the bank is traded with, the trader and caravan cards are never played by the computer player
+        available = self.get_resources_available()
+        surplus = {resource: available.get(resource) - cost.get(resource) for resource in Resource}
+        space = {resource: 0 for resource in Resource}
+        for land in self.landscapeCards:
+            space[land.resource] += MAX_LAND_RESOURCES - land.resourcesHeld
+
+        tradePlan: List[Tuple[Resource, Resource]] = []
+        for missingResource in Resource:
+            while surplus[missingResource] < 0:
+                if space[missingResource] < 1:
+                    return None
+                rates = [(self.get_resource_cost(r), r) for r in Resource
+                         if r != missingResource and surplus[r] >= self.get_resource_cost(r)]
+                if not rates:
+                    return None
+                # cheapest trade first, among those the resource we have most of
+                rate, resourceToPay = min(rates, key=lambda x: (x[0], -surplus[x[1]]))
+                surplus[resourceToPay] -= rate
+                surplus[missingResource] += 1
+                space[missingResource] -= 1
+                space[resourceToPay] += rate
+                tradePlan.append((resourceToPay, missingResource))
+        return tradePlan
 
-        # step 6 - what can I cover with basic trade 3:1
+    def _can_cover_cost_with_trade(self, cost: Cost) -> bool:
+        return self._plan_trades(cost) is not None
 
+    def _find_something_to_build_with_trade(self) -> Optional[Buildable]:
+        for card in self.cardsInHand:
+            if isinstance(card, Buildable) and self._can_cover_cost_with_trade(card.cost):
+                return card
+        return None
 
+    def _find_pos_for_building(self, card: Buildable) -> Optional[Pos]:
+        townOnly = isinstance(card, Building) and card.townOnly
+        for settlement in self.settlements:
+            if townOnly and not isinstance(settlement, Town):
+                continue
+            for slot in settlement.cards:
+                if isinstance(slot, SettlementSlot):
+                    return slot.pos
+        return None
 
     def _find_something_to_build(self) -> Optional[Buildable]:
         for card in self.cardsInHand:
@@ -354,12 +394,19 @@ class ComputerPlayer(Player):
                     return card
                 elif card.name == 'black_knight' and self.opponent.knightsPlayed:
                     return card
-                elif card.name == 'spy':
+                elif card.name == 'spy' and self.spy_can_steal_card():
                     return card
         return None
 
     def _can_grab_resources(self, n: int) -> bool:
-        pass
+        # a resource can be grabbed as many times as the opponent holds it and our lands of it have space
+        held = {resource: 0 for resource in Resource}
+        space = {resource: 0 for resource in Resource}
+        for land in self.opponent.landscapeCards:
+            held[land.resource] += land.resourcesHeld
+        for land in self.landscapeCards:
+            space[land.resource] += MAX_LAND_RESOURCES - land.resourcesHeld
+        return sum(min(held[resource], space[resource]) for resource in Resource) >= n
 
     def _find_place_for_village(self) -> Optional[Pos]:
         for path in self.paths:
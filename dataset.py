@@ -0,0 +1,112 @@
+from __future__ import annotations
+import os
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from game import Game
+from move_generator import Move
+from player import Player
+from value_function import VECTOR_SIZE, fill_feature_vector
+
+# a dataset is a directory of .npy files with one row per decision point (a move of the action phase, END_TURN
+# included), the i-th rows of all files belong together:
+#   features   the feature vector of value_function from the point of view of the deciding player
+#   actions    the move made - action type, card, board index (see move_generator.Move)
+#   outcomes   1 the deciding player won the game, -1 lost it, 0 nobody won
+#   games      game number, round number and the deciding player (0 or 1)
+# the files are opened by np.load(path, mmap_mode='r'), no row is read before it is used
+COLUMNS: Dict[str, Tuple[np.dtype, Tuple[int, ...]]] = {
+    'features': (np.dtype(np.float32), (VECTOR_SIZE,)),
+    'actions': (np.dtype(np.int16), (3,)),
+    'outcomes': (np.dtype(np.int8), ()),
+    'games': (np.dtype(np.int32), (3,)),
+}
+
+GameRecord = Dict[str, np.ndarray]
+
+
+class ArrayFileWriter:
+    # rows appended to a .npy file as they come, the header gets the number of rows on close
+    # the header of a 0 rows array has the room for any count (numpy pads it for arrays growing in place)
+    def __init__(self, path: str, dtype: np.dtype, rowShape: Tuple[int, ...]):
+        self.dtype: np.dtype = dtype
+        self.rowShape: Tuple[int, ...] = rowShape
+        self.rows: int = 0
+        self.file: BinaryIO = open(path, 'wb')
+        self._write_header()
+        self.headerSize: int = self.file.tell()
+
+    def _write_header(self) -> None:
+        header = {'descr': np.lib.format.dtype_to_descr(self.dtype), 'fortran_order': False,
+                  'shape': (self.rows, *self.rowShape)}
+        np.lib.format.write_array_header_1_0(self.file, header)
+
+    def append(self, rows: np.ndarray) -> None:
+        assert rows.shape[1:] == self.rowShape, f'rows of shape {rows.shape[1:]} instead of {self.rowShape}'
+        self.file.write(np.ascontiguousarray(rows, dtype=self.dtype).tobytes())
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        self.file.seek(0)
+        self._write_header()
+        assert self.file.tell() == self.headerSize, 'array header has grown'
+        self.file.close()
+
+
+class DatasetWriter:
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.writers: Dict[str, ArrayFileWriter] = {
+            name: ArrayFileWriter(os.path.join(directory, f'{name}.npy'), dtype, rowShape)
+            for name, (dtype, rowShape) in COLUMNS.items()}
+
+    def __enter__(self) -> DatasetWriter:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def write(self, record: GameRecord) -> None:
+        for name, writer in self.writers.items():
+            writer.append(record[name])
+
+    def close(self) -> None:
+        for writer in self.writers.values():
+            writer.close()
+
+
+class GameRecorder:
+    # collects the decision points of one game through the Game.play callbacks, the outcome is added at the end
+    def __init__(self, gameNo: int):
+        self.gameNo: int = gameNo
+        self.features: List[np.ndarray] = []
+        self.actions: List[Tuple[int, int, int]] = []
+        self.games: List[Tuple[int, int, int]] = []
+
+    def on_move(self, game: Game, player: Player, move: Move) -> None:
+        playerIdx = game.get_player_idx(player)
+        vector = np.zeros(VECTOR_SIZE, dtype=np.float32)
+        fill_feature_vector(game.get_observed_state(), playerIdx, vector)
+        self.features.append(vector)
+        self.actions.append((move[0].value, move[1], move[2]))
+        self.games.append((self.gameNo, game.roundNo, playerIdx))
+
+    def finish(self, winner: Optional[int]) -> GameRecord:
+        # winner - 0 or 1, None for a game without a winner
+        rows = len(self.actions)
+        games = np.array(self.games, dtype=np.int32).reshape(rows, 3)
+        outcomes = np.zeros(rows, dtype=np.int8)
+        if winner is not None:
+            outcomes[:] = np.where(games[:, 2] == winner, 1, -1)
+        return {
+            'features': np.array(self.features, dtype=np.float32).reshape(rows, VECTOR_SIZE),
+            'actions': np.array(self.actions, dtype=np.int16).reshape(rows, 3),
+            'outcomes': outcomes,
+            'games': games,
+        }
+
+
+def open_dataset(directory: str) -> Dict[str, np.ndarray]:
+    # memory mapped, read only
+    return {name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r') for name in COLUMNS}
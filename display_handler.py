@@ -29,8 +29,12 @@ class DisplayHandler:
         self.font = pg.font.Font('freesansbold.ttf', 32)
         self.textTopLeft: Pos = Pos(0, 0)
 
-        for name in CardData.CARD_NAMES:
+    def get_image(self, name: str) -> pg.Surface:
+        # images are loaded on their first use, most of them are not needed for the first screen
+        if name not in self.images:
+            assert name in CardData.CARD_NAMES, f'unknown card image: {name}'
             self.images[name] = pg.image.load('imgs/' + name + '.png').convert_alpha()
+        return self.images[name]
 
     def print_msg(self, msg: str) -> None:
         text = self.font.render(msg + ' '*50, True, (40, 40, 40), BACKGROUND_IMAGE)
@@ -46,7 +50,7 @@ class DisplayHandler:
                     x1, y1, = (pos * (board.squareSize + 2 * space) + space + board.topLeft).tuple()
                     self.screen.fill(BACKGROUND_IMAGE, (x1, y1, *CARD_IMG_SIZE_SMALL))
                 else:
-                    img = pg.transform.scale(self.images[board.get_square(pos).name], board.squareSize.tuple())
+                    img = pg.transform.scale(self.get_image(square.name), board.squareSize.tuple())
                     self.screen.blit(img, (pos * (board.squareSize + 2 * space) + space + board.topLeft).tuple())
                     if isinstance(square, Landscape):
                         text = self.font.render(str(square.resourcesHeld), True, (40, 40, 40), BACKGROUND_IMAGE)
@@ -0,0 +1,41 @@
+from math import tanh
+from typing import Callable, List, Sequence
+
+from game_state import GameState, FEATURES_CNT, RESOURCES_IDX, YIELD_IDX, HAND_POINTS_IDX
+
+# the weights are in victory points, the victory points themselves (trade and battle superiority included) weigh 1
+# strength is worth something below the superiority too, the opponent may lose a unit or the events come
+TRADE_WEIGHT = 0.1
+BATTLE_WEIGHT = 0.1
+TOURNAMENT_WEIGHT = 0.05
+# resources held are worth a fraction of a victory point, spending them on nothing is not free
+RESOURCE_WEIGHT = 0.1
+# one resource more per yield roll, i.e. a third of a village's two lands or a mill for a sixth of the rolls
+YIELD_WEIGHT = 1.0
+HAND_WEIGHT = 0.02
+# a lead of this many victory points evaluates to 0.88
+EVAL_SCALE = 3.0
+
+
+def get_score(state: GameState) -> float:
+    # lead of player 0 in victory points, all terms are kept by the state, nothing is counted here
+    features = state.features
+    score = float(state.get_victory_points(0) - state.get_victory_points(1))
+    score += TRADE_WEIGHT * (state.get_trade_strength(0) - state.get_trade_strength(1))
+    score += BATTLE_WEIGHT * (state.get_battle_strength(0) - state.get_battle_strength(1))
+    score += TOURNAMENT_WEIGHT * (state.get_tournament_strength(0) - state.get_tournament_strength(1))
+    score += RESOURCE_WEIGHT * (features[RESOURCES_IDX] - features[FEATURES_CNT + RESOURCES_IDX])
+    score += YIELD_WEIGHT * (features[YIELD_IDX] - features[FEATURES_CNT + YIELD_IDX]) / 6
+    score += HAND_WEIGHT * (features[HAND_POINTS_IDX] - features[FEATURES_CNT + HAND_POINTS_IDX])
+    return score
+
+def evaluate(state: GameState) -> float:
+    # value of the position for player 0, 1 is a win and 0 a loss
+    return 0.5 + 0.5 * tanh(get_score(state) / EVAL_SCALE)
+
+# values of a batch of positions for player 0 as evaluate gives them, the searches call it with all the positions they
+# have at hand at once, e.g. ValueFunction.evaluate_states
+Evaluator = Callable[[Sequence[GameState]], Sequence[float]]
+
+def evaluate_states(states: Sequence[GameState]) -> List[float]:
+    return [evaluate(state) for state in states]
@@ -0,0 +1,89 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple, Any, TextIO
+
+# every logged event has a name and positional arguments, the text is produced from these templates only when
+# (and if) the event is really written somewhere
+EVENT_FORMATS: Dict[str, str] = {
+    'round': '========  round {} ========',
+    'throwing_dice': 'player {} throwing dice',
+    'event_dice': 'event: {}',
+    'yield_dice': 'yield: {}',
+    'card_event': 'card event: {}',
+    'civil_war_has_unit': 'player {} has something to be removed',
+    'civil_war_no_unit': 'player {} has nothing to be removed',
+    'civil_war_removed': 'selected card: {}, pos: {}',
+    'battle_strength': 'player {} battle strength: {}',
+    'battle_winner': 'battle winner is player{}',
+    'battle_no_winner': 'battle has no winner',
+    'tournament_strength': 'player {} tournament strength: {}',
+    'tournament_winner': 'tournament winner is player{}',
+    'tournament_no_winner': 'tournament has no winner',
+    'trade_strength': 'player {} trade strength: {}',
+    'trade_profit': 'trade profit for player {}',
+    'no_trade_profit': 'no trade profit',
+    'cannot_afford_card': 'you cannot afford to play this: {}',
+    'cannot_afford_infra': 'you cannot afford this: {}',
+    'no_infra_left': 'no more cards {} left',
+    'action_card_not_playable': 'action card {} cannot be played now',
+    'trade_started': 'trading started',
+    'trade_rate': '{} can be traded with rate of {}',
+    'trade_impossible': 'trade not possible, not enough {} available',
+    'defence_activated': 'defence against {} activated',
+    'defence_not_activated': 'defence against {} NOT activated',
+    'toss_succeeded': 'tossed {}, action succeeded',
+    'toss_failed': 'tossed {}, action failed',
+    'pile_already_chosen': 'this pile is already chosen, select another',
+    'nothing_to_grab': 'sadly, no resource can be grabbed',
+    'town_only_card': 'this card needs to be placed in a town',
+    'search_stats': 'player {} searched {} iterations in {:.3f}s, {:.0f} iterations/s',
+}
+
+def format_event(event: str, args: Tuple[Any, ...]) -> str:
+    return EVENT_FORMATS[event].format(*args)
+
+
+class EventLogger(ABC):
+    @abstractmethod
+    def log(self, event: str, *args: Any) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+
+class NullLogger(EventLogger):
+    def log(self, event: str, *args: Any) -> None:
+        pass
+
+
+class StdoutLogger(EventLogger):
+    def log(self, event: str, *args: Any) -> None:
+        print(format_event(event, args))
+
+
+class BufferedFileLogger(EventLogger):
+    # events are kept unformatted until the buffer is full, formatting and writing happen in one batch
+    def __init__(self, path: str, bufferSize: int=1000):
+        self.path: str = path
+        self.bufferSize: int = bufferSize
+        self.buffer: List[Tuple[str, Tuple[Any, ...]]] = []
+        self.file: TextIO = open(path, 'w')
+
+    def log(self, event: str, *args: Any) -> None:
+        self.buffer.append((event, args))
+        if len(self.buffer) >= self.bufferSize:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.buffer:
+            self.file.write(''.join(f'{event}\t{format_event(event, args)}\n' for event, args in self.buffer))
+            self.buffer.clear()
+        self.file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self.file.close()
@@ -0,0 +1,245 @@
+from __future__ import annotations
+from random import Random
+from time import perf_counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from enums import ActionType
+from evaluation import Evaluator, evaluate_states
+from game_state import GameState
+from mcts import SearchStats, MAX_TURN_MOVES, get_tree_moves
+from move_generator import Move, END_TURN_MOVE
+from rules import BUILD_ORDER, apply_dice, apply_turn_move, choose_rollout_move, get_winner
+from transposition import TranspositionTable
+from util import DiceEvents
+
+# the value of any position is within these bounds, the evaluator's values and won/lost games included
+MIN_VALUE, MAX_VALUE = 0.0, 1.0
+DEFAULT_DEPTH = 2
+DEFAULT_MAX_NODES = 20000
+TABLE_BYTES = 4 * 1024 * 1024
+# moves of the last turn the batches of leaves reach, see ExpectimaxSearch
+LEAF_BATCH_MOVES = 2
+
+# both dice at once - (probability, event roll, yield roll), event rolls of the same event are merged
+DICE_OUTCOMES: List[Tuple[float, int, int]] = [
+    (sum(1 for event in DiceEvents.values() if event == DiceEvents[eventRoll]) / 36, eventRoll, yieldRoll)
+    for eventRoll in sorted({min(roll for roll in DiceEvents if DiceEvents[roll] == event)
+                             for event in DiceEvents.values()})
+    for yieldRoll in range(1, 7)
+]
+
+
+class SearchAborted(Exception):
+    pass
+
+
+def order_moves(moves: List[Move]) -> List[Move]:
+    # the likely best moves first, they make the bounds of the others tight, END_TURN goes last
+    return sorted(moves, key=lambda move: BUILD_ORDER.get(move[0], len(BUILD_ORDER)))
+
+
+class ExpectimaxSearch:
+    # expectiminimax of whole turns: the moves of the player on turn, then the dice of the next turn as a chance node
+    # with the exact probabilities, then the moves of the other player, ... depth is the number of turns searched
+    # player 0 maximizes the value, player 1 minimizes it, the chance nodes are pruned by Ballard's star1 and star2
+    # (the first move of every dice outcome is probed before the outcomes are searched fully)
+    # with a node budget the search is deterministic, the new_year shuffle uses a fixed seed
+    # SearchStats.iterations of the search are the nodes visited
+    # the leaves of the last turn are evaluated in batches: when the search gets to the last turn (a chance node
+    # before it or the root of a one turn search) the positions after ending the turn at once or after up to
+    # LEAF_BATCH_MOVES moves are passed to the evaluator in one call, for every dice outcome, the values are kept until
+    # the search ends
+    # the default evaluator costs the same one by one, the batches would only add the leaves of the pruned moves
+    def __init__(self, depth: int=DEFAULT_DEPTH, maxNodes: Optional[int]=DEFAULT_MAX_NODES,
+                 timeLimit: Optional[float]=None, table: Optional[TranspositionTable]=None, seed: int=0,
+                 evaluator: Evaluator=evaluate_states):
+        self.depth: int = depth
+        self.maxNodes: Optional[int] = maxNodes
+        self.timeLimit: Optional[float] = timeLimit
+        self.table: TranspositionTable = table if table is not None else TranspositionTable(TABLE_BYTES)
+        self.seed: int = seed
+        self.evaluator: Evaluator = evaluator
+        self.batchLeaves: bool = evaluator is not evaluate_states
+        # leaf values by GameState.zobrist
+        self.leafValues: Dict[int, float] = {}
+        self.nodes: int = 0
+        self.cutoffs: int = 0
+        self.completedDepth: int = 0
+        self.deadline: Optional[float] = None
+
+    def search(self, state: GameState, turnMoves: int=0,
+               deadline: Optional[float]=None) -> Tuple[Move, float, SearchStats]:
+        # iterative deepening, when the budget runs out the move of the last completed depth is returned, the move of
+        # the rollout policy when not even the first depth was
+        # deadline - time.perf_counter() value, the search returns at most one node after it
+        start = perf_counter()
+        self.deadline = start + self.timeLimit if self.timeLimit is not None else None
+        if deadline is not None:
+            self.deadline = deadline if self.deadline is None else min(self.deadline, deadline)
+        self.nodes = self.cutoffs = self.completedDepth = 0
+        self.leafValues = {}
+        self.table.new_search()
+        bestMove, bestValue = choose_rollout_move(state, Random(self.seed)), float(self.evaluator([state])[0])
+        if turnMoves >= MAX_TURN_MOVES:
+            bestMove = END_TURN_MOVE
+        for depth in range(1, self.depth + 1):
+            try:
+                bestMove, bestValue = self._search_root(state, depth, turnMoves)
+            except SearchAborted:
+                break
+            self.completedDepth = depth
+        return bestMove, bestValue, SearchStats(self.nodes, perf_counter() - start)
+
+    def _search_root(self, state: GameState, depth: int, turnMoves: int) -> Tuple[Move, float]:
+        maximize = state.current == 0
+        bestMove: Optional[Move] = None
+        bestValue = MIN_VALUE if maximize else MAX_VALUE
+        alpha, beta = MIN_VALUE, MAX_VALUE
+        if depth == 1 and self.batchLeaves:
+            self._evaluate_leaves([state], turnMoves)
+        for move in order_moves(get_tree_moves(state, turnMoves)):
+            value = self._move_value(state, move, depth, turnMoves, alpha, beta)
+            if bestMove is None or (value > bestValue if maximize else value < bestValue):
+                bestMove, bestValue = move, value
+            if maximize:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+        assert bestMove is not None
+        return bestMove, bestValue
+
+    def _count_node(self) -> None:
+        self.nodes += 1
+        if self.maxNodes is not None and self.nodes > self.maxNodes:
+            raise SearchAborted()
+        if self.deadline is not None and perf_counter() > self.deadline:
+            raise SearchAborted()
+
+    def _move_value(self, state: GameState, move: Move, turnsLeft: int, turnMoves: int, alpha: float,
+                    beta: float) -> float:
+        child = state.fork()
+        apply_turn_move(child, move)
+        if move[0] == ActionType.END_TURN:
+            return self._turn_end(child, turnsLeft - 1, alpha, beta)
+        return self._turn_node(child, turnsLeft, turnMoves + 1, alpha, beta)
+
+    def _turn_node(self, state: GameState, turnsLeft: int, turnMoves: int, alpha: float, beta: float) -> float:
+        # fail-soft alpha-beta over the moves of the player on turn
+        self._count_node()
+        entry = self.table.lookup(state.zobrist)
+        if entry is not None and entry[2] >= turnsLeft:
+            return entry[0]
+
+        maximize = state.current == 0
+        best = MIN_VALUE if maximize else MAX_VALUE
+        lowAlpha, highBeta = alpha, beta
+        for move in order_moves(get_tree_moves(state, turnMoves)):
+            value = self._move_value(state, move, turnsLeft, turnMoves, alpha, beta)
+            if maximize:
+                best = max(best, value)
+                alpha = max(alpha, value)
+            else:
+                best = min(best, value)
+                beta = min(beta, value)
+            if alpha >= beta:
+                self.cutoffs += 1
+                return best
+        # only values inside the original window are exact
+        if lowAlpha < best < highBeta:
+            self.table.store(state.zobrist, best, 1, turnsLeft)
+        return best
+
+    def _turn_end(self, state: GameState, turnsLeft: int, alpha: float, beta: float) -> float:
+        winner = get_winner(state)
+        if winner is not None:
+            return MAX_VALUE if winner == 0 else MIN_VALUE
+        if turnsLeft <= 0:
+            value = self.leafValues.get(state.zobrist)
+            if value is None:
+                value = self.leafValues[state.zobrist] = float(self.evaluator([state])[0])
+            return value
+        return self._chance_node(state, turnsLeft, alpha, beta)
+
+    def _evaluate_leaves(self, states: Sequence[GameState], turnMoves: int) -> None:
+        # the positions after the turn of every state ends at once or after up to LEAF_BATCH_MOVES more moves, one
+        # evaluator call
+        leaves: Dict[int, GameState] = {}
+        for _ in range(LEAF_BATCH_MOVES + 1):
+            nextStates = []
+            for state in states:
+                for move in get_tree_moves(state, turnMoves):
+                    child = state.fork()
+                    apply_turn_move(child, move)
+                    if move[0] != ActionType.END_TURN:
+                        nextStates.append(child)
+                        continue
+                    if child.zobrist not in self.leafValues and get_winner(child) is None:
+                        leaves[child.zobrist] = child
+            states, turnMoves = nextStates, turnMoves + 1
+        if leaves:
+            self.leafValues.update(zip(leaves, map(float, self.evaluator(list(leaves.values())))))
+
+    def _get_outcomes(self, state: GameState) -> List[Tuple[float, GameState]]:
+        # dice outcomes leading to the same position are one outcome
+        outcomes: Dict[int, Tuple[float, GameState]] = {}
+        for probability, eventRoll, yieldRoll in DICE_OUTCOMES:
+            child = state.fork()
+            apply_dice(child, eventRoll, yieldRoll, Random(self.seed))
+            if child.zobrist in outcomes:
+                outcomes[child.zobrist] = (outcomes[child.zobrist][0] + probability, outcomes[child.zobrist][1])
+            else:
+                outcomes[child.zobrist] = (probability, child)
+        return list(outcomes.values())
+
+    def _chance_node(self, state: GameState, turnsLeft: int, alpha: float, beta: float) -> float:
+        self._count_node()
+        outcomes = self._get_outcomes(state)
+        lower = [MIN_VALUE] * len(outcomes)
+        upper = [MAX_VALUE] * len(outcomes)
+        maximize = state.current == 0
+        if turnsLeft == 1 and self.batchLeaves:
+            self._evaluate_leaves([child for _, child in outcomes], 0)
+
+        # star2 - one move of every outcome bounds it from the side of the player on turn, probed with the window of
+        # star1 so that it fails high or low cheaply
+        for idx, (probability, child) in enumerate(outcomes):
+            otherLower = sum(p * low for (p, _), low in zip(outcomes, lower)) - probability * lower[idx]
+            otherUpper = sum(p * high for (p, _), high in zip(outcomes, upper)) - probability * upper[idx]
+            childAlpha = max((alpha - otherUpper) / probability, lower[idx])
+            childBeta = min((beta - otherLower) / probability, upper[idx])
+            moves = order_moves(get_tree_moves(child, 0))
+            value = self._move_value(child, moves[0], turnsLeft, 0, childAlpha, childBeta)
+            # a fail-soft value is a bound of the move from one side only, the move bounds the outcome only when its
+            # value is exact or a bound from the side of the player on turn
+            if maximize and value > childAlpha:
+                lower[idx] = value
+            elif not maximize and value < childBeta:
+                upper[idx] = value
+            if sum(p * low for (p, _), low in zip(outcomes, lower)) >= beta:
+                self.cutoffs += 1
+                return sum(p * low for (p, _), low in zip(outcomes, lower))
+            if sum(p * high for (p, _), high in zip(outcomes, upper)) <= alpha:
+                self.cutoffs += 1
+                return sum(p * high for (p, _), high in zip(outcomes, upper))
+
+        # star1 - every outcome is searched with the window that can still change the expected value
+        for idx, (probability, child) in enumerate(outcomes):
+            otherLower = sum(p * low for (p, _), low in zip(outcomes, lower)) - probability * lower[idx]
+            otherUpper = sum(p * high for (p, _), high in zip(outcomes, upper)) - probability * upper[idx]
+            childAlpha = max((alpha - otherUpper) / probability, lower[idx])
+            childBeta = min((beta - otherLower) / probability, upper[idx])
+            value = self._turn_node(child, turnsLeft, 0, childAlpha, childBeta)
+            # a fail-soft value outside the window bounds the outcome from one side only
+            if value <= childAlpha:
+                upper[idx] = value
+            elif value >= childBeta:
+                lower[idx] = value
+            else:
+                lower[idx] = upper[idx] = value
+            if otherUpper + probability * upper[idx] <= alpha:
+                self.cutoffs += 1
+                return otherUpper + probability * upper[idx]
+            if otherLower + probability * lower[idx] >= beta:
+                self.cutoffs += 1
+                return otherLower + probability * lower[idx]
+        return sum(p * low for (p, _), low in zip(outcomes, lower))
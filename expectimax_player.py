@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+from evaluation import Evaluator, evaluate_states
+from expectimax import ExpectimaxSearch, DEFAULT_DEPTH, DEFAULT_MAX_NODES, TABLE_BYTES
+from ismcts import determinize
+from mcts_player import MctsPlayer
+from move_generator import Move
+from transposition import TranspositionTable
+from util import Pos
+
+if TYPE_CHECKING:
+    from game import Game
+    from board import Board
+    from game_state import GameState
+
+
+class ExpectimaxPlayer(MctsPlayer):
+    # plans the action phase by expectimax over the next turns instead of sampling, see ExpectimaxSearch
+    # the hidden cards are dealt once per decision (a single determinization) unless perfectInformation is set
+    def __init__(self, game: Game, handBoard: Board, number: int, midPos: Pos, depth: int=DEFAULT_DEPTH,
+                 maxNodes: Optional[int]=DEFAULT_MAX_NODES, timeLimit: Optional[float]=None,
+                 perfectInformation: bool=False, evaluator: Evaluator=evaluate_states):
+        super().__init__(game, handBoard, number, midPos, timeLimit=timeLimit, perfectInformation=perfectInformation,
+                         evaluator=evaluator)
+        self.depth: int = depth
+        self.maxNodes: Optional[int] = maxNodes
+        # kept between the decisions, the positions of one turn are searched again and again
+        self.table: TranspositionTable = TranspositionTable(TABLE_BYTES)
+
+    def __str__(self) -> str:
+        return 'expectimax'
+
+    __repr__ = __str__
+
+    def search_move(self, turnMoves: int=0, deadline: Optional[float]=None, state: Optional[GameState]=None) -> Move:
+        if state is None:
+            state = self.game.get_state()
+        if not self.perfectInformation:
+            state = determinize(state, state.current, self.rng, self.seenEvents)
+        search = ExpectimaxSearch(self.depth, self.maxNodes, self.timeLimit, self.table, evaluator=self.evaluator)
+        move, _, stats = search.search(state, turnMoves, deadline)
+        self.record_stats(stats)
+        return move
@@ -1,22 +1,50 @@
-import random
-from typing import List, Optional, Iterator, TYPE_CHECKING
+from time import perf_counter
+from typing import Callable, List, Optional, Iterator, Type, TYPE_CHECKING
 from board import Board
 from computer_player import ComputerPlayer
-from display_handler import DisplayHandler
+from event_logger import EventLogger, NullLogger, StdoutLogger
+from game_state import GameState, EMPTY, SLOT, PATH, VILLAGE, TOWN, LAND_BASE, META_BASE, META_NAMES, EVENT_NAMES, \
+    EVENT_TYPES, PLAYABLE_BASE, VILLAGE_IDX, PATH_IDX, TOWN_IDX, get_square_code, is_land, is_playable
+from null_display_handler import NullDisplayHandler
 from enums import DiceEvent, Resource
 from card_data import CardData
 from human_player import HumanPlayer
+from journal import Journal, NullJournal
+from move_generator import Move, END_TURN_MOVE
 import config
 from player import Player
-from util import Pos, MILLS_EFFECTS, Cost, display_cards_on_board, is_land_protected_from_plaque
-from card import Card, Event, Landscape, Village, Town, Path, MetaCard, Playable, Building, Buildable, SettlementSlot, Settlement
+from util import Pos, MILLS_EFFECTS, Cost, display_cards_on_board, is_land_protected_from_plaque, create_rng, \
+    throw_yield_dice, throw_event_dice
+from card import Card, Event, Landscape, Village, Town, Path, MetaCard, Playable, Building, Buildable, SettlementSlot, \
+    Settlement, Knight, Fleet
 if TYPE_CHECKING:
     from custom_types import Pile
+    from display_handler import DisplayHandler
 
 
 class Game:
     # TODO - finish unit test
-    def __init__(self):
+    def __init__(self, player1Type: Type[Player]=HumanPlayer, player2Type: Type[Player]=ComputerPlayer,
+                 headless: bool=False, seed: Optional[int]=None, stream: Optional[int]=None,
+                 logger: Optional[EventLogger]=None, decisionTime: Optional[float]=None):
+        self.headless: bool = headless
+        # seconds a player gets for one decision (the whole action phase of a turn is one), None means no limit
+        self.decisionTime: Optional[float] = decisionTime
+        # nobody reads the log of a headless game unless a logger is given explicitly
+        if logger is None:
+            logger = NullLogger() if headless else StdoutLogger()
+        self.logger: EventLogger = logger
+        # all randomness of the game comes from here, the same seed and stream replay the same game
+        self.rng, self.seed = create_rng(seed, stream)
+        self.stream: Optional[int] = stream
+        # changes of the card placement and land resources go through the journal, a search can set a real one
+        # to undo its moves in place
+        self.journal: Journal = NullJournal()
+        # called with every move of the action phase before it is made, set by play()
+        self.onMove: Optional[Callable[[Game, Player, Move], None]] = None
+        # the position before the observed move while onMove runs, when the player had it built already
+        self.observedState: Optional[GameState] = None
+
         # prepare all boards
         self.mainBoard: Board = Board(Pos(*config.MAIN_BOARD_SQUARES), Pos(*config.CARD_IMG_SIZE_SMALL))
         self.player1Board = Board(Pos(*config.PLAYER_BOARD_SQUARES), Pos(*config.CARD_IMG_SIZE_SMALL))
@@ -26,19 +54,27 @@ class Game:
         self.buttons = Board(Pos(*config.BUTTON_BOARD_SQUARES), Pos(*config.BUTTON_SIZE))
 
         # setup players
-        self.player1: Player = HumanPlayer(self, self.player1Board, 1, Pos(6, 8))
-        self.player2: Player = ComputerPlayer(self, self.player2Board, 2, Pos(6, 2))
+        self.player1: Player = player1Type(self, self.player1Board, 1, Pos(6, 8))
+        self.player2: Player = player2Type(self, self.player2Board, 2, Pos(6, 2))
         self.player1.opponent, self.player2.opponent = self.player2, self.player1
         self.currentPlayer: Player = self.player1
 
-        # setup display handler
-        self.display = DisplayHandler()
+        # setup display handler, headless games (e.g. computer vs computer simulations) do not open any window
+        self.display: DisplayHandler | NullDisplayHandler
+        if headless:
+            self.display = NullDisplayHandler()
+        else:
+            # pygame is imported (and initialized) only when a window is really needed
+            from display_handler import DisplayHandler
+            self.display = DisplayHandler()
         for board in [self.mainBoard, self.player1Board, self.player2Board,self.choiceBoard, self.bigCard,self.buttons]:
             self.display.add_board(board)
 
         # setup cards
-        self.cardPiles: List[Pile] = CardData.prepare_piles()
-        self.eventCards: List[Event] = CardData.create_event_cards()
+        self.cardPiles: List[Pile] = CardData.prepare_piles(self.rng)
+        self.playableCardsById: List[Playable] = sorted((card for pile in self.cardPiles for card in pile),
+                                                        key=lambda card: card.cardId)
+        self.eventCards: List[Event] = CardData.create_event_cards(self.rng)
         self.infraCardsLeft = {
             Village: config.VILLAGES_COUNT,
             Path: config.PATHS_COUNT,
@@ -124,7 +160,9 @@ class Game:
     # TODO - unit test
     def prepare_landscape_cards(self) -> List[Landscape]:
         landCards: List[Landscape] = []
-        for card in CardData.create_landscape_cards(self.player1, self.player2):
+        allLandCards = CardData.create_landscape_cards(self.player1, self.player2, self.rng)
+        self.landscapeCardsById: List[Landscape] = sorted(allLandCards, key=lambda card: card.cardId)
+        for card in allLandCards:
             if card.player is not None:
                 card.player.setup_initial_land_card(card)
             else:
@@ -138,13 +176,13 @@ class Game:
     def card_event_builder(self) -> None:
         pile: Optional[Pile] = None
         for player in [self.currentPlayer, self.currentPlayer.opponent]:
-            pile = player.select_pile(pile)
+            pile = player.select_pile(pile, deadline=self.get_deadline())
 
-            card = player.select_card_from_choice(pile)
+            card = player.select_card_from_choice(pile, deadline=self.get_deadline())
             player.cardsInHand.append(card)
             pile.remove(card)
 
-            card = player.select_card_to_throw_away()
+            card = player.select_card_to_throw_away(deadline=self.get_deadline())
             player.cardsInHand.remove(card)
             pile.append(card)
 
@@ -153,57 +191,57 @@ class Game:
     def card_event_civil_war(self) -> None:
         for player in [self.currentPlayer, self.currentPlayer.opponent]:
             if player.opponent.has_unit_to_remove_in_civil_war():
-                print(f'player {player.opponent} has something to be removed')
-                cardToRemove: Buildable = player.select_opponents_unit_to_remove()
-                print(f'selected card: {cardToRemove.name}, pos: {cardToRemove.pos}')
+                self.logger.log('civil_war_has_unit', player.opponent)
+                cardToRemove: Buildable = player.select_opponents_unit_to_remove(deadline=self.get_deadline())
+                self.logger.log('civil_war_removed', cardToRemove.name, cardToRemove.pos)
 
                 player.opponent.take_back_to_hand(cardToRemove)
                 if player.opponent.get_hand_cards_cnt() < len(player.opponent.cardsInHand):
-                    pile = player.opponent.select_pile()
-                    card = player.opponent.select_card_to_throw_away()
+                    pile = player.opponent.select_pile(deadline=self.get_deadline())
+                    card = player.opponent.select_card_to_throw_away(deadline=self.get_deadline())
                     player.opponent.cardsInHand.remove(card)
                     pile.append(card)
                     player.opponent.refresh_hand_board()
             else:
-                print(f'player {player.opponent} has nothing to be removed')
+                self.logger.log('civil_war_no_unit', player.opponent)
 
     # TODO - unit test
     def card_event_rich_year(self) -> None:
         for player in [self.currentPlayer, self.currentPlayer.opponent]:
             for land in player.landscapeCards:
-                land.resourcesHeld = min(self.get_neighboring_warehouse_cnt(land) + land.resourcesHeld,
-                                         config.MAX_LAND_RESOURCES)
+                self.journal.set_attr(land, 'resourcesHeld', min(self.get_neighboring_warehouse_cnt(land) +
+                                                                 land.resourcesHeld, config.MAX_LAND_RESOURCES))
 
     def card_event_advance(self) -> None:
         for player in [self.currentPlayer, self.currentPlayer.opponent]:
             for _ in range(player.get_advance_resource_cnt()):
-                player.pick_any_resource()
+                player.pick_any_resource(deadline=self.get_deadline())
 
     def card_event_new_year(self) -> None:
-        random.shuffle(self.eventCards)
+        self.rng.shuffle(self.eventCards)
 
     # TODO - unit test
     def card_event_conflict(self) -> None:
         player1Strength = self.player1.get_battle_strength()
         player2Strength = self.player2.get_battle_strength()
 
-        print(f'player 1 battle strength: {player1Strength}')
-        print(f'player 2 battle strength: {player2Strength}')
+        self.logger.log('battle_strength', 1, player1Strength)
+        self.logger.log('battle_strength', 2, player2Strength)
 
         if player1Strength > player2Strength:
-            print('battle winner is player1')
+            self.logger.log('battle_winner', 1)
             winner = self.player1
         elif player1Strength < player2Strength:
-            print('battle winner is player2')
+            self.logger.log('battle_winner', 2)
             winner = self.player2
         else:
-            print('battle has no winner')
+            self.logger.log('battle_no_winner')
             return
 
-        pile = winner.select_pile()
-        for _ in range(2):
+        pile = winner.select_pile(deadline=self.get_deadline())
+        for _ in range(min(2, len(winner.opponent.cardsInHand))):
             display_cards_on_board(winner.opponent.cardsInHand, self.choiceBoard)
-            card: Playable = winner.select_opponents_card_to_discard()
+            card: Playable = winner.select_opponents_card_to_discard(deadline=self.get_deadline())
             winner.opponent.cardsInHand.remove(card)
             pile.append(card)
 
@@ -224,14 +262,16 @@ class Game:
 
             for land in player.landscapeCards:
                 assert land.pos is not None
-                if not is_land_protected_from_plaque(land):
-                    land.resourcesHeld = max(0, land.resourcesHeld - 1)
+                if not is_land_protected_from_plaque(self.get_land_settlements(land)):
+                    self.journal.set_attr(land, 'resourcesHeld', max(0, land.resourcesHeld - 1))
                     self.mainBoard.refresh_square(land.pos)
 
     def card_event(self):
         event: Event = self.eventCards.pop(0)
         self.eventCards.append(event)
-        print(f'card event: {event.name}')
+        self.logger.log('card_event', event.name)
+        for player in [self.player1, self.player2]:
+            player.observe_card_event(event.name)
 
         if event.name == 'builder':
             self.card_event_builder()
@@ -272,43 +312,49 @@ class Game:
         player1Strength = self.player1.get_tournament_strength()
         player2Strength = self.player2.get_tournament_strength()
 
-        print(f'player 1 tournament strength: {player1Strength}')
-        print(f'player 2 tournament strength: {player2Strength}')
+        self.logger.log('tournament_strength', 1, player1Strength)
+        self.logger.log('tournament_strength', 2, player2Strength)
 
         if player1Strength > player2Strength:
-            print('tournament winner is player1')
-            self.player1.pick_any_resource()
+            self.logger.log('tournament_winner', 1)
+            self.player1.pick_any_resource(deadline=self.get_deadline())
         elif player1Strength < player2Strength:
-            print('tournament winner is player2')
-            self.player2.pick_any_resource()
+            self.logger.log('tournament_winner', 2)
+            self.player2.pick_any_resource(deadline=self.get_deadline())
         else:
-            print('tournament has no winner')
+            self.logger.log('tournament_no_winner')
 
     def event_trade_profit(self) -> None:
         player1Profit = self.player1.get_trade_strength()
         player2Profit = self.player2.get_trade_strength()
 
-        print(f'player 1 trade strength: {player1Profit}')
-        print(f'player 2 trade strength: {player2Profit}')
+        self.logger.log('trade_strength', 1, player1Profit)
+        self.logger.log('trade_strength', 2, player2Profit)
 
         if player1Profit > player2Profit:
-            print('trade profit for player 1')
-            self.player1.grab_any_resource_if_possible()
+            self.logger.log('trade_profit', 1)
+            self.player1.grab_any_resource_if_possible(deadline=self.get_deadline())
         elif player1Profit < player2Profit:
-            print('trade profit for player 2')
-            self.player2.grab_any_resource_if_possible()
+            self.logger.log('trade_profit', 2)
+            self.player2.grab_any_resource_if_possible(deadline=self.get_deadline())
         else:
-            print('no trade profit')
+            self.logger.log('no_trade_profit')
 
     def event_good_harvest(self) -> None:
-        self.player1.pick_any_resource()
-        self.player2.pick_any_resource()
+        self.player1.pick_any_resource(deadline=self.get_deadline())
+        self.player2.pick_any_resource(deadline=self.get_deadline())
 
     def event_ambush(self) -> None:
         for player in [self.player1, self.player2]:
             if player.get_unprotected_resources_cnt() > config.AMBUSH_MAX_RESOURCES:
                 player.lose_ambush_resources()
 
+    def throw_yield_dice(self) -> int:
+        return throw_yield_dice(self.rng)
+
+    def throw_event_dice(self) -> DiceEvent:
+        return throw_event_dice(self.rng)
+
     ####################################################################################################################
     #################                    ###############################################################################
     ####################################################################################################################
@@ -357,7 +403,8 @@ class Game:
         for player in [self.player1, self.player2]:
             for land in player.landscapeCards:
                 if land.diceNumber == number and land.resourcesHeld < config.MAX_LAND_RESOURCES:
-                    land.resourcesHeld = min(land.resourcesHeld + self.get_land_yield(land), config.MAX_LAND_RESOURCES)
+                    self.journal.set_attr(land, 'resourcesHeld', min(land.resourcesHeld + self.get_land_yield(land),
+                                                                     config.MAX_LAND_RESOURCES))
                     assert land.pos is not None
                     self.mainBoard.refresh_square(land.pos)
 
@@ -367,19 +414,176 @@ class Game:
             card.resourcesHeld = cost.get(card.resource)
             self.mainBoard.refresh_square(card.pos)
 
-    def play(self):
+    def is_victory(self) -> bool:
+        return self.get_winner() is not None
+
+    def get_winner(self) -> Optional[Player]:
+        points1, points2 = self.player1.get_victory_points(), self.player2.get_victory_points()
+        if max(points1, points2) < config.VICTORY_POINTS or points1 == points2:
+            return None
+        return self.player1 if points1 > points2 else self.player2
+
+    ####################################################################################################################
+    #################   STATE            ###############################################################################
+    ####################################################################################################################
+
+    def get_player_idx(self, player: Player) -> int:
+        return 0 if player is self.player1 else 1
+
+    def get_state(self) -> GameState:
+        # builds the state from the cards and hashes it from scratch, only the forks of a state are O(1) copies
+        # -> build it once per decision and pass it on
+        state = GameState((self.player1.midPos.y, self.player2.midPos.y))
+
+        width = self.mainBoard.size.x
+        for idx, square in enumerate(self.mainBoard.squares):
+            state.board[idx // width][idx % width] = get_square_code(square)
+
+        for land in self.landscapeCardsById:
+            state.landHeld[land.cardId] = land.resourcesHeld
+            if land.pos is not None and land.player is not None:
+                state.landOwner[land.cardId] = self.get_player_idx(land.player)
+                state.landPos[land.cardId] = self.mainBoard.to_int(land.pos)
+
+        state.landDeck = [land.cardId for land in self.landscapeCards]
+        state.hands = [[card.cardId for card in player.cardsInHand] for player in [self.player1, self.player2]]
+        state.piles = [[card.cardId for card in pile] for pile in self.cardPiles]
+        state.events = [EVENT_TYPES[event.name] for event in self.eventCards]
+        state.infraLeft[VILLAGE_IDX] = self.infraCardsLeft[Village]
+        state.infraLeft[PATH_IDX] = self.infraCardsLeft[Path]
+        state.infraLeft[TOWN_IDX] = self.infraCardsLeft[Town]
+        state.current = self.get_player_idx(self.currentPlayer)
+        state.roundNo = self.roundNo
+        state.rehash()
+        return state
+
+    def set_state(self, state: GameState) -> None:
+        # rebuilds the whole card graph (board squares, settlements, players' lists) from the state
+        players: List[Player] = [self.player1, self.player2]
+        for player in players:
+            player.cardsInHand, player.landscapeCards, player.settlements, player.paths = [], [], [], []
+            player.knightsPlayed, player.fleetPlayed, player.buildingsPlayed = [], [], []
+
+        for card in self.playableCardsById:
+            card.player = None
+            if isinstance(card, Buildable):
+                card.settlement, card.pos = None, None
+
+        for land in self.landscapeCardsById:
+            land.resourcesHeld = state.landHeld[land.cardId]
+            land.player, land.pos = None, None
+
+        for y, row in enumerate(state.board):
+            ownerIdx = state.get_row_owner(y)
+            owner = players[ownerIdx] if ownerIdx >= 0 else None
+            for x, code in enumerate(row):
+                self.mainBoard.set_square(Pos(x, y), self._create_square(code, Pos(x, y), owner))
+
+        # settlements own the slots and cards above and below them
+        for player in players:
+            for settlement in player.settlements:
+                for dy in ([-1, 1] if isinstance(settlement, Village) else [-1, 1, -2, 2]):
+                    square = self.mainBoard.get_square(settlement.pos.down(dy))
+                    if isinstance(square, (SettlementSlot, Buildable)):
+                        square.settlement = settlement
+                        settlement.cards.append(square)
+
+        self.landscapeCards = [self.landscapeCardsById[land] for land in state.landDeck]
+        for player, hand in zip(players, state.hands):
+            player.cardsInHand = [self.playableCardsById[card] for card in hand]
+            player.refresh_hand_board()
+        self.cardPiles = [[self.playableCardsById[card] for card in pile] for pile in state.piles]
+        self.eventCards = [Event(EVENT_NAMES[event]) for event in state.events]
+        self.infraCardsLeft[Village] = state.infraLeft[VILLAGE_IDX]
+        self.infraCardsLeft[Path] = state.infraLeft[PATH_IDX]
+        self.infraCardsLeft[Town] = state.infraLeft[TOWN_IDX]
+        self.currentPlayer = players[state.current]
+        self.roundNo = state.roundNo
+
+    def _create_square(self, code: int, pos: Pos, owner: Optional[Player]) -> Card:
+        if code == EMPTY:
+            return MetaCard('empty')
+
+        if is_land(code):
+            land = self.landscapeCardsById[code - LAND_BASE]
+            assert owner is not None, f'landscape at {pos} has no owner'
+            land.player, land.pos = owner, pos
+            owner.landscapeCards.append(land)
+            return land
+
+        if is_playable(code):
+            card = self.playableCardsById[code - PLAYABLE_BASE]
+            assert isinstance(card, Buildable) and owner is not None, f'invalid card at {pos}'
+            card.player, card.pos = owner, pos
+            if isinstance(card, Building):
+                owner.buildingsPlayed.append(card)
+            elif isinstance(card, Knight):
+                owner.knightsPlayed.append(card)
+            elif isinstance(card, Fleet):
+                owner.fleetPlayed.append(card)
+            return card
+
+        if code in (SLOT, PATH, VILLAGE, TOWN):
+            assert owner is not None, f'square {code} at {pos} has no owner'
+            if code == SLOT:
+                return SettlementSlot(pos, owner)
+            if code == PATH:
+                path = Path(pos, owner)
+                owner.paths.append(path)
+                return path
+            settlement: Settlement = Village(pos, owner) if code == VILLAGE else Town(pos, owner)
+            owner.settlements.append(settlement)
+            return settlement
+
+        return MetaCard(META_NAMES[code - META_BASE])
+
+    def observe_move(self, player: Player, move: Move, state: Optional[GameState]=None) -> None:
+        # state - the position before the move if the player has built it, onMove reads it by get_observed_state
+        if self.onMove is not None:
+            self.observedState = state
+            self.onMove(self, player, move)
+            self.observedState = None
+
+    def get_observed_state(self) -> GameState:
+        # for onMove, the position before the move without building it again, it must not be changed
+        return self.observedState if self.observedState is not None else self.get_state()
+
+    def get_deadline(self) -> Optional[float]:
+        return perf_counter() + self.decisionTime if self.decisionTime is not None else None
+
+    def play(self, maxRounds: Optional[int]=None, onTurn: Optional[Callable[['Game'], None]]=None,
+             onMove: Optional[Callable[['Game', Player, Move], None]]=None) -> Optional[Player]:
+        # onTurn is called after every turn before the other player is on turn, e.g. to record the positions
+        # onMove is called with every move of the action phase (the bank trades are part of the builds paying with
+        # them) before it is made and with END_TURN when the player is done
+        # the players are closed at the end of the game however it ends, see Player.close
+        self.onMove = onMove
+        try:
+            return self._play(maxRounds, onTurn)
+        finally:
+            for player in [self.player1, self.player2]:
+                player.close()
+
+    def _play(self, maxRounds: Optional[int], onTurn: Optional[Callable[['Game'], None]]) -> Optional[Player]:
         for player in [self.player1, self.player2]:
-            player.initial_land_setup()
+            player.initial_land_setup(self.get_deadline())
 
         for player in [self.player1, self.player2]:
-            player.pick_starting_cards()
+            player.pick_starting_cards(self.get_deadline())
 
         # self.debug_give_resource(self.currentPlayer, Cost(sheep=2, wood=2, rock=3, grain=2))
 
         while not self.is_victory():
-            print(f'\n========  round {self.roundNo} ========')
+            if maxRounds is not None and self.roundNo > maxRounds:
+                return None
+            self.logger.log('round', self.roundNo)
             self.currentPlayer.throw_dice()
-            self.currentPlayer.do_actions()
+            self.currentPlayer.do_actions(self.get_deadline())
+            self.observe_move(self.currentPlayer, END_TURN_MOVE)
             self.currentPlayer.refill_hand()
+            if onTurn is not None:
+                onTurn(self)
             self.currentPlayer = self.currentPlayer.opponent
             self.roundNo += 1
+
+        return self.get_winner()
@@ -0,0 +1,509 @@
+from __future__ import annotations
+from random import Random
+from typing import List, Tuple, Dict, Iterator, Optional
+
+import config
+from card import Card, Playable, Building, Knight, Fleet, SettlementSlot, Path, Village, Town, Landscape
+from card_data import CardData
+from config import MAX_LAND_RESOURCES
+from enums import Resource
+from heuristics import get_card_priority
+from util import MILLS_EFFECTS
+
+# every card of the game has a small integer id, the state holds only these ids and plain ints
+PLAYABLE_CARDS: List[Playable] = CardData.create_playable_catalog()
+LAND_CARDS: List[Tuple[str, Resource, int, Optional[int]]] = [
+    (data['name'], data['resource'], data['dice'], data['player'])
+    for data in CardData.LANDSCAPE_CARD_LIST for _ in range(data['count'])
+]
+EVENT_NAMES: List[str] = [data['name'] for data in CardData.EVENT_CARD_LIST]
+EVENT_TYPES: Dict[str, int] = {name: idx for idx, name in enumerate(EVENT_NAMES)}
+
+# codes of the main board squares
+EMPTY = 0
+SLOT = 1
+PATH = 2
+VILLAGE = 3
+TOWN = 4
+META_NAMES: List[str] = ['back_event', 'back_land', 'back_path', 'back_village', 'back_town', 'back']
+META_BASE = 5
+LAND_BASE = 16
+PLAYABLE_BASE = 64
+assert META_BASE + len(META_NAMES) <= LAND_BASE and LAND_BASE + len(LAND_CARDS) <= PLAYABLE_BASE
+assert PLAYABLE_BASE + len(PLAYABLE_CARDS) <= 256, 'board squares must fit in a byte'
+
+# order of the infrastructure counters
+VILLAGE_IDX, PATH_IDX, TOWN_IDX = 0, 1, 2
+
+BOARD_WIDTH, BOARD_HEIGHT = config.MAIN_BOARD_SQUARES
+
+# bits of GameState.owned, a structure is copied before its first change unless its bit is set
+OWN_ROW = 0  # + row number
+OWN_BOARD = BOARD_HEIGHT
+OWN_HAND = OWN_BOARD + 1  # + player
+OWN_HANDS = OWN_HAND + 2
+OWN_PILE = OWN_HANDS + 1  # + pile index
+OWN_PILES = OWN_PILE + config.PILE_COUNT
+OWN_LAND_HELD = OWN_PILES + 1
+OWN_LAND_PLACEMENT = OWN_LAND_HELD + 1
+OWN_EVENTS = OWN_LAND_PLACEMENT + 1
+OWN_INFRA = OWN_EVENTS + 1
+OWN_FEATURES = OWN_INFRA + 1
+OWN_ALL = (1 << (OWN_FEATURES + 1)) - 1
+
+# random keys of the incremental 64-bit position hash, generated from a fixed seed so every process has the same ones
+# board squares, land resources, hand contents and the current player are xor-ed keys (Zobrist hashing)
+# piles and the event deck are ordered, they are hashed as sum(key[card] * ORDER_BASE ** position) - taking the first
+# card and putting a card to the bottom are O(1) with this
+# round number, infrastructure counters and the land deck order are not hashed
+HASH_MASK = (1 << 64) - 1
+_keyRng = Random(0x2a1b3c4d)
+SQUARE_CODES_CNT = PLAYABLE_BASE + len(PLAYABLE_CARDS)
+SQUARE_KEYS: List[int] = [_keyRng.getrandbits(64) for _ in range(BOARD_WIDTH * BOARD_HEIGHT * SQUARE_CODES_CNT)]
+LAND_HELD_KEYS: List[int] = [_keyRng.getrandbits(64) for _ in range(len(LAND_CARDS) * (MAX_LAND_RESOURCES + 1))]
+HAND_KEYS: List[List[int]] = [[_keyRng.getrandbits(64) for _ in PLAYABLE_CARDS] for _ in range(2)]
+PILE_KEYS: List[List[int]] = [[_keyRng.getrandbits(64) for _ in PLAYABLE_CARDS] for _ in range(config.PILE_COUNT)]
+EVENT_KEYS: List[int] = [_keyRng.getrandbits(64) for _ in EVENT_NAMES]
+CURRENT_KEY: int = _keyRng.getrandbits(64)
+ORDER_BASE: int = _keyRng.getrandbits(64) | 1
+ORDER_BASE_INV: int = pow(ORDER_BASE, -1, HASH_MASK + 1)
+ORDER_POWERS: List[int] = [pow(ORDER_BASE, idx, HASH_MASK + 1) for idx in range(len(PLAYABLE_CARDS) + 1)]
+
+
+# values of the square codes for the calculating functions, a whole board row is summed at once with these
+def _create_code_table(getValue) -> List[int]:
+    table = [0] * 256
+    for idx, card in enumerate(PLAYABLE_CARDS):
+        table[PLAYABLE_BASE + idx] = getValue(card)
+    return table
+
+SETTLEMENT_POINTS: List[int] = [0] * 256
+SETTLEMENT_POINTS[VILLAGE], SETTLEMENT_POINTS[TOWN] = 1, 2
+BUILDING_POINTS = _create_code_table(lambda card: card.victoryPoints if isinstance(card, Building) else 0)
+TRADE_POINTS = _create_code_table(lambda card: card.tradePoints if isinstance(card, (Building, Fleet)) else 0)
+BATTLE_POINTS = _create_code_table(lambda card: card.battleStrength if isinstance(card, Knight) else 0)
+TOURNAMENT_POINTS = _create_code_table(lambda card: card.tournamentStrength if isinstance(card, Knight) else 0)
+KNIGHT_COUNTS = _create_code_table(lambda card: 1 if isinstance(card, Knight) else 0)
+SMITHY_COUNTS = _create_code_table(lambda card: 1 if card.name == 'smithy' else 0)
+MILL_COUNTS = _create_code_table(lambda card: 1 if card.name in MILLS_EFFECTS.values() else 0)
+LAND_MILLS: List[Optional[str]] = [MILLS_EFFECTS.get(resource) for _, resource, _, _ in LAND_CARDS]
+HAND_POINTS: List[int] = [round(get_card_priority(card)) for card in PLAYABLE_CARDS]
+
+# the terms of the position evaluation, GameState keeps them up to date for both players as the squares, lands and
+# hands change, see GameState.features
+SETTLEMENT_POINTS_IDX, BUILDING_POINTS_IDX, TRADE_POINTS_IDX, BATTLE_POINTS_IDX, TOURNAMENT_POINTS_IDX, KNIGHTS_IDX, \
+    SMITHIES_IDX, RESOURCES_IDX, YIELD_IDX, HAND_POINTS_IDX, HAND_CARDS_IDX = range(11)
+FEATURES_CNT = 11
+# (term, value) pairs of a square code, the term belongs to the owner of the row the code is on
+CODE_FEATURES: List[Tuple[Tuple[int, int], ...]] = [
+    tuple((idx, table[code]) for idx, table in [(SETTLEMENT_POINTS_IDX, SETTLEMENT_POINTS),
+                                                (BUILDING_POINTS_IDX, BUILDING_POINTS), (TRADE_POINTS_IDX, TRADE_POINTS),
+                                                (BATTLE_POINTS_IDX, BATTLE_POINTS),
+                                                (TOURNAMENT_POINTS_IDX, TOURNAMENT_POINTS),
+                                                (KNIGHTS_IDX, KNIGHT_COUNTS), (SMITHIES_IDX, SMITHY_COUNTS)]
+          if table[code])
+    for code in range(256)]
+# codes changing some term - played cards, settlements, lands and mills (they double the yield of their neighbors)
+HAS_FEATURES: List[bool] = [bool(CODE_FEATURES[code]) or MILL_COUNTS[code] > 0 or
+                            LAND_BASE <= code < LAND_BASE + len(LAND_CARDS) for code in range(256)]
+
+
+def get_order_hash(keys: List[int], cards: List[int]) -> int:
+    return sum(keys[card] * ORDER_POWERS[idx] for idx, card in enumerate(cards)) & HASH_MASK
+
+
+def get_row_owners(midRows: Tuple[int, int]) -> Tuple[int, ...]:
+    # each player owns the row of its settlements and the two rows above and below it
+    return tuple(next((player for player, midRow in enumerate(midRows) if abs(y - midRow) <= 2), -1)
+                 for y in range(BOARD_HEIGHT))
+
+def is_land(code: int) -> bool:
+    return LAND_BASE <= code < LAND_BASE + len(LAND_CARDS)
+
+def is_playable(code: int) -> bool:
+    return code >= PLAYABLE_BASE
+
+def get_square_code(square: Optional[Card]) -> int:
+    if square is None or square.name == 'empty':
+        return EMPTY
+    if isinstance(square, SettlementSlot):
+        return SLOT
+    if isinstance(square, Path):
+        return PATH
+    # towns are built by swapping class of a village, Town has to be checked first
+    if isinstance(square, Town):
+        return TOWN
+    if isinstance(square, Village):
+        return VILLAGE
+    if isinstance(square, Landscape):
+        assert square.cardId >= 0, f'landscape {square} has no id'
+        return LAND_BASE + square.cardId
+    if isinstance(square, Playable):
+        assert square.cardId >= 0, f'card {square} has no id'
+        return PLAYABLE_BASE + square.cardId
+    return META_BASE + META_NAMES.index(square.name)
+
+
+class GameState:
+    # the complete position of a game as plain values, no references to cards, players or boards
+    # players are 0 (player1) and 1 (player2)
+    # forked states share the structures they did not change yet - once a state is forked, it must be changed only
+    # through the mutators below, never by writing into its lists directly
+    def __init__(self, midRows: Tuple[int, int]):
+        self.midRows: Tuple[int, int] = midRows
+        self.rowOwners: Tuple[int, ...] = get_row_owners(midRows)
+        self.board: List[bytearray] = [bytearray(BOARD_WIDTH) for _ in range(BOARD_HEIGHT)]
+        self.landHeld: List[int] = [0] * len(LAND_CARDS)
+        self.landOwner: List[int] = [-1] * len(LAND_CARDS)
+        self.landPos: List[int] = [-1] * len(LAND_CARDS)
+        # landscapes not on the board yet, new villages draw from the end
+        self.landDeck: List[int] = []
+        self.hands: List[List[int]] = [[], []]
+        self.piles: List[List[int]] = [[] for _ in range(config.PILE_COUNT)]
+        self.events: List[int] = []
+        self.infraLeft: List[int] = [config.VILLAGES_COUNT, config.PATHS_COUNT, config.TOWNS_COUNT]
+        self.current: int = 0
+        self.roundNo: int = 1
+        self.owned: int = OWN_ALL
+        self.zobrist: int = 0
+        self.pileHashes: Tuple[int, ...] = ()
+        self.eventsHash: int = 0
+        # the evaluation terms of player 0 followed by the ones of player 1, maintained together with the hash
+        self.features: List[int] = [0] * (2 * FEATURES_CNT)
+        self.rehash()
+
+    def clone(self) -> GameState:
+        state = GameState.__new__(GameState)
+        state.midRows, state.rowOwners = self.midRows, self.rowOwners
+        state.board = [bytearray(row) for row in self.board]
+        state.landHeld = self.landHeld[:]
+        state.landOwner = self.landOwner[:]
+        state.landPos = self.landPos[:]
+        state.landDeck = self.landDeck[:]
+        state.hands = [hand[:] for hand in self.hands]
+        state.piles = [pile[:] for pile in self.piles]
+        state.events = self.events[:]
+        state.infraLeft = self.infraLeft[:]
+        state.current = self.current
+        state.roundNo = self.roundNo
+        state.owned = OWN_ALL
+        state.zobrist, state.pileHashes, state.eventsHash = self.zobrist, self.pileHashes, self.eventsHash
+        state.features = self.features[:]
+        return state
+
+    def fork(self) -> GameState:
+        # copy-on-write copy, only the parts changed later (one board row, one hand, one pile, ...) get copied
+        state = GameState.__new__(GameState)
+        state.__dict__.update(self.__dict__)
+        state.owned = 0
+        self.owned = 0
+        return state
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, GameState):
+            return NotImplemented
+        return self.midRows == other.midRows and self.board == other.board and self.landHeld == other.landHeld \
+            and self.landOwner == other.landOwner and self.landPos == other.landPos \
+            and self.landDeck == other.landDeck and self.hands == other.hands and self.piles == other.piles \
+            and self.events == other.events and self.infraLeft == other.infraLeft \
+            and self.current == other.current and self.roundNo == other.roundNo
+
+    ####################################################################################################################
+    #################   HASHING           ##############################################################################
+    ####################################################################################################################
+
+    def rehash(self) -> None:
+        # computes the hash and the evaluation terms from scratch, needed only after writing into the structures directly
+        zobrist = CURRENT_KEY if self.current else 0
+        for y, row in enumerate(self.board):
+            for x, code in enumerate(row):
+                zobrist ^= SQUARE_KEYS[(y * BOARD_WIDTH + x) * SQUARE_CODES_CNT + code]
+        for land, held in enumerate(self.landHeld):
+            zobrist ^= LAND_HELD_KEYS[land * (MAX_LAND_RESOURCES + 1) + held]
+        for player, hand in enumerate(self.hands):
+            for card in hand:
+                zobrist ^= HAND_KEYS[player][card]
+        self.pileHashes = tuple(get_order_hash(PILE_KEYS[idx], pile) for idx, pile in enumerate(self.piles))
+        for pileHash in self.pileHashes:
+            zobrist ^= pileHash
+        self.eventsHash = get_order_hash(EVENT_KEYS, self.events)
+        self.zobrist = zobrist ^ self.eventsHash
+
+        features = [0] * (2 * FEATURES_CNT)
+        for y, row in enumerate(self.board):
+            if self.rowOwners[y] >= 0:
+                base = self.rowOwners[y] * FEATURES_CNT
+                for code in row:
+                    for idx, value in CODE_FEATURES[code]:
+                        features[base + idx] += value
+                    if is_land(code):
+                        features[base + YIELD_IDX] += self.get_land_yield(code - LAND_BASE)
+                        features[base + RESOURCES_IDX] += self.landHeld[code - LAND_BASE]
+        for player, hand in enumerate(self.hands):
+            features[player * FEATURES_CNT + HAND_POINTS_IDX] = sum(HAND_POINTS[card] for card in hand)
+            features[player * FEATURES_CNT + HAND_CARDS_IDX] = len(hand)
+        self.features = features
+        self.owned |= 1 << OWN_FEATURES
+
+    def _set_pile_hash(self, pile: int, pileHash: int) -> None:
+        pileHashes = list(self.pileHashes)
+        self.zobrist ^= pileHashes[pile] ^ pileHash
+        pileHashes[pile] = pileHash
+        self.pileHashes = tuple(pileHashes)
+
+    def _set_events_hash(self, eventsHash: int) -> None:
+        self.zobrist ^= self.eventsHash ^ eventsHash
+        self.eventsHash = eventsHash
+
+    ####################################################################################################################
+    #################   MUTATORS          ##############################################################################
+    ####################################################################################################################
+
+    def set_square(self, x: int, y: int, code: int) -> None:
+        if not self.owned & (1 << (OWN_ROW + y)):
+            if not self.owned & (1 << OWN_BOARD):
+                self.board = self.board[:]
+                self.owned |= 1 << OWN_BOARD
+            self.board[y] = bytearray(self.board[y])
+            self.owned |= 1 << (OWN_ROW + y)
+        row = self.board[y]
+        offset = (y * BOARD_WIDTH + x) * SQUARE_CODES_CNT
+        self.zobrist ^= SQUARE_KEYS[offset + row[x]] ^ SQUARE_KEYS[offset + code]
+        if (HAS_FEATURES[row[x]] or HAS_FEATURES[code]) and self.rowOwners[y] >= 0:
+            self._set_square_features(x, y, code)
+        row[x] = code
+
+    def _set_square_features(self, x: int, y: int, code: int) -> None:
+        # the terms change by what leaves the square and what comes, a mill changes the yield of the lands next to it
+        features = self._own_features()
+        base = self.rowOwners[y] * FEATURES_CNT
+        row = self.board[y]
+        old = row[x]
+        lands = self._get_lands_next_to(x, y) if MILL_COUNTS[old] or MILL_COUNTS[code] else []
+        if is_land(old):
+            features[base + RESOURCES_IDX] -= self.landHeld[old - LAND_BASE]
+            lands.append(old - LAND_BASE)
+        for land in lands:
+            features[base + YIELD_IDX] -= self.get_land_yield(land)
+        for idx, value in CODE_FEATURES[old]:
+            features[base + idx] -= value
+
+        row[x] = code
+        if is_land(old):
+            lands.pop()
+        if is_land(code):
+            features[base + RESOURCES_IDX] += self.landHeld[code - LAND_BASE]
+            lands.append(code - LAND_BASE)
+        for land in lands:
+            features[base + YIELD_IDX] += self.get_land_yield(land)
+        for idx, value in CODE_FEATURES[code]:
+            features[base + idx] += value
+
+    def _own_features(self) -> List[int]:
+        if not self.owned & (1 << OWN_FEATURES):
+            self.features = self.features[:]
+            self.owned |= 1 << OWN_FEATURES
+        return self.features
+
+    def set_land_held(self, land: int, held: int) -> None:
+        if not self.owned & (1 << OWN_LAND_HELD):
+            self.landHeld = self.landHeld[:]
+            self.owned |= 1 << OWN_LAND_HELD
+        offset = land * (MAX_LAND_RESOURCES + 1)
+        self.zobrist ^= LAND_HELD_KEYS[offset + self.landHeld[land]] ^ LAND_HELD_KEYS[offset + held]
+        if self.landPos[land] >= 0:
+            self._own_features()[self.landOwner[land] * FEATURES_CNT + RESOURCES_IDX] += held - self.landHeld[land]
+        self.landHeld[land] = held
+
+    def place_land(self, land: int, player: int, x: int, y: int) -> None:
+        # moves the land from the land deck to the board
+        if not self.owned & (1 << OWN_LAND_PLACEMENT):
+            self.landOwner, self.landPos, self.landDeck = self.landOwner[:], self.landPos[:], self.landDeck[:]
+            self.owned |= 1 << OWN_LAND_PLACEMENT
+        self.landDeck.remove(land)
+        self.landOwner[land] = player
+        self.landPos[land] = x + y * BOARD_WIDTH
+        self.set_square(x, y, LAND_BASE + land)
+
+    def _own_hand(self, player: int) -> List[int]:
+        if not self.owned & (1 << (OWN_HAND + player)):
+            if not self.owned & (1 << OWN_HANDS):
+                self.hands = self.hands[:]
+                self.owned |= 1 << OWN_HANDS
+            self.hands[player] = self.hands[player][:]
+            self.owned |= 1 << (OWN_HAND + player)
+        return self.hands[player]
+
+    def add_to_hand(self, player: int, card: int) -> None:
+        self._own_hand(player).append(card)
+        self.zobrist ^= HAND_KEYS[player][card]
+        features = self._own_features()
+        features[player * FEATURES_CNT + HAND_POINTS_IDX] += HAND_POINTS[card]
+        features[player * FEATURES_CNT + HAND_CARDS_IDX] += 1
+
+    def remove_from_hand(self, player: int, card: int) -> None:
+        self._own_hand(player).remove(card)
+        self.zobrist ^= HAND_KEYS[player][card]
+        features = self._own_features()
+        features[player * FEATURES_CNT + HAND_POINTS_IDX] -= HAND_POINTS[card]
+        features[player * FEATURES_CNT + HAND_CARDS_IDX] -= 1
+
+    def _own_pile(self, pile: int) -> List[int]:
+        if not self.owned & (1 << (OWN_PILE + pile)):
+            if not self.owned & (1 << OWN_PILES):
+                self.piles = self.piles[:]
+                self.owned |= 1 << OWN_PILES
+            self.piles[pile] = self.piles[pile][:]
+            self.owned |= 1 << (OWN_PILE + pile)
+        return self.piles[pile]
+
+    def take_from_pile(self, pile: int, idx: int=0) -> int:
+        cards = self._own_pile(pile)
+        card = cards.pop(idx)
+        if idx == 0:
+            self._set_pile_hash(pile, (self.pileHashes[pile] - PILE_KEYS[pile][card]) * ORDER_BASE_INV & HASH_MASK)
+        else:
+            # browsing the pile takes a card from the middle, the positions of all cards behind it change
+            self._set_pile_hash(pile, get_order_hash(PILE_KEYS[pile], cards))
+        return card
+
+    def put_to_pile(self, pile: int, card: int) -> None:
+        # returned cards go to the bottom of the pile
+        cards = self._own_pile(pile)
+        pileHash = self.pileHashes[pile] + PILE_KEYS[pile][card] * ORDER_POWERS[len(cards)]
+        self._set_pile_hash(pile, pileHash & HASH_MASK)
+        cards.append(card)
+
+    def _own_events(self) -> List[int]:
+        if not self.owned & (1 << OWN_EVENTS):
+            self.events = self.events[:]
+            self.owned |= 1 << OWN_EVENTS
+        return self.events
+
+    def draw_event(self) -> int:
+        # the top event card goes to the bottom of the deck
+        events = self._own_events()
+        event = events.pop(0)
+        events.append(event)
+        key = EVENT_KEYS[event]
+        eventsHash = (self.eventsHash - key) * ORDER_BASE_INV + key * ORDER_POWERS[len(events) - 1]
+        self._set_events_hash(eventsHash & HASH_MASK)
+        return event
+
+    def shuffle_events(self, rng: Random) -> None:
+        events = self._own_events()
+        rng.shuffle(events)
+        self._set_events_hash(get_order_hash(EVENT_KEYS, events))
+
+    def use_infra(self, infraIdx: int) -> None:
+        if not self.owned & (1 << OWN_INFRA):
+            self.infraLeft = self.infraLeft[:]
+            self.owned |= 1 << OWN_INFRA
+        self.infraLeft[infraIdx] -= 1
+
+    def end_turn(self) -> None:
+        self.current = 1 - self.current
+        self.roundNo += 1
+        self.zobrist ^= CURRENT_KEY
+
+    ####################################################################################################################
+    #################   BOARD ACCESS      ##############################################################################
+    ####################################################################################################################
+
+    def get_square(self, x: int, y: int) -> int:
+        return self.board[y][x]
+
+    def get_row_owner(self, y: int) -> int:
+        return self.rowOwners[y]
+
+    def get_played_cards(self, player: int) -> Iterator[Playable]:
+        midRow = self.midRows[player]
+        for y in (midRow - 2, midRow - 1, midRow + 1, midRow + 2):
+            if 0 <= y < BOARD_HEIGHT:
+                for code in self.board[y]:
+                    if code >= PLAYABLE_BASE:
+                        yield PLAYABLE_CARDS[code - PLAYABLE_BASE]
+
+    def get_observed_hash(self, player: int) -> int:
+        # hash of what the player can see - the opponent's hand, the order of piles and events are left out
+        observed = self.zobrist ^ self.eventsHash
+        for pileHash in self.pileHashes:
+            observed ^= pileHash
+        opponentKeys = HAND_KEYS[1 - player]
+        for card in self.hands[1 - player]:
+            observed ^= opponentKeys[card]
+        return observed
+
+    def get_lands(self, player: int) -> Iterator[int]:
+        return (land for land, owner in enumerate(self.landOwner) if owner == player)
+
+    def get_land_neighbors(self, land: int) -> List[int]:
+        # cards next to the land on its row and diagonally on the outer row, as Game.get_land_neighbors
+        pos = self.landPos[land]
+        x, y = pos % BOARD_WIDTH, pos // BOARD_WIDTH
+        outerY = y + 1 if y > self.midRows[self.landOwner[land]] else y - 1
+        cards = []
+        for nx in (x - 1, x + 1):
+            if 0 <= nx < BOARD_WIDTH:
+                for ny in (y, outerY):
+                    code = self.board[ny][nx]
+                    if code >= PLAYABLE_BASE:
+                        cards.append(code - PLAYABLE_BASE)
+        return cards
+
+    def _get_lands_next_to(self, x: int, y: int) -> List[int]:
+        # lands having the square among their neighbors
+        midRow = self.midRows[self.rowOwners[y]]
+        if y == midRow:
+            return []
+        landY = y if abs(y - midRow) == 1 else (y - 1 if y > midRow else y + 1)
+        row = self.board[landY]
+        return [row[nx] - LAND_BASE for nx in (x - 1, x + 1) if 0 <= nx < BOARD_WIDTH and is_land(row[nx])]
+
+    ####################################################################################################################
+    #################   CALCULATING FUNCTIONS   ########################################################################
+    ####################################################################################################################
+
+    def get_resources_available(self, player: int) -> Dict[Resource, int]:
+        resources = {resource: 0 for resource in Resource}
+        for land in self.get_lands(player):
+            resources[LAND_CARDS[land][1]] += self.landHeld[land]
+        return resources
+
+    def get_land_yield(self, land: int) -> int:
+        # the mill of the land's resource next to it doubles the yield, gold has no mill
+        mill = LAND_MILLS[land]
+        return 2 if mill is not None and any(PLAYABLE_CARDS[card].name == mill
+                                             for card in self.get_land_neighbors(land)) else 1
+
+    def get_resources_total(self, player: int) -> int:
+        return self.features[player * FEATURES_CNT + RESOURCES_IDX]
+
+    def get_expected_yield(self, player: int) -> float:
+        # resources the player gets from the yield dice per roll, every land has one of six numbers
+        return self.features[player * FEATURES_CNT + YIELD_IDX] / 6
+
+    def get_trade_strength(self, player: int) -> int:
+        return self.features[player * FEATURES_CNT + TRADE_POINTS_IDX]
+
+    def get_battle_strength(self, player: int) -> int:
+        base = player * FEATURES_CNT
+        strength = self.features[base + BATTLE_POINTS_IDX]
+        # smithy adds one to every knight
+        if self.features[base + SMITHIES_IDX]:
+            strength += self.features[base + KNIGHTS_IDX]
+        return strength
+
+    def get_tournament_strength(self, player: int) -> int:
+        return self.features[player * FEATURES_CNT + TOURNAMENT_POINTS_IDX]
+
+    def get_victory_points(self, player: int) -> int:
+        base = player * FEATURES_CNT
+        points = self.features[base + SETTLEMENT_POINTS_IDX] + self.features[base + BUILDING_POINTS_IDX]
+
+        opponent = 1 - player
+        if self.get_trade_strength(player) > self.get_trade_strength(opponent):
+            points += 1
+        if self.get_battle_strength(player) > self.get_battle_strength(opponent):
+            points += 1
+        return points
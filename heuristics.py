@@ -0,0 +1,79 @@
+from __future__ import annotations
+from dataclasses import dataclass, asdict, fields
+from typing import Dict, List, Sequence, Tuple
+
+from card import Playable, Knight, Fleet
+
+
+@dataclass(frozen=True)
+class HeuristicParams:
+    # everything ComputerPlayer decides by fixed numbers, the defaults are the hand-made values
+    # priorities of the cards in hand (the starting cards are taken by them, the least one is thrown away)
+    millPriority: float = 5
+    warehousePriority: float = 5
+    cloisterPriority: float = 4
+    scoutPriority: float = 4
+    # knights are ok but we prefer cheaper ones - knightPriority minus the cost, knightMinPriority at least
+    knightPriority: float = 4
+    knightMinPriority: float = 1
+    fleetPriority: float = 2
+    smithyPriority: float = 1
+    # red buildings and the other actions
+    otherPriority: float = 0
+    # the same card, a second knight or fleet is worth less when one is taken already
+    duplicatePenalty: float = 2
+    # order of the builds in the action phase, the lowest first - every kind is tried without trading first, the
+    # action cards come after the builds paid without trading, then the builds needing trades follow in the same order
+    townOrder: float = 0
+    pathOrder: float = 1
+    villageOrder: float = 2
+    cardOrder: float = 3
+    actionOrder: float = 4
+
+    def to_vector(self) -> List[float]:
+        return [float(getattr(self, name)) for name in PARAM_NAMES]
+
+    @staticmethod
+    def from_vector(values: Sequence[float]) -> HeuristicParams:
+        if len(values) != len(PARAM_NAMES):
+            raise ValueError(f'{len(values)} values for {len(PARAM_NAMES)} parameters')
+        return HeuristicParams(**dict(zip(PARAM_NAMES, map(float, values))))
+
+    def to_dict(self) -> Dict[str, float]:
+        return asdict(self)
+
+    @staticmethod
+    def from_dict(values: Dict[str, float]) -> HeuristicParams:
+        # missing parameters keep their defaults, unknown ones are most likely typos
+        # the values come from user files -> checked even under python -O
+        unknown = sorted(set(values) - set(PARAM_NAMES))
+        if unknown:
+            raise ValueError(f'unknown heuristic params {unknown}')
+        return HeuristicParams(**{name: float(value) for name, value in values.items() if name in PARAM_NAMES})
+
+
+PARAM_NAMES: List[str] = [field.name for field in fields(HeuristicParams)]
+DEFAULT_PARAMS = HeuristicParams()
+# the range a tuning samples every parameter from
+PARAM_BOUNDS: Dict[str, Tuple[float, float]] = {name: (-2.0, 8.0) for name in PARAM_NAMES}
+PARAM_BOUNDS.update({name: (0.0, 5.0) for name in ['townOrder', 'pathOrder', 'villageOrder', 'cardOrder',
+                                                   'actionOrder', 'duplicatePenalty']})
+
+
+def get_card_priority(card: Playable, params: HeuristicParams=DEFAULT_PARAMS) -> float:
+    if card.name.endswith('mill'):
+        return params.millPriority
+    elif card.name == 'warehouse':
+        return params.warehousePriority
+    elif card.name == 'cloister':
+        return params.cloisterPriority
+    elif card.name == 'scout':
+        return params.scoutPriority
+    elif card.name in ['smithy']:
+        return params.smithyPriority
+    elif isinstance(card, Knight):
+        return max(params.knightPriority - card.cost.total(), params.knightMinPriority)
+    elif isinstance(card, Fleet):
+        return params.fleetPriority
+    else:
+        return params.otherPriority
@@ -41,7 +41,30 @@ class HumanPlayer(Player):
 
         return square.x + square.y * self.game.buttons.size.x
 
-    def initial_land_setup(self) -> None:
+    def _build_observed(self, card: Type[Town | Village | Path] | Buildable) -> None:
+        # the position is clicked first, the build is observed with it before it is made
+        if isinstance(card, Buildable):
+            if not self.can_cover_cost(card.cost):
+                self.game.logger.log('cannot_afford_card', card.name)
+                return
+            pos = self.select_new_card_position(Buildable, card.townOnly if isinstance(card, Building) else False)
+        else:
+            if self.game.infraCardsLeft[card] < 1:
+                self.game.logger.log('no_infra_left', card.__name__)
+                return
+            if not self.can_cover_cost(card.cost):
+                self.game.logger.log('cannot_afford_infra', card.__name__)
+                return
+            pos = self.select_new_card_position(card)
+        if pos is None:
+            return
+        self.observe_build(card, pos)
+        if isinstance(card, Buildable):
+            self.play_card_from_hand(card, pos)
+        else:
+            self.build_infrastructure(card, pos)
+
+    def initial_land_setup(self, deadline: Optional[float]=None) -> None:
         landSelected: Optional[Landscape] = None
         self.game.display.print_msg('setup land cards')
 
@@ -73,7 +96,7 @@ class HumanPlayer(Player):
                 click.board.set_square(landSelected.pos, land)
                 landSelected = None
 
-    def select_pile(self, unavailablePile: Optional[Pile]=None) -> Pile:
+    def select_pile(self, unavailablePile: Optional[Pile]=None, deadline: Optional[float]=None) -> Pile:
         self.game.display.print_msg('select a pile')
 
         while True:
@@ -84,11 +107,11 @@ class HumanPlayer(Player):
 
             pileIdx = pos.x - board.size.x + len(self.game.cardPiles)
             if self.game.cardPiles[pileIdx] is unavailablePile:
-                print('this pile is already chosen, select another')
+                self.game.logger.log('pile_already_chosen')
                 continue
             return self.game.cardPiles[pileIdx]
 
-    def select_card_from_choice(self, pile: Pile) -> Playable:
+    def select_card_from_choice(self, pile: Pile, deadline: Optional[float]=None) -> Playable:
         if self.cardsVisible:
             display_cards_on_board(pile, self.game.choiceBoard)
 
@@ -101,7 +124,7 @@ class HumanPlayer(Player):
         assert isinstance(card, Playable), 'invalid card in choice'
         return card
 
-    def select_resource_to_trade_for(self) -> Optional[Resource]:
+    def select_resource_to_trade_for(self, deadline: Optional[float]=None) -> Optional[Resource]:
         while True:
             click = self._get_filtered_click((
                 ClickFilter(player=self, cardType=Landscape),
@@ -119,7 +142,7 @@ class HumanPlayer(Player):
 
         return card.resource
 
-    def select_resource_to_purchase(self) -> Landscape:
+    def select_resource_to_purchase(self, deadline: Optional[float]=None) -> Landscape:
         while True:
             click = self._get_filtered_click(ClickFilter(
                 player=self,
@@ -134,14 +157,14 @@ class HumanPlayer(Player):
 
         return card
 
-    def pick_starting_cards(self) -> None:
+    def pick_starting_cards(self, deadline: Optional[float]=None) -> None:
         pile = self.select_pile()
         self.game.display.print_msg('select cards')
         while len(self.cardsInHand) < self.cardsInHandDefaultCnt:
             self.get_card_from_choice(pile)
         self.game.choiceBoard.clear()
 
-    def give_any_resource(self) -> None:
+    def give_any_resource(self, deadline: Optional[float]=None) -> None:
         # used only as second step by trader action card and thus should always be possible
         # TODO - maybe add a check anyway
         self.game.display.print_msg('give a resource')
@@ -160,16 +183,12 @@ class HumanPlayer(Player):
                 ownLandSelected = square
 
             if ownLandSelected is not None and square.player is self.opponent and square.resourcesHeld < MAX_LAND_RESOURCES and square.resource == ownLandSelected.resource:
-                ownLandSelected.resourcesHeld -= 1
-                square.resourcesHeld += 1
-                assert ownLandSelected.pos is not None
-                self.game.mainBoard.refresh_square(ownLandSelected.pos)
-                self.game.mainBoard.refresh_square(click.pos)
+                self.move_resource(ownLandSelected, square)
                 return
 
-    def grab_any_resource_if_possible(self) -> None:
+    def grab_any_resource_if_possible(self, deadline: Optional[float]=None) -> None:
         if not self.can_grab_resource_from_opponent():
-            print('sadly, no resource can be grabbed')
+            self.game.logger.log('nothing_to_grab')
             return
 
         self.game.display.print_msg('grab a resource')
@@ -188,15 +207,11 @@ class HumanPlayer(Player):
                 opponentLandSelected = square
 
             if opponentLandSelected is not None and square.player is self and square.resourcesHeld < MAX_LAND_RESOURCES and square.resource == opponentLandSelected.resource:
-                opponentLandSelected.resourcesHeld -= 1
-                square.resourcesHeld += 1
-                assert opponentLandSelected.pos is not None
-                self.game.mainBoard.refresh_square(opponentLandSelected.pos)
-                self.game.mainBoard.refresh_square(click.pos)
+                self.move_resource(opponentLandSelected, square)
                 return
 
 
-    def pick_any_resource(self) -> None:
+    def pick_any_resource(self, deadline: Optional[float]=None) -> None:
         self.game.display.print_msg('pick a resource')
         while True:
             click = self._get_filtered_click((
@@ -217,8 +232,7 @@ class HumanPlayer(Player):
             if square.resourcesHeld >= MAX_LAND_RESOURCES:
                 continue
 
-            square.resourcesHeld += 1
-            click.board.refresh_square(click.pos)
+            self.move_resource(None, square)
             return
 
     def wait_for_ok(self):
@@ -227,11 +241,11 @@ class HumanPlayer(Player):
             if self._button_clicked(click) == Button.OK.value:
                 return
 
-    def decide_use_defence(self, againstCard: str) -> bool:
+    def decide_use_defence(self, againstCard: str, deadline: Optional[float]=None) -> bool:
         self.game.display.print_msg(f'will you defend against {againstCard}?')
         return self.ok_or_cancel()
 
-    def select_card_to_steal_by_spy(self) -> Knight | Fleet | Action:
+    def select_card_to_steal_by_spy(self, deadline: Optional[float]=None) -> Knight | Fleet | Action:
         click = self._get_filtered_click(ClickFilter(
             board=self.game.choiceBoard,
             cardType=(Fleet, Knight, Action)
@@ -250,11 +264,11 @@ class HumanPlayer(Player):
         self.remove_action_card('alchemist')
         return self.game.buttons.to_int(click.pos) + 1
 
-    def decide_use_scout(self) -> bool:
+    def decide_use_scout(self, deadline: Optional[float]=None) -> bool:
         self.game.display.print_msg('will you use scout?')
         return self.ok_or_cancel()
 
-    def select_new_land(self) -> Landscape:
+    def select_new_land(self, deadline: Optional[float]=None) -> Landscape:
         display_cards_on_board(self.game.landscapeCards, self.game.choiceBoard)
 
         click = self._get_filtered_click(ClickFilter(
@@ -272,7 +286,7 @@ class HumanPlayer(Player):
         self.wait_for_ok()
 
         event: DiceEvent = self.game.throw_event_dice()
-        print(f'event: {event}')
+        self.game.logger.log('event_dice', event)
         self.game.handle_dice_events(event)
 
         diceNumber: int
@@ -289,11 +303,11 @@ class HumanPlayer(Player):
             self.wait_for_ok()
             diceNumber = self.game.throw_yield_dice()
 
-        print(f'yield: {diceNumber}')
+        self.game.logger.log('yield_dice', diceNumber)
 
         self.game.land_yield(diceNumber)
 
-    def select_card_to_pay(self, cost: Optional[Cost]=None) -> Landscape:
+    def select_card_to_pay(self, cost: Optional[Cost]=None, deadline: Optional[float]=None) -> Landscape:
         self.game.display.print_msg('select card to pay')
         while True:
             click = self._get_filtered_click(ClickFilter(
@@ -308,7 +322,8 @@ class HumanPlayer(Player):
             if card.resourcesHeld > 0 and (cost is None or cost.get(card.resource) > 0):
                 return card
 
-    def select_new_card_position(self, infraType: Type[Village | Path | Town | Buildable], townOnly=False) -> Optional[Pos]:
+    def select_new_card_position(self, infraType: Type[Village | Path | Town | Buildable], townOnly=False,
+                                 deadline: Optional[float]=None) -> Optional[Pos]:
         self.game.display.print_msg('choose card location')
         while True:
             click = self._get_filtered_click((
@@ -334,13 +349,13 @@ class HumanPlayer(Player):
             elif infraType == Buildable:
                 if isinstance(card, SettlementSlot) and card.settlement is not None and card.settlement.player is self:
                     if townOnly and isinstance(card.settlement, Village):
-                        print('this card needs to be placed in a town')
+                        self.game.logger.log('town_only_card')
                         continue
                     return click.pos
             else:
                 raise ValueError(f'unknown infra type: {infraType}')
 
-    def select_opponents_unit_to_remove(self) -> Knight | Fleet:
+    def select_opponents_unit_to_remove(self, deadline: Optional[float]=None) -> Knight | Fleet:
         self.game.display.print_msg('select opponents knight or fleet to remove')
         while True:
             card = self._get_filtered_click((
@@ -351,22 +366,22 @@ class HumanPlayer(Player):
             if not self.game.is_protected_from_civil_war(card):
                 return card
 
-    def decide_swap_one_card(self) -> bool:
+    def decide_swap_one_card(self, deadline: Optional[float]=None) -> bool:
         self.game.display.print_msg('will you swap one card?')
         return self.ok_or_cancel()
 
-    def decide_browse_pile(self) -> bool:
+    def decide_browse_pile(self, deadline: Optional[float]=None) -> bool:
         self.game.display.print_msg('will you browse a pile?')
         return self.ok_or_cancel()
 
-    def select_card_to_throw_away(self) -> Playable:
+    def select_card_to_throw_away(self, deadline: Optional[float]=None) -> Playable:
         self.game.display.print_msg('select card to throw away')
         click = self._get_filtered_click(ClickFilter(board=self.handBoard))
         card = click.board.get_square(click.pos)
         assert isinstance(card, Playable), 'wrong card type in hand'
         return card
 
-    def select_building_to_burn(self) -> Building:
+    def select_building_to_burn(self, deadline: Optional[float]=None) -> Building:
         click = self._get_filtered_click(ClickFilter(
             board=self.game.mainBoard,
             player=self.opponent,
@@ -377,7 +392,7 @@ class HumanPlayer(Player):
         assert isinstance(card, Building), f'selected card cannot be burnt: {card}'
         return card
 
-    def select_knight_to_kill(self) -> Knight:
+    def select_knight_to_kill(self, deadline: Optional[float]=None) -> Knight:
         click = self._get_filtered_click(ClickFilter(
             board=self.game.mainBoard,
             player=self.opponent,
@@ -388,7 +403,7 @@ class HumanPlayer(Player):
         assert isinstance(card, Knight), f'selected card cannot be killed: {card}'
         return card
 
-    def select_opponents_card_to_discard(self) -> Playable:
+    def select_opponents_card_to_discard(self, deadline: Optional[float]=None) -> Playable:
         click = self._get_filtered_click(ClickFilter(
             board=self.game.choiceBoard,
             cardType=Playable
@@ -397,7 +412,7 @@ class HumanPlayer(Player):
         assert isinstance(card, Playable), f'choice board has invalid content'
         return card
 
-    def trade_with_caravan(self) -> None:
+    def trade_with_caravan(self, deadline: Optional[float]=None) -> None:
         while True:
             self.game.display.print_msg('select a resource to get')
             click = self._get_filtered_click(ClickFilter(
@@ -421,12 +436,7 @@ class HumanPlayer(Player):
             if landToPay.resourcesHeld < 1:
                 continue
 
-            landToGet.resourcesHeld += 1
-            landToPay.resourcesHeld -= 1
-
-            assert landToPay.pos is not None and landToGet.pos is not None
-            self.game.mainBoard.refresh_square(landToPay.pos)
-            self.game.mainBoard.refresh_square(landToGet.pos)
+            self.move_resource(landToPay, landToGet)
 
     def ok_or_cancel(self) -> bool:
         while True:
@@ -436,7 +446,7 @@ class HumanPlayer(Player):
             if self._button_clicked(click) == Button.CANCEL.value:
                 return False
 
-    def do_actions(self) -> None:
+    def do_actions(self, deadline: Optional[float]=None) -> None:
         while True:
             self.game.display.print_msg('do something')
             click = self._get_filtered_click((
@@ -451,11 +461,13 @@ class HumanPlayer(Player):
             if self._button_clicked(click) == Button.END_TURN.value:
                 return
             elif click.board is self.game.mainBoard and card.name == 'back_path':
-                self.build_infrastructure(Path)
+                self._build_observed(Path)
             elif click.board is self.game.mainBoard and card.name == 'back_town':
-                self.build_infrastructure(Town)
+                self._build_observed(Town)
             elif click.board is self.game.mainBoard and card.name == 'back_village':
-                self.build_infrastructure(Village)
+                self._build_observed(Village)
+            elif click.board is self.handBoard and isinstance(card, Buildable):
+                self._build_observed(card)
             elif click.board is self.handBoard and isinstance(card, Playable):
                 self.play_card_from_hand(card)
             elif self._button_clicked(click) == Button.TRADE.value:
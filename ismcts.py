@@ -0,0 +1,95 @@
+from __future__ import annotations
+from math import log, sqrt
+from random import Random
+from typing import List, Optional, Sequence, Tuple
+
+from evaluation import Evaluator, evaluate_states
+from game_state import GameState
+from mcts import MctsSearch, Node, EXPLORATION_CONST, ROLLOUT_TURNS, get_tree_moves
+from move_generator import Move
+from rules import apply_turn_move
+
+DEFAULT_DETERMINIZATIONS = 8
+
+
+def determinize(state: GameState, observer: int, rng: Random, seenEvents: Sequence[int]=()) -> GameState:
+    # a copy of the state with the hidden cards of the observer dealt again at random:
+    #   - the opponent's hand and all piles get a shuffle of the cards of them all, the sizes are kept
+    #     (the cards are the ones neither in the observer's hand nor on the board, so they are known as a whole)
+    #   - the event cards drawn since the last new_year are at the bottom of the deck in the order they came,
+    #     the rest of the deck is shuffled above them
+    determinized = state.clone()
+    opponent = 1 - observer
+    hand = determinized.hands[opponent]
+    unknown = list(hand)
+    for pile in determinized.piles:
+        unknown.extend(pile)
+    rng.shuffle(unknown)
+    hand[:] = unknown[:len(hand)]
+    start = len(hand)
+    for pile in determinized.piles:
+        pile[:] = unknown[start:start + len(pile)]
+        start += len(pile)
+
+    events = determinized.events
+    seen = list(seenEvents[-len(events):]) if seenEvents else []
+    rest = list(events)
+    for event in seen:
+        rest.remove(event)
+    rng.shuffle(rest)
+    events[:] = rest + seen
+    determinized.rehash()
+    return determinized
+
+
+class IsmctsSearch(MctsSearch):
+    # single observer information set MCTS: every iteration plays one of a few determinizations of the root, the tree
+    # nodes are information sets of the searching player (moves and what the player sees after the dice), the moves
+    # of the opponent are the ones legal in the determinization of the iteration
+    def __init__(self, rng: Random, determinizationsCnt: int=DEFAULT_DETERMINIZATIONS,
+                 explorationConst: float=EXPLORATION_CONST, rolloutTurns: int=ROLLOUT_TURNS,
+                 evaluator: Evaluator=evaluate_states):
+        super().__init__(rng, explorationConst, rolloutTurns, evaluator)
+        self.determinizationsCnt: int = determinizationsCnt
+        self.determinizations: List[GameState] = []
+        self.observer: int = 0
+        self.iterationsDone: int = 0
+
+    def set_root(self, state: GameState, turnMoves: int=0, reuse: bool=False,
+                 seenEvents: Optional[Sequence[int]]=None, deadline: Optional[float]=None) -> None:
+        # seenEvents - ids of the event cards drawn since the last new_year, the last one drawn is the last
+        # the kept subtree is searched from new determinizations, its statistics are of the same information sets
+        self.observer = state.current
+        super().set_root(state, turnMoves, reuse, deadline)
+        self.determinizations = [determinize(state, self.observer, self.rng, seenEvents or ())
+                                 for _ in range(self.determinizationsCnt)]
+        self.iterationsDone = 0
+
+    def _get_iteration_state(self) -> GameState:
+        # the determinizations are reused round robin, every one of them gets the same share of the iterations
+        state = self.determinizations[self.iterationsDone % len(self.determinizations)].fork()
+        self.iterationsDone += 1
+        return state
+
+    def _get_node_key(self, state: GameState) -> int:
+        return state.get_observed_hash(self.observer)
+
+    def _select(self, node: Node, state: GameState, turnMoves: int) -> Tuple[Move, Node, bool]:
+        # the legal moves differ between determinizations, UCB counts only the visits when the move was available
+        moves = get_tree_moves(state, turnMoves)
+        children = node.children
+        untried = [move for move in moves if move not in children]
+        for move in moves:
+            if move in children:
+                children[move].available += 1
+        if untried:
+            move = untried[self.rng.randrange(len(untried))]
+            child = self._add_child(node, move, state)
+            child.available = 1
+            return move, child, True
+
+        explorationConst = self.explorationConst
+        move = max(moves, key=lambda m: children[m].reward / children[m].visits +
+                   explorationConst * sqrt(log(children[m].available) / children[m].visits))
+        apply_turn_move(state, move)
+        return move, children[move], False
@@ -0,0 +1,80 @@
+from __future__ import annotations
+from typing import Any, Callable, List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from board import Board
+    from card import Card
+    from util import Pos
+
+class Journal:
+    # every change made through the journal stores how to revert it, undo replays these in reverse order
+    # an undo costs as much as the changes it reverts, nothing is copied
+    def __init__(self):
+        self.entries: List[Tuple[Callable[..., Any], Tuple[Any, ...]]] = []
+
+    def mark(self) -> int:
+        return len(self.entries)
+
+    def undo(self, mark: int=0) -> None:
+        entries = self.entries
+        while len(entries) > mark:
+            undo, args = entries.pop()
+            undo(*args)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def set_attr(self, obj: Any, name: str, value: Any) -> None:
+        self.entries.append((setattr, (obj, name, getattr(obj, name))))
+        setattr(obj, name, value)
+
+    def set_item(self, container: Any, key: Any, value: Any) -> None:
+        self.entries.append((container.__setitem__, (key, container[key])))
+        container[key] = value
+
+    def append(self, lst: List[Any], item: Any) -> None:
+        lst.append(item)
+        self.entries.append((lst.pop, ()))
+
+    def remove(self, lst: List[Any], item: Any) -> None:
+        idx = lst.index(item)
+        del lst[idx]
+        self.entries.append((lst.insert, (idx, item)))
+
+    def pop(self, lst: List[Any], idx: int=-1) -> Any:
+        if idx < 0:
+            idx += len(lst)
+        item = lst.pop(idx)
+        self.entries.append((lst.insert, (idx, item)))
+        return item
+
+    def set_square(self, board: Board, pos: Pos, card: Card) -> None:
+        self.entries.append((board.set_square, (pos, board.get_square(pos))))
+        board.set_square(pos, card)
+
+
+class NullJournal(Journal):
+    # the same changes without recording anything, used while nobody needs to undo
+    def mark(self) -> int:
+        return 0
+
+    def undo(self, mark: int=0) -> None:
+        raise RuntimeError('changes were not recorded, nothing can be undone')
+
+    def set_attr(self, obj: Any, name: str, value: Any) -> None:
+        setattr(obj, name, value)
+
+    def set_item(self, container: Any, key: Any, value: Any) -> None:
+        container[key] = value
+
+    def append(self, lst: List[Any], item: Any) -> None:
+        lst.append(item)
+
+    def remove(self, lst: List[Any], item: Any) -> None:
+        lst.remove(item)
+
+    def pop(self, lst: List[Any], idx: int=-1) -> Any:
+        return lst.pop(idx)
+
+    def set_square(self, board: Board, pos: Pos, card: Card) -> None:
+        board.set_square(pos, card)
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from computer_player import ComputerPlayer
+from util import Pos
+from value_function import ValueFunction
+
+if TYPE_CHECKING:
+    from game import Game
+    from board import Board
+
+
+class LearnedPlayer(ComputerPlayer):
+    # ComputerPlayer taking its starting cards by the scores of a learned ValueFunction instead of the fixed
+    # priorities, e.g. Game(partial(LearnedPlayer, model=ValueFunction.load('value_function.npz')), ComputerPlayer)
+    def __init__(self, game: Game, handBoard: Board, number: int, midPos: Pos, model: ValueFunction):
+        super().__init__(game, handBoard, number, midPos)
+        self.model: ValueFunction = model
+
+    def __str__(self) -> str:
+        return 'learned'
+
+    __repr__ = __str__
+
+    def pick_starting_cards(self, deadline: Optional[float]=None) -> None:
+        # the card the position is worth most with is taken, the cards taken already are in the hand when the next one
+        # is scored, so a second card of the same kind scores by what it adds to the first one
+        pile = self.select_pile(deadline=deadline)
+        state = self.game.get_state()
+        playerIdx = self.game.get_player_idx(self)
+        while len(self.cardsInHand) < self.cardsInHandDefaultCnt:
+            scores = self.model.get_card_scores(state, playerIdx, [card.cardId for card in pile])
+            card = pile.pop(int(np.argmax(scores)))
+            self.cardsInHand.append(card)
+            state.add_to_hand(playerIdx, card.cardId)
+
+        self.refresh_hand_board()
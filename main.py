@@ -1,5 +1,3 @@
-import random
-import time
 from game import Game
 
 # TODOS
@@ -24,7 +22,6 @@ from game import Game
 #  - util.py                  PART
 
 def main():
-    random.seed(time.time())
     game = Game()
     game.play()
 
@@ -0,0 +1,228 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from math import log, sqrt
+from random import Random
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+from enums import ActionType
+from evaluation import Evaluator, evaluate_states
+from game_state import GameState
+from move_generator import Move, END_TURN_MOVE
+from rules import apply_dice, apply_turn_move, finish_turn, generate_turn_moves, get_winner, play_actions, play_turn
+
+# iterations of a search without any budget, chosen so that a whole game takes seconds; an iteration count (unlike
+# a time limit) keeps the games reproducible by their seed
+# MctsPlayer against ComputerPlayer in the games of seeds 100-107 on one core:
+#   50 iterations won 3 of 8, about 3 s a game
+#   100 iterations won 4 of 8, about 6 s a game
+#   500 iterations won 5 of 8, about 31 s a game
+#   1000 iterations won 6 of 8, about 63 s a game
+# pass iterations or timeLimit to MctsPlayer when strength matters more than speed
+DEFAULT_ITERATIONS = 100
+EXPLORATION_CONST = 0.7
+# whole turns played by the rollout policy after the tree, the position is evaluated after them
+ROLLOUT_TURNS = 2
+# the tree does not consider more moves in one turn, END_TURN is the only move afterwards
+MAX_TURN_MOVES = 8
+# nodes find_node visits between two checks of the deadline
+FIND_CHECK_NODES = 1024
+
+
+def get_tree_moves(state: GameState, turnMoves: int) -> List[Move]:
+    # builds including the bank trades they need, single trades lead nowhere within a few plies
+    # action cards need decisions of both players and tosses, the tree leaves them to the player
+    if turnMoves >= MAX_TURN_MOVES:
+        return [END_TURN_MOVE]
+    return generate_turn_moves(state)
+
+
+@dataclass(frozen=True)
+class SearchStats:
+    iterations: int
+    elapsed: float
+    # of a parallel search the time outside the workers' searches - starting them, passing the state, collecting
+    overhead: float = 0.0
+
+    @property
+    def iterationsPerSecond(self) -> float:
+        return self.iterations / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class Node:
+    # mover made the move leading to the node, reward is the sum of results from the mover's point of view
+    # children of an END_TURN node are keyed by GameState.zobrist of the position after the dice of the next turn,
+    # the event cards make the same dice lead to different positions
+    # key is the hash of the position when the node was created, the next search finds its root by it
+    __slots__ = ('mover', 'isChance', 'children', 'untried', 'visits', 'reward', 'terminal', 'available', 'key')
+
+    def __init__(self, mover: int, isChance: bool=False, key: int=0):
+        self.mover: int = mover
+        self.key: int = key
+        self.isChance: bool = isChance
+        self.children: Dict[Move | int, Node] = {}
+        # generated on the first visit
+        self.untried: Optional[List[Move]] = None
+        self.visits: int = 0
+        self.reward: float = 0.0
+        # result for player 0 when the game ends at the node
+        self.terminal: Optional[float] = None
+        # information set search only - how many times the move was legal when its parent was visited
+        self.available: int = 0
+
+    def select_child(self, explorationConst: float) -> Tuple[Move, Node]:
+        # UCT
+        logVisits = log(self.visits)
+        return max(self.children.items(), key=lambda item: item[1].reward / item[1].visits +
+                   explorationConst * sqrt(logVisits / item[1].visits))
+
+
+class MctsSearch:
+    # Monte Carlo tree search of the current player's moves from a position after the dice of the turn
+    # the tree goes on through the following turns, the dice are sampled at the chance nodes
+    # evaluator - values of the positions the rollouts end in, see evaluation.Evaluator
+    def __init__(self, rng: Random, explorationConst: float=EXPLORATION_CONST, rolloutTurns: int=ROLLOUT_TURNS,
+                 evaluator: Evaluator=evaluate_states):
+        self.rng: Random = rng
+        self.explorationConst: float = explorationConst
+        self.rolloutTurns: int = rolloutTurns
+        self.evaluator: Evaluator = evaluator
+        self.root: Node = Node(-1)
+        self.rootState: Optional[GameState] = None
+        self.rootTurnMoves: int = 0
+
+    def set_root(self, state: GameState, turnMoves: int=0, reuse: bool=False,
+                 deadline: Optional[float]=None) -> None:
+        # turnMoves - moves the current player already did in this turn
+        # reuse - the subtree of the previous search reaching the position becomes the root, with all its statistics,
+        # a new root is started when the subtree is not found by the deadline
+        key = self._get_node_key(state)
+        root = self.find_node(key, deadline) if reuse else None
+        self.root = root if root is not None else Node(1 - state.current, key=key)
+        self.rootState = state.fork()
+        self.rootTurnMoves = turnMoves
+
+    def find_node(self, key: int, deadline: Optional[float]=None) -> Optional[Node]:
+        # breadth first, the nearest decision node of the position, positions repeat only when nothing happened
+        # the deadline is checked every FIND_CHECK_NODES nodes, None when it has passed
+        nodes = [self.root]
+        visited = 0
+        while nodes:
+            nextNodes = []
+            for node in nodes:
+                if node.key == key and not node.isChance:
+                    return node
+                nextNodes.extend(node.children.values())
+                visited += 1
+                if deadline is not None and visited % FIND_CHECK_NODES == 0 and perf_counter() >= deadline:
+                    return None
+            nodes = nextNodes
+        return None
+
+    def run(self, iterations: Optional[int]=None, timeLimit: Optional[float]=None,
+            deadline: Optional[float]=None) -> SearchStats:
+        # stops at whichever budget comes first, without any budget DEFAULT_ITERATIONS are done
+        # deadline - time.perf_counter() value, the search returns at most one iteration after it, best_move() is then
+        # the best move found so far
+        assert self.rootState is not None, 'search has no root'
+        if iterations is None and timeLimit is None:
+            iterations = DEFAULT_ITERATIONS
+        start = perf_counter()
+        stop = start + timeLimit if timeLimit is not None else None
+        if deadline is not None:
+            stop = deadline if stop is None else min(stop, deadline)
+        done = 0
+        while (iterations is None or done < iterations) and (stop is None or perf_counter() < stop):
+            self._iterate()
+            done += 1
+        return SearchStats(done, perf_counter() - start)
+
+    def get_root_stats(self) -> Dict[Move, Tuple[int, float]]:
+        # visits and reward of every move searched at the root
+        return {move: (child.visits, child.reward) for move, child in self.root.children.items()}
+
+    def best_move(self) -> Move:
+        # the most visited move, END_TURN when nothing was searched
+        if not self.root.children:
+            return END_TURN_MOVE
+        return max(self.root.children.items(), key=lambda item: item[1].visits)[0]
+
+    def _get_iteration_state(self) -> GameState:
+        assert self.rootState is not None
+        return self.rootState.fork()
+
+    def _get_node_key(self, state: GameState) -> int:
+        return state.zobrist
+
+    def _select(self, node: Node, state: GameState, turnMoves: int) -> Tuple[Move, Node, bool]:
+        # the next move from a decision node, the child and whether it was just added
+        if node.untried is None:
+            node.untried = get_tree_moves(state, turnMoves)
+        if node.untried:
+            move = node.untried.pop(self.rng.randrange(len(node.untried)))
+            return move, self._add_child(node, move, state), True
+        move, child = node.select_child(self.explorationConst)
+        apply_turn_move(state, move)
+        return move, child, False
+
+    def _iterate(self) -> None:
+        state = self._get_iteration_state()
+        turnMoves = self.rootTurnMoves
+        node = self.root
+        path = [node]
+
+        # selection and expansion
+        result: Optional[float] = None
+        while True:
+            if node.terminal is not None:
+                result = node.terminal
+                break
+            if node.isChance:
+                apply_dice(state, self.rng.randint(1, 6), self.rng.randint(1, 6), self.rng)
+                key = self._get_node_key(state)
+                child = node.children.get(key)
+                if child is None:
+                    child = node.children[key] = Node(node.mover, key=key)
+                node = child
+                path.append(node)
+                continue
+
+            _, node, added = self._select(node, state, turnMoves)
+            path.append(node)
+            if added:
+                break
+            if node.isChance:
+                turnMoves = 0
+            else:
+                turnMoves += 1
+
+        if result is None:
+            result = node.terminal if node.terminal is not None else self._rollout(state, node.isChance)
+
+        for node in path:
+            node.visits += 1
+            node.reward += result if node.mover == 0 else 1.0 - result
+
+    def _add_child(self, parent: Node, move: Move, state: GameState) -> Node:
+        mover = state.current
+        apply_turn_move(state, move)
+        child = parent.children[move] = Node(mover, move[0] == ActionType.END_TURN, self._get_node_key(state))
+        if child.isChance:
+            winner = get_winner(state)
+            if winner is not None:
+                child.terminal = 1.0 if winner == 0 else 0.0
+        return child
+
+    def _rollout(self, state: GameState, turnFinished: bool) -> float:
+        if not turnFinished:
+            play_actions(state, self.rng)
+            finish_turn(state)
+        for _ in range(self.rolloutTurns):
+            winner = get_winner(state)
+            if winner is not None:
+                return 1.0 if winner == 0 else 0.0
+            play_turn(state, self.rng)
+        winner = get_winner(state)
+        if winner is not None:
+            return 1.0 if winner == 0 else 0.0
+        return float(self.evaluator([state])[0])
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor, wait
+from random import Random
+from time import sleep
+from typing import TYPE_CHECKING, List, Optional
+
+from card import Buildable, Village, Town, Path
+from computer_player import ComputerPlayer
+from enums import ActionType
+from evaluation import Evaluator, evaluate_states
+from game_state import GameState, EVENT_TYPES
+from ismcts import IsmctsSearch, DEFAULT_DETERMINIZATIONS
+from mcts import MctsSearch, SearchStats, MAX_TURN_MOVES
+from move_generator import Move, END_TURN_MOVE
+from root_parallel import search_root_parallel
+from rules import choose_rollout_move
+from util import Pos
+
+if TYPE_CHECKING:
+    from game import Game
+    from board import Board
+
+INFRA_TYPES = {ActionType.BUILD_VILLAGE: Village, ActionType.BUILD_TOWN: Town, ActionType.BUILD_PATH: Path}
+# seconds, before the overhead of a parallel search is known
+DEFAULT_DISPATCH_MARGIN = 0.02
+MARGIN_DECAY = 0.9
+# every warm-up task keeps its worker busy so that the next one starts another process
+WARM_UP_TIME = 0.05
+
+
+class MctsPlayer(ComputerPlayer):
+    # chooses the moves of the action phase by Monte Carlo tree search, other decisions are ComputerPlayer's
+    # every move gets its own search with the budget below, without any budget the search default is used
+    # use functools.partial to pass a budget to Game, e.g. Game(HumanPlayer, partial(MctsPlayer, timeLimit=0.5))
+    # the search sees only what the player can see (information set MCTS) unless perfectInformation is set
+    # with more workers the trees are searched in a process pool and their root statistics merged, the pool is
+    # stopped by close() at the end of Game.play
+    # with reuseTree the part of the previous tree reaching the current position is searched on, the workers do not
+    # keep their trees
+    # evaluator values the positions the rollouts end in, e.g. ValueFunction.evaluate_states of a trained model
+    def __init__(self, game: Game, handBoard: Board, number: int, midPos: Pos, iterations: Optional[int]=None,
+                 timeLimit: Optional[float]=None, perfectInformation: bool=False,
+                 determinizations: int=DEFAULT_DETERMINIZATIONS, workers: int=1, reuseTree: bool=True,
+                 evaluator: Evaluator=evaluate_states):
+        super().__init__(game, handBoard, number, midPos)
+        self.iterations: Optional[int] = iterations
+        self.timeLimit: Optional[float] = timeLimit
+        self.perfectInformation: bool = perfectInformation
+        self.determinizations: int = determinizations
+        self.workers: int = workers
+        self.reuseTree: bool = reuseTree
+        self.evaluator: Evaluator = evaluator
+        self.search: Optional[MctsSearch] = None
+        # visits of the root taken over from the previous search, the last search only
+        self.reusedVisits: int = 0
+        # started before the first decision (see start_workers), the workers stay for the whole game
+        self.executor: Optional[ProcessPoolExecutor] = None
+        # time taken from the deadline for passing the state to the workers and collecting their results, follows the
+        # overhead of the previous searches
+        self.dispatchMargin: float = DEFAULT_DISPATCH_MARGIN
+        # event cards drawn since the last new_year, they lie at the bottom of the deck in this order
+        self.seenEvents: List[int] = []
+        # own stream, searching does not change the dice of the game
+        self.rng: Random = Random(game.rng.getrandbits(64))
+        self.lastStats: Optional[SearchStats] = None
+        self.totalIterations: int = 0
+        self.totalSearchTime: float = 0.0
+
+    def __str__(self) -> str:
+        return 'mcts'
+
+    __repr__ = __str__
+
+    def get_iterations_per_second(self) -> float:
+        return self.totalIterations / self.totalSearchTime if self.totalSearchTime > 0 else 0.0
+
+    def do_actions(self, deadline: Optional[float]=None) -> None:
+        # action cards toss coins and ask the opponent, they are played by the heuristics of ComputerPlayer first
+        # every search stops at the deadline, the moves after it are the ones the search has found so far
+        actionCardToPlay = self._find_action_card_to_play()
+        while actionCardToPlay is not None:
+            self.play_card_from_hand(actionCardToPlay)
+            actionCardToPlay = self._find_action_card_to_play()
+
+        # one state per move, searched, observed and used by the fallback
+        for turnMoves in range(MAX_TURN_MOVES):
+            state = self.game.get_state()
+            move = self.search_move(turnMoves, deadline, state)
+            if move[0] == ActionType.END_TURN:
+                return
+            self.execute_move(move, state)
+
+    def observe_card_event(self, eventName: str) -> None:
+        if eventName == 'new_year':
+            self.seenEvents = []
+        else:
+            self.seenEvents.append(EVENT_TYPES[eventName])
+
+    def start_workers(self) -> None:
+        # the worker processes are started by tasks running side by side, none of the timed decisions waits for them
+        if self.workers > 1 and self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            wait([self.executor.submit(sleep, WARM_UP_TIME) for _ in range(self.workers)])
+
+    def initial_land_setup(self, deadline: Optional[float]=None) -> None:
+        super().initial_land_setup(deadline)
+        self.start_workers()
+
+    def close(self) -> None:
+        # stops the worker processes, the player can still search, a new pool is started then
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def search_move(self, turnMoves: int=0, deadline: Optional[float]=None, state: Optional[GameState]=None) -> Move:
+        # without anything searched (the deadline has passed) the move of the rollout policy is played
+        # state - the current position if it is built already
+        if state is None:
+            state = self.game.get_state()
+        if self.workers > 1:
+            self.start_workers()
+            assert self.executor is not None
+            move, stats = search_root_parallel(self.executor, self.workers, state, turnMoves,
+                                               self.seenEvents, self.iterations, self.timeLimit,
+                                               self.rng.getrandbits(64), self.perfectInformation,
+                                               self.determinizations, deadline, self.dispatchMargin, self.evaluator)
+            # a sudden overhead is taken at once, the margin shrinks back slowly
+            self.dispatchMargin = max(stats.overhead, self.dispatchMargin * MARGIN_DECAY)
+            self.record_stats(stats)
+            return move if stats.iterations else self.get_fallback_move(turnMoves, state)
+
+        search = self.search
+        if search is None or not self.reuseTree:
+            search = MctsSearch(self.rng, evaluator=self.evaluator) if self.perfectInformation \
+                else IsmctsSearch(self.rng, self.determinizations, evaluator=self.evaluator)
+            self.search = search
+        if isinstance(search, IsmctsSearch):
+            search.set_root(state, turnMoves, self.reuseTree, self.seenEvents, deadline)
+        else:
+            search.set_root(state, turnMoves, self.reuseTree, deadline)
+        self.reusedVisits = search.root.visits
+        self.record_stats(search.run(self.iterations, self.timeLimit, deadline))
+        return search.best_move() if search.root.children else self.get_fallback_move(turnMoves, state)
+
+    def get_fallback_move(self, turnMoves: int, state: GameState) -> Move:
+        if turnMoves >= MAX_TURN_MOVES:
+            return END_TURN_MOVE
+        return choose_rollout_move(state, self.rng)
+
+    def record_stats(self, stats: SearchStats) -> None:
+        self.lastStats = stats
+        self.totalIterations += stats.iterations
+        self.totalSearchTime += stats.elapsed
+        self.game.logger.log('search_stats', self.number, stats.iterations, stats.elapsed, stats.iterationsPerSecond)
+
+    def execute_move(self, move: Move, state: Optional[GameState]=None) -> None:
+        # the search plays builds together with the bank trades they need, see rules.apply_turn_move
+        # the move is observed before the trades, as searched
+        actionType, card, pos = move
+        if actionType in INFRA_TYPES:
+            infraType = INFRA_TYPES[actionType]
+            self.game.observe_move(self, move, state)
+            self.trade_to_cover_cost(infraType.cost)
+            self.build_infrastructure(infraType, self.game.mainBoard.to_pos(pos))
+        elif actionType == ActionType.BUILD_FROM_HAND:
+            playable = self.game.playableCardsById[card]
+            assert isinstance(playable, Buildable)
+            self.game.observe_move(self, move, state)
+            self.trade_to_cover_cost(playable.cost)
+            self.play_card_from_hand(playable, self.game.mainBoard.to_pos(pos))
+        else:
+            assert False, f'cannot execute move {move}'
@@ -0,0 +1,137 @@
+from typing import Callable, List, Optional, Tuple
+
+from card import Action, Buildable, Building, Fleet, Village, Town, Path
+from config import MAX_LAND_RESOURCES
+from enums import ActionType, Resource
+from game_state import GameState, PLAYABLE_CARDS, LAND_CARDS, BOARD_WIDTH, EMPTY, SLOT, PATH, VILLAGE, \
+    TOWN, VILLAGE_IDX, PATH_IDX, TOWN_IDX
+from util import Cost
+
+# a move is (type, card, pos), unused parts are -1:
+#   BUILD_FROM_HAND   playable id, board index of the slot
+#   BUILD_VILLAGE     -1, board index
+#   BUILD_TOWN        -1, board index of the village
+#   BUILD_PATH        -1, board index
+#   BANK_TRADE        land id receiving the resource, index of the paid resource in RESOURCES
+#   ACTION_CARD       playable id, -1
+#   END_TURN          -1, -1
+# board index is x + y * BOARD_WIDTH, the same as GameState.landPos
+Move = Tuple[ActionType, int, int]
+
+END_TURN_MOVE: Move = (ActionType.END_TURN, -1, -1)
+
+RESOURCES: List[Resource] = list(Resource)
+GOLD_IDX = RESOURCES.index(Resource.GOLD)
+
+# action cards which can be played during the action phase, the others are played only in specific situations
+PLAYABLE_ACTIONS = {'spy', 'arson', 'ambush', 'trader', 'caravan', 'black_knight'}
+
+
+def get_cost_vector(cost: Cost) -> Tuple[int, ...]:
+    return tuple(cost.get(resource) for resource in RESOURCES)
+
+# everything about the cards is looked up by id, no card object is touched while generating
+# in the order of GameState.infraLeft
+INFRA_COSTS: List[Tuple[int, ...]] = [get_cost_vector(infraType.cost) for infraType in (Village, Path, Town)]
+PLAYABLE_COSTS: List[Optional[Tuple[int, ...]]] = [
+    get_cost_vector(card.cost) if isinstance(card, Buildable) else None for card in PLAYABLE_CARDS
+]
+TOWN_ONLY: List[bool] = [isinstance(card, Building) and card.townOnly for card in PLAYABLE_CARDS]
+ACTION_PLAYABLE: List[bool] = [isinstance(card, Action) and card.name in PLAYABLE_ACTIONS for card in PLAYABLE_CARDS]
+LAND_RESOURCE_IDX: List[int] = [RESOURCES.index(resource) for _, resource, _, _ in LAND_CARDS]
+
+
+def get_resource_vector(state: GameState, player: int) -> List[int]:
+    resources = [0] * len(RESOURCES)
+    landHeld = state.landHeld
+    for land, owner in enumerate(state.landOwner):
+        if owner == player:
+            resources[LAND_RESOURCE_IDX[land]] += landHeld[land]
+    return resources
+
+def can_afford(resources: List[int], cost: Tuple[int, ...]) -> bool:
+    for held, needed in zip(resources, cost):
+        if held < needed:
+            return False
+    return True
+
+def get_trade_rates(state: GameState, player: int) -> List[int]:
+    # the same rates as Player.get_resource_cost
+    rates = [3] * len(RESOURCES)
+    for card in state.get_played_cards(player):
+        if isinstance(card, Fleet) and card.affectedResource != Resource.GOLD:
+            rates[RESOURCES.index(card.affectedResource)] = 2
+        elif card.name == 'mint':
+            rates[GOLD_IDX] = 1
+    return rates
+
+
+def generate_build_moves(state: GameState, player: int, isAffordable: Callable[[Tuple[int, ...]], bool]) -> List[Move]:
+    # cards from hand and infrastructure the player can build, isAffordable decides about the cost vectors
+    board = state.board
+    midRow = state.midRows[player]
+    row = board[midRow]
+    moves: List[Move] = []
+
+    # free slots of the settlements, a slot is free as long as it holds the SLOT code
+    villageSlots: List[int] = []
+    townSlots: List[int] = []
+    for x, code in enumerate(row):
+        if code == VILLAGE or code == TOWN:
+            slots = townSlots if code == TOWN else villageSlots
+            for dy in ((-1, 1, -2, 2) if code == TOWN else (-1, 1)):
+                if board[midRow + dy][x] == SLOT:
+                    slots.append(x + (midRow + dy) * BOARD_WIDTH)
+
+    if villageSlots or townSlots:
+        for card in state.hands[player]:
+            cost = PLAYABLE_COSTS[card]
+            if cost is None or not isAffordable(cost):
+                continue
+            if not TOWN_ONLY[card]:
+                moves.extend((ActionType.BUILD_FROM_HAND, card, pos) for pos in villageSlots)
+            moves.extend((ActionType.BUILD_FROM_HAND, card, pos) for pos in townSlots)
+
+    infraLeft = state.infraLeft
+    canVillage = infraLeft[VILLAGE_IDX] > 0 and len(state.landDeck) >= 2 and isAffordable(INFRA_COSTS[VILLAGE_IDX])
+    canPath = infraLeft[PATH_IDX] > 0 and isAffordable(INFRA_COSTS[PATH_IDX])
+    canTown = infraLeft[TOWN_IDX] > 0 and isAffordable(INFRA_COSTS[TOWN_IDX])
+    if canVillage or canPath or canTown:
+        rowOffset = midRow * BOARD_WIDTH
+        for x, code in enumerate(row):
+            if code == EMPTY:
+                left = row[x - 1] if x > 0 else EMPTY
+                right = row[x + 1] if x + 1 < BOARD_WIDTH else EMPTY
+                # a new village needs room for its two lands on the outer side
+                if canVillage and 0 < x < BOARD_WIDTH - 1 and (left == PATH or right == PATH):
+                    moves.append((ActionType.BUILD_VILLAGE, -1, rowOffset + x))
+                if canPath and (left == VILLAGE or left == TOWN or right == VILLAGE or right == TOWN):
+                    moves.append((ActionType.BUILD_PATH, -1, rowOffset + x))
+            elif code == VILLAGE and canTown:
+                moves.append((ActionType.BUILD_TOWN, -1, rowOffset + x))
+    return moves
+
+
+def generate_moves(state: GameState, player: Optional[int]=None) -> List[Move]:
+    # all moves the player can do in its action phase, END_TURN is always the last one
+    if player is None:
+        player = state.current
+    resources = get_resource_vector(state, player)
+    moves = generate_build_moves(state, player, lambda cost: can_afford(resources, cost))
+
+    # bank trade - pay the rate of one resource, get one resource of another kind to a land with free space
+    rates = get_trade_rates(state, player)
+    paid = [idx for idx, rate in enumerate(rates) if resources[idx] >= rate]
+    if paid:
+        landHeld = state.landHeld
+        for land, owner in enumerate(state.landOwner):
+            if owner == player and landHeld[land] < MAX_LAND_RESOURCES:
+                landResource = LAND_RESOURCE_IDX[land]
+                moves.extend((ActionType.BANK_TRADE, land, idx) for idx in paid if idx != landResource)
+
+    for card in state.hands[player]:
+        if ACTION_PLAYABLE[card]:
+            moves.append((ActionType.ACTION_CARD, card, -1))
+
+    moves.append(END_TURN_MOVE)
+    return moves
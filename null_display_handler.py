@@ -0,0 +1,26 @@
+from __future__ import annotations
+from typing import List, TYPE_CHECKING
+from util import Pos, MouseClick
+
+if TYPE_CHECKING:
+    from board import Board
+
+class NullDisplayHandler:
+    # drop-in replacement for DisplayHandler used by headless games, nothing is drawn and no assets are loaded
+    def __init__(self):
+        self.boards: List[Board] = []
+        self.textTopLeft: Pos = Pos(0, 0)
+
+    def print_msg(self, msg: str) -> None:
+        pass
+
+    def refresh_screen(self) -> None:
+        # nobody will ever draw the edited squares, just forget them
+        for board in self.boards:
+            board.editedSquares.clear()
+
+    def add_board(self, board: Board) -> None:
+        self.boards.append(board)
+
+    def get_mouse_click(self) -> MouseClick:
+        raise RuntimeError('headless game cannot wait for a mouse click')
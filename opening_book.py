@@ -0,0 +1,69 @@
+from __future__ import annotations
+import json
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from card import Playable, Landscape, Knight, Fleet
+
+# the opening book is computed offline by book_builder.py and answers the opening decisions by a dict lookup:
+#   lands  the starting lands of a player (their ids sorted) -> land id for every initial land position,
+#          see Player.get_initial_land_positions
+#   hands  the card classes present in the pile a player takes the starting cards from -> the classes to take,
+#          the card of a class is taken by its priority
+# a decision missing in the book is made by the heuristics
+CARD_CLASSES: List[str] = ['mill', 'warehouse', 'cloister', 'scout', 'smithy', 'knight1', 'knight2', 'knight3', 'fleet',
+                           'other']
+
+LandKey = Tuple[int, ...]
+HandKey = Tuple[str, ...]
+
+
+def get_card_class(card: Playable) -> str:
+    if card.name.endswith('mill'):
+        return 'mill'
+    elif card.name in ['warehouse', 'cloister', 'scout', 'smithy']:
+        return card.name
+    elif isinstance(card, Knight):
+        return f'knight{min(card.cost.total(), 3)}'
+    elif isinstance(card, Fleet):
+        return 'fleet'
+    else:
+        return 'other'
+
+
+def get_hand_key(pile: Iterable[Playable]) -> HandKey:
+    classes = {get_card_class(card) for card in pile}
+    return tuple(cardClass for cardClass in CARD_CLASSES if cardClass in classes)
+
+
+def get_land_key(lands: Iterable[Landscape]) -> LandKey:
+    return tuple(sorted(land.cardId for land in lands))
+
+
+@dataclass
+class OpeningBook:
+    lands: Dict[LandKey, Tuple[int, ...]] = field(default_factory=dict)
+    hands: Dict[HandKey, Tuple[str, ...]] = field(default_factory=dict)
+
+    def get_land_arrangement(self, lands: Iterable[Landscape]) -> Optional[Tuple[int, ...]]:
+        return self.lands.get(get_land_key(lands))
+
+    def get_hand(self, pile: Iterable[Playable]) -> Optional[Tuple[str, ...]]:
+        return self.hands.get(get_hand_key(pile))
+
+    def update(self, other: OpeningBook) -> None:
+        self.lands.update(other.lands)
+        self.hands.update(other.hands)
+
+    def save(self, path: str) -> None:
+        # JSON has no tuple keys -> lists of [key, value] pairs
+        with open(path, 'w') as file:
+            json.dump({'lands': [[list(key), list(value)] for key, value in self.lands.items()],
+                       'hands': [[list(key), list(value)] for key, value in self.hands.items()]}, file, indent=1)
+
+    @staticmethod
+    def load(path: str) -> OpeningBook:
+        with open(path) as file:
+            data = json.load(file)
+        return OpeningBook(lands={tuple(key): tuple(value) for key, value in data['lands']},
+                           hands={tuple(key): tuple(value) for key, value in data['hands']})
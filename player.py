@@ -1,14 +1,13 @@
 from __future__ import annotations
 import copy
 from abc import ABC, abstractmethod
-from random import randint
 from typing import TYPE_CHECKING, List, Dict, Optional, Type, Set
 
 import config
 from card import Action, Buildable, Building, Playable, SettlementSlot, Village, Town, Path, Knight, Fleet, Settlement
 from config import BROWSE_DISCOUNT_BUILDINGS, CARDS_INCREASING_HAND_CNT, STOLEN_AMBUSH_RESOURCES, ADVANCE_BUILDINGS, \
     MAX_LAND_RESOURCES
-from enums import Resource
+from enums import ActionType, Resource
 from util import Pos, Cost, DEFENCE_CARDS, is_protected_from_civil_war, display_cards_on_board
 
 if TYPE_CHECKING:
@@ -16,6 +15,8 @@ if TYPE_CHECKING:
     from game import Game, Pile
     from board import Board
 
+INFRA_ACTIONS = {Village: ActionType.BUILD_VILLAGE, Town: ActionType.BUILD_TOWN, Path: ActionType.BUILD_PATH}
+
 class Player(ABC):
     def __init__(self, game: Game, handBoard: Board, number: int, cardsVisible: bool, midPos: Pos):
         self.game: Game = game
@@ -33,14 +34,7 @@ class Player(ABC):
         self.paths: List[Path] = []
         self.cardsVisible: bool = cardsVisible
         self.midPos: Pos = midPos
-        self.initialLandPos: List[Pos] = [
-            self.midPos.up(),
-            self.midPos.down(),
-            self.midPos.up().right(2),
-            self.midPos.down().right(2),
-            self.midPos.up().left(2),
-            self.midPos.down().left(2)
-        ]
+        self.initialLandPos: List[Pos] = self.get_initial_land_positions()
     ####################################################################################################################
     #################   CALCULATING FUNCTIONS   ########################################################################
     ####################################################################################################################
@@ -147,6 +141,25 @@ class Player(ABC):
     #################   CARD PLACEMENT         #########################################################################
     ####################################################################################################################
 
+    def get_initial_land_positions(self) -> List[Pos]:
+        # the lands are dealt from the end of the list
+        return [
+            self.midPos.up(),
+            self.midPos.down(),
+            self.midPos.up().right(2),
+            self.midPos.down().right(2),
+            self.midPos.up().left(2),
+            self.midPos.down().left(2)
+        ]
+
+    def arrange_initial_lands(self, landIds: List[int]) -> None:
+        # the starting lands moved to the initial positions, landIds[i] goes to get_initial_land_positions()[i]
+        lands = {land.cardId: land for land in self.landscapeCards}
+        assert sorted(landIds) == sorted(lands), f'lands {landIds} are not the lands of player{self.number}'
+        for pos, landId in zip(self.get_initial_land_positions(), landIds):
+            lands[landId].pos = pos
+            self.game.mainBoard.set_square(pos, lands[landId])
+
     def setup_initial_land_card(self, card: Landscape) -> None:
         assert self.initialLandPos, 'cannot setup any more land'
         card.pos = self.initialLandPos.pop()
@@ -155,7 +168,9 @@ class Player(ABC):
 
     def place_new_land(self, villagePos: Pos) -> None:
         assert villagePos.y == self.midPos.y and villagePos.x != self.midPos.x, 'invalid village position'
-        scoutUse: bool = 'scout' in map(lambda x: x.name, self.cardsInHand) and self.decide_use_scout()
+        scoutUse: bool = 'scout' in map(lambda x: x.name, self.cardsInHand) \
+            and self.decide_use_scout(deadline=self.game.get_deadline())
+        journal = self.game.journal
 
         if villagePos.x > self.midPos.x:
             landPositions = villagePos.up().right(), villagePos.down().right()
@@ -164,30 +179,39 @@ class Player(ABC):
 
         for pos in landPositions:
             if scoutUse:
-                newLand = self.select_new_land()
-                self.game.landscapeCards.remove(newLand)
+                newLand = self.select_new_land(deadline=self.game.get_deadline())
+                journal.remove(self.game.landscapeCards, newLand)
             else:
-                newLand = self.game.landscapeCards.pop()
-            self.game.mainBoard.set_square(pos, newLand)
-            newLand.player = self
-            self.landscapeCards.append(newLand)
-            newLand.pos = pos
+                newLand = journal.pop(self.game.landscapeCards)
+            journal.set_square(self.game.mainBoard, pos, newLand)
+            journal.set_attr(newLand, 'player', self)
+            journal.append(self.landscapeCards, newLand)
+            journal.set_attr(newLand, 'pos', pos)
+
+    def observe_build(self, card: Type[Town | Village | Path] | Buildable, pos: Pos) -> None:
+        # the builds are observed where they are decided, i.e. before the bank trades paying for them
+        if isinstance(card, Buildable):
+            move = (ActionType.BUILD_FROM_HAND, card.cardId, self.game.mainBoard.to_int(pos))
+        else:
+            move = (INFRA_ACTIONS[card], -1, self.game.mainBoard.to_int(pos))
+        self.game.observe_move(self, move)
 
     def play_card_from_hand(self, card: Playable, pos: Optional[Pos]=None) -> None:
         if isinstance(card, Action):
+            self.game.observe_move(self, (ActionType.ACTION_CARD, card.cardId, -1))
             self.play_action_card(card)
             return
 
         assert isinstance(card, Buildable)
 
         if not self.can_cover_cost(card.cost):
-            print('you cannot afford to play this')
+            self.game.logger.log('cannot_afford_card', card.name)
             return
 
         townOnly: bool = card.townOnly if isinstance(card, Building) else False
 
         if pos is None:
-            pos = self.select_new_card_position(Buildable, townOnly)
+            pos = self.select_new_card_position(Buildable, townOnly, deadline=self.game.get_deadline())
         if pos is None:
             return
 
@@ -195,39 +219,42 @@ class Player(ABC):
         assert isinstance(slot, SettlementSlot), f'cannot place card to {pos}, slot is not valid'
         assert slot.settlement is not None
 
-        card.settlement = slot.settlement
-        card.settlement.cards.remove(slot)
-        card.settlement.cards.append(card)
-        self.game.mainBoard.set_square(pos, card)
-        card.pos, card.player = pos, self
+        journal = self.game.journal
+        journal.set_attr(card, 'settlement', slot.settlement)
+        journal.remove(slot.settlement.cards, slot)
+        journal.append(slot.settlement.cards, card)
+        journal.set_square(self.game.mainBoard, pos, card)
+        journal.set_attr(card, 'pos', pos)
+        journal.set_attr(card, 'player', self)
 
         if isinstance(card, Building):
-            self.buildingsPlayed.append(card)
+            journal.append(self.buildingsPlayed, card)
         elif isinstance(card, Knight):
-            self.knightsPlayed.append(card)
+            journal.append(self.knightsPlayed, card)
         elif isinstance(card, Fleet):
-            self.fleetPlayed.append(card)
+            journal.append(self.fleetPlayed, card)
 
-        self.cardsInHand.remove(card)
+        journal.remove(self.cardsInHand, card)
         self.refresh_hand_board()
         self.pay(card.cost)
 
     def refresh_hand_board(self) -> None:
         display_cards_on_board(self.cardsInHand, self.handBoard)
 
-    def build_infrastructure(self, infraType: Type[Town | Village | Path]) -> None:
+    def build_infrastructure(self, infraType: Type[Town | Village | Path], pos: Optional[Pos]=None) -> None:
         if self.game.infraCardsLeft[infraType] < 1:
-            print(f'no more cards {infraType} left')
+            self.game.logger.log('no_infra_left', infraType.__name__)
             return
         if not self.can_cover_cost(infraType.cost):
-            print(f'you cannot afford this: {infraType}')
+            self.game.logger.log('cannot_afford_infra', infraType.__name__)
             return
 
-        pos: Optional[Pos] = self.select_new_card_position(infraType)
+        if pos is None:
+            pos = self.select_new_card_position(infraType, deadline=self.game.get_deadline())
         if pos is None:
             return
 
-        self.game.infraCardsLeft[infraType] -= 1
+        self.game.journal.set_item(self.game.infraCardsLeft, infraType, self.game.infraCardsLeft[infraType] - 1)
         self.pay(infraType.cost)
 
         if infraType is Village:
@@ -237,8 +264,8 @@ class Player(ABC):
             self.place_town_to_board(pos)
         elif infraType is Path:
             path = Path(pos, self)
-            self.paths.append(path)
-            self.game.mainBoard.set_square(pos, path)
+            self.game.journal.append(self.paths, path)
+            self.game.journal.set_square(self.game.mainBoard, pos, path)
         else:
             assert False, f'build infrastructure got bad infratype: {infraType}'
 
@@ -246,26 +273,29 @@ class Player(ABC):
         settlement = self.game.mainBoard.get_square(pos)
         assert isinstance(settlement, Village), f'cannot place town at {pos}'
 
-        # type checking does not like class swap -> explicitly ignoring
-        settlement.__class__ = Town  # type: ignore
-        settlement.name = 'town'
+        # class swap goes through the journal as well, undo turns the town back to the very same village object
+        journal = self.game.journal
+        journal.set_attr(settlement, '__class__', Town)
+        journal.set_attr(settlement, 'name', 'town')
 
         for p in [pos.up(2), pos.down(2)]:
             slot = SettlementSlot(p, self)
-            self.game.mainBoard.set_square(p, slot)
+            journal.set_square(self.game.mainBoard, p, slot)
             slot.settlement = settlement
-            settlement.cards.append(slot)
+            journal.append(settlement.cards, slot)
 
         self.game.mainBoard.refresh_square(pos)
 
     def place_village_to_board(self, pos: Pos) -> None:
+        # the new village and its slots are fresh objects, only the board and the settlement list need undoing
+        journal = self.game.journal
         newVillage = Village(pos, self)
-        self.game.mainBoard.set_square(pos, newVillage)
-        self.settlements.append(newVillage)
+        journal.set_square(self.game.mainBoard, pos, newVillage)
+        journal.append(self.settlements, newVillage)
 
         for p in [pos.up(), pos.down()]:
             slot = SettlementSlot(p, self)
-            self.game.mainBoard.set_square(p, slot)
+            journal.set_square(self.game.mainBoard, p, slot)
             slot.settlement = newVillage
             newVillage.cards.append(slot)
 
@@ -280,7 +310,7 @@ class Player(ABC):
             self.wait_for_ok()
             return
 
-        card = self.select_card_to_steal_by_spy()
+        card = self.select_card_to_steal_by_spy(deadline=self.game.get_deadline())
         self.opponent.cardsInHand.remove(card)
         self.cardsInHand.append(card)
         self.refresh_hand_board()
@@ -293,7 +323,7 @@ class Player(ABC):
             self.wait_for_ok()
             return
 
-        burntBuilding: Building = winner.select_building_to_burn()
+        burntBuilding: Building = winner.select_building_to_burn(deadline=self.game.get_deadline())
         winner.opponent.take_back_to_hand(burntBuilding)
 
     def play_action_card_black_knight(self) -> None:
@@ -303,19 +333,19 @@ class Player(ABC):
             self.wait_for_ok()
             return
 
-        killedKnight: Knight = winner.select_knight_to_kill()
+        killedKnight: Knight = winner.select_knight_to_kill(deadline=self.game.get_deadline())
         winner.opponent.take_back_to_hand(killedKnight)
 
     def play_action_card_ambush(self) -> None:
         winner = self.action_card_get_toss_winner('ambush')
         for _ in range(2):
-            winner.grab_any_resource_if_possible()
+            winner.grab_any_resource_if_possible(deadline=self.game.get_deadline())
 
     def play_action_card_trader(self) -> None:
         for _ in range(2):
-            self.grab_any_resource_if_possible()
+            self.grab_any_resource_if_possible(deadline=self.game.get_deadline())
 
-        self.give_any_resource()
+        self.give_any_resource(deadline=self.game.get_deadline())
 
     def remove_action_card(self, cardName: str) -> None:
         for card in self.cardsInHand:
@@ -331,7 +361,7 @@ class Player(ABC):
             return
 
         for _ in range(2):
-            self.trade_with_caravan()
+            self.trade_with_caravan(deadline=self.game.get_deadline())
 
     def play_action_card(self, card: Action) -> None:
         # following action cards can be played only at certain specific situation (not here):
@@ -350,7 +380,7 @@ class Player(ABC):
         elif card.name == 'black_knight':
             self.play_action_card_black_knight()
         else:
-            print(f'action card {card.name} cannot be played now')
+            self.game.logger.log('action_card_not_playable', card.name)
             return
 
         self.cardsInHand.remove(card)
@@ -361,80 +391,81 @@ class Player(ABC):
     ####################################################################################################################
 
     def trade(self) -> None:
-        print('trading started')
-        resourceToPay: Optional[Resource] = self.select_resource_to_trade_for()
+        self.game.logger.log('trade_started')
+        resourceToPay: Optional[Resource] = self.select_resource_to_trade_for(deadline=self.game.get_deadline())
         if resourceToPay is None:
             return
 
         rate: int = self.get_resource_cost(resourceToPay)
-        print(f'{resourceToPay.value} can be traded with rate of {rate}')
+        self.game.logger.log('trade_rate', resourceToPay.value, rate)
 
         cost = Cost()
         cost.set(resourceToPay, rate)
         if not self.can_cover_cost(cost):
-            print(f'trade not possible, not enough {resourceToPay.value} available')
+            self.game.logger.log('trade_impossible', resourceToPay.value)
             return
 
         self.pay(cost)
-        land: Landscape = self.select_resource_to_purchase()
-        land.resourcesHeld += 1
-
-        assert land.pos is not None
-        self.game.mainBoard.refresh_square(land.pos)
+        land: Landscape = self.select_resource_to_purchase(deadline=self.game.get_deadline())
+        self.move_resource(None, land)
 
     def take_back_to_hand(self, card: Buildable) -> None:
         assert card.pos is not None and card.settlement is not None and card.player is self
 
+        journal = self.game.journal
         slot = SettlementSlot(card.pos, self)
         slot.settlement = card.settlement
-        slot.settlement.cards.append(slot)
-        slot.settlement.cards.remove(card)
+        journal.append(slot.settlement.cards, slot)
+        journal.remove(slot.settlement.cards, card)
 
-        card.settlement, card.player, card.pos = None, None, None
+        journal.set_attr(card, 'settlement', None)
+        journal.set_attr(card, 'player', None)
+        journal.set_attr(card, 'pos', None)
 
         if isinstance(card, Building):
-            self.buildingsPlayed.remove(card)
+            journal.remove(self.buildingsPlayed, card)
         elif isinstance(card, Knight):
-            self.knightsPlayed.remove(card)
+            journal.remove(self.knightsPlayed, card)
         elif isinstance(card, Fleet):
-            self.fleetPlayed.remove(card)
+            journal.remove(self.fleetPlayed, card)
 
-        self.cardsInHand.append(card)
+        journal.append(self.cardsInHand, card)
         self.refresh_hand_board()
-        self.game.mainBoard.set_square(slot.pos, slot)
+        journal.set_square(self.game.mainBoard, slot.pos, slot)
 
     def action_card_get_toss_winner(self, actionName: str) -> Player:
         assert actionName in DEFENCE_CARDS, f'no defence against {actionName}'
 
         if self.opponent.use_defence(actionName):
             self.opponent.remove_action_card(DEFENCE_CARDS[actionName])
-            print(f'defence against {actionName} activated')
+            self.game.logger.log('defence_activated', actionName)
             actionSuccessFrom6 = 2
         else:
-            print(f'defence against {actionName} NOT activated')
+            self.game.logger.log('defence_not_activated', actionName)
             actionSuccessFrom6 = 5
 
         self.game.display.print_msg('press ok to toss')
         self.wait_for_ok()
 
-        toss = randint(1, 6)
+        toss = self.game.rng.randint(1, 6)
         if toss <= actionSuccessFrom6:
-            print(f'tossed {toss}, action succeeded')
+            self.game.logger.log('toss_succeeded', toss)
             return self
         else:
-            print(f'tossed {toss}, action failed')
+            self.game.logger.log('toss_failed', toss)
             return self.opponent
 
     def lose_ambush_resources(self) -> None:
         for land in self.landscapeCards:
             if land.resource.value in STOLEN_AMBUSH_RESOURCES:
-                land.resourcesHeld = 0
+                self.game.journal.set_attr(land, 'resourcesHeld', 0)
                 assert land.pos is not None
                 self.game.mainBoard.refresh_square(land.pos)
 
     def use_defence(self, action: str) -> bool:
         assert action in DEFENCE_CARDS, f'there is no defence against {action}'
-        return self.card_in_hand(DEFENCE_CARDS[action]) and self.decide_use_defence(action)
+        return self.card_in_hand(DEFENCE_CARDS[action]) \
+            and self.decide_use_defence(action, deadline=self.game.get_deadline())
 
     def pay(self, cost: Cost | int) -> None:
         self.game.display.print_msg('now you need to pay')
@@ -443,21 +474,29 @@ class Player(ABC):
         else:
             self.pay_any(cost)
 
+    def move_resource(self, landFrom: Optional[Landscape], landTo: Optional[Landscape]) -> None:
+        # one resource from landFrom to landTo (None - the bank), recorded in the journal
+        for land, delta in [(landFrom, -1), (landTo, 1)]:
+            if land is not None:
+                assert land.pos is not None
+                self.game.journal.set_attr(land, 'resourcesHeld', land.resourcesHeld + delta)
+                self.game.mainBoard.refresh_square(land.pos)
+
     def pay_specific(self, cost: Cost) -> None:
         costToPay = copy.copy(cost)
         while not costToPay.is_zero():
-            land: Landscape = self.select_card_to_pay(costToPay)
+            land: Landscape = self.select_card_to_pay(costToPay, deadline=self.game.get_deadline())
             assert land.pos is not None
             costToPay.take(land.resource)
-            land.resourcesHeld -= 1
+            self.game.journal.set_attr(land, 'resourcesHeld', land.resourcesHeld - 1)
             self.game.mainBoard.refresh_square(land.pos)
 
     def pay_any(self, cost: int) -> None:
         while cost > 0:
-            land: Landscape = self.select_card_to_pay()
+            land: Landscape = self.select_card_to_pay(deadline=self.game.get_deadline())
             assert land.pos is not None
             cost -= 1
-            land.resourcesHeld -= 1
+            self.game.journal.set_attr(land, 'resourcesHeld', land.resourcesHeld - 1)
             self.game.mainBoard.refresh_square(land.pos)
 
     ####################################################################################################################
@@ -466,9 +505,9 @@ class Player(ABC):
 
     def refill_hand_take_card(self, pile: Pile) -> None:
         payToBrowse = 1 if self.has_browse_discount() else 2
-        if self.can_cover_cost(payToBrowse) and self.decide_browse_pile():
+        if self.can_cover_cost(payToBrowse) and self.decide_browse_pile(deadline=self.game.get_deadline()):
             self.pay(payToBrowse)
-            card = self.select_card_from_choice(pile)
+            card = self.select_card_from_choice(pile, deadline=self.game.get_deadline())
         else:
             card = pile[0]
 
@@ -477,7 +516,7 @@ class Player(ABC):
         self.refresh_hand_board()
 
     def refill_hand_remove_card(self, pile: Pile) -> None:
-        card = self.select_card_to_throw_away()
+        card = self.select_card_to_throw_away(deadline=self.game.get_deadline())
         self.cardsInHand.remove(card)
         pile.append(card)
         self.refresh_hand_board()
@@ -486,52 +525,65 @@ class Player(ABC):
         maxCardsInHand = self.get_hand_cards_cnt()
         if len(self.cardsInHand) < maxCardsInHand:
             while len(self.cardsInHand) < maxCardsInHand:
-                pile = self.select_pile()
+                pile = self.select_pile(deadline=self.game.get_deadline())
                 self.refill_hand_take_card(pile)
         else:
             if len(self.cardsInHand) > maxCardsInHand:
                 while len(self.cardsInHand) > maxCardsInHand:
-                    pile = self.select_pile()
+                    pile = self.select_pile(deadline=self.game.get_deadline())
                     self.refill_hand_remove_card(pile)
-            if self.decide_swap_one_card():
-                pile = self.select_pile()
+            if self.decide_swap_one_card(deadline=self.game.get_deadline()):
+                pile = self.select_pile(deadline=self.game.get_deadline())
                 self.refill_hand_remove_card(pile)
                 self.refill_hand_take_card(pile)
 
+    def observe_card_event(self, eventName: str) -> None:
+        # every drawn event card is shown to both players, players keeping track of the event deck override this
+        pass
+
+    def close(self) -> None:
+        # called by Game.play when the game is over, releases what the player keeps for the whole game (e.g. worker
+        # processes), the player can still be used afterwards
+        pass
+
     ####################################################################################################################
     #################   ALL DECISIONS ARE MADE IN ABSTRACT METHODS      ################################################
     ####################################################################################################################
+    # deadline - time.perf_counter() value the decision has to be made by, None means no limit
+    # players searching for their decisions return the best one found so far when it comes, the others ignore it
+    # wait_for_ok is no decision, it only lets a human read the screen
 
     @abstractmethod
     def wait_for_ok(self) -> None:
         pass
 
     @abstractmethod
-    def select_card_from_choice(self, pile: Pile) -> Playable:
+    def select_card_from_choice(self, pile: Pile, deadline: Optional[float]=None) -> Playable:
         pass
 
     @abstractmethod
-    def select_pile(self, unavailablePile: Optional[Pile]=None) -> Pile:
+    def select_pile(self, unavailablePile: Optional[Pile]=None, deadline: Optional[float]=None) -> Pile:
         pass
 
     @abstractmethod
-    def decide_swap_one_card(self) -> bool:
+    def decide_swap_one_card(self, deadline: Optional[float]=None) -> bool:
         pass
 
     @abstractmethod
-    def select_new_card_position(self, infraType: Type[Village | Path | Town | Buildable], townOnly=False) -> Optional[Pos]:
+    def select_new_card_position(self, infraType: Type[Village | Path | Town | Buildable], townOnly=False,
+                                 deadline: Optional[float]=None) -> Optional[Pos]:
         pass
 
     @abstractmethod
-    def select_card_to_pay(self, resource: Optional[Cost]=None) -> Landscape:
+    def select_card_to_pay(self, resource: Optional[Cost]=None, deadline: Optional[float]=None) -> Landscape:
         pass
 
     @abstractmethod
-    def initial_land_setup(self) -> None:
+    def initial_land_setup(self, deadline: Optional[float]=None) -> None:
         pass
 
     @abstractmethod
-    def pick_starting_cards(self) -> None:
+    def pick_starting_cards(self, deadline: Optional[float]=None) -> None:
         pass
 
     @abstractmethod
@@ -539,69 +591,69 @@ class Player(ABC):
         pass
 
     @abstractmethod
-    def do_actions(self) -> None:
+    def do_actions(self, deadline: Optional[float]=None) -> None:
         pass
 
     @abstractmethod
-    def pick_any_resource(self) -> None:
+    def pick_any_resource(self, deadline: Optional[float]=None) -> None:
         pass
 
     @abstractmethod
-    def grab_any_resource_if_possible(self) -> None:
+    def grab_any_resource_if_possible(self, deadline: Optional[float]=None) -> None:
         pass
 
     @abstractmethod
-    def decide_browse_pile(self) -> bool:
+    def decide_browse_pile(self, deadline: Optional[float]=None) -> bool:
         pass
 
     @abstractmethod
-    def select_card_to_throw_away(self) -> Playable:
+    def select_card_to_throw_away(self, deadline: Optional[float]=None) -> Playable:
         pass
 
     @abstractmethod
-    def select_opponents_unit_to_remove(self) -> Buildable:
+    def select_opponents_unit_to_remove(self, deadline: Optional[float]=None) -> Buildable:
         pass
 
     @abstractmethod
-    def select_card_to_steal_by_spy(self) -> Knight | Fleet | Action:
+    def select_card_to_steal_by_spy(self, deadline: Optional[float]=None) -> Knight | Fleet | Action:
         pass
 
     @abstractmethod
-    def decide_use_defence(self, againstCard: str) -> bool:
+    def decide_use_defence(self, againstCard: str, deadline: Optional[float]=None) -> bool:
         pass
 
     @abstractmethod
-    def select_building_to_burn(self) -> Building:
+    def select_building_to_burn(self, deadline: Optional[float]=None) -> Building:
         pass
 
     @abstractmethod
-    def select_knight_to_kill(self) -> Knight:
+    def select_knight_to_kill(self, deadline: Optional[float]=None) -> Knight:
         pass
 
     @abstractmethod
-    def select_opponents_card_to_discard(self) -> Playable:
+    def select_opponents_card_to_discard(self, deadline: Optional[float]=None) -> Playable:
         pass
 
     @abstractmethod
-    def give_any_resource(self) -> None:
+    def give_any_resource(self, deadline: Optional[float]=None) -> None:
         pass
 
     @abstractmethod
-    def trade_with_caravan(self) -> None:
+    def trade_with_caravan(self, deadline: Optional[float]=None) -> None:
         pass
 
     @abstractmethod
-    def select_resource_to_trade_for(self) -> Optional[Resource]:
+    def select_resource_to_trade_for(self, deadline: Optional[float]=None) -> Optional[Resource]:
         pass
 
     @abstractmethod
-    def select_resource_to_purchase(self) -> Landscape:
+    def select_resource_to_purchase(self, deadline: Optional[float]=None) -> Landscape:
         pass
 
     @abstractmethod
-    def decide_use_scout(self) -> bool:
+    def decide_use_scout(self, deadline: Optional[float]=None) -> bool:
         pass
 
     @abstractmethod
-    def select_new_land(self) -> Landscape:
+    def select_new_land(self, deadline: Optional[float]=None) -> Landscape:
         pass
\ No newline at end of file
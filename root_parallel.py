@@ -0,0 +1,70 @@
+from __future__ import annotations
+from concurrent.futures import Executor
+from time import perf_counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from evaluation import Evaluator, evaluate_states
+from game_state import GameState
+from ismcts import IsmctsSearch
+from mcts import MctsSearch, SearchStats, DEFAULT_ITERATIONS
+from move_generator import Move, END_TURN_MOVE
+from util import create_rng
+
+# visits and reward of every root move
+RootStats = Dict[Move, Tuple[int, float]]
+
+
+def search_worker(state: GameState, turnMoves: int, seenEvents: Sequence[int], iterations: Optional[int],
+                  timeLimit: Optional[float], seed: int, worker: int, perfectInformation: bool,
+                  determinizations: int, evaluator: Evaluator=evaluate_states) -> Tuple[RootStats, SearchStats]:
+    # one independent tree from the root, runs in a worker process, the evaluator is pickled to it
+    rng, _ = create_rng(seed, worker)
+    search: MctsSearch
+    if perfectInformation:
+        search = MctsSearch(rng, evaluator=evaluator)
+        search.set_root(state, turnMoves)
+    else:
+        search = IsmctsSearch(rng, determinizations, evaluator=evaluator)
+        search.set_root(state, turnMoves, seenEvents=seenEvents)
+    stats = search.run(iterations, timeLimit)
+    return search.get_root_stats(), stats
+
+def merge_root_stats(results: List[RootStats]) -> RootStats:
+    merged: RootStats = {}
+    for rootStats in results:
+        for move, (visits, reward) in rootStats.items():
+            mergedVisits, mergedReward = merged.get(move, (0, 0.0))
+            merged[move] = (mergedVisits + visits, mergedReward + reward)
+    return merged
+
+def get_best_move(rootStats: RootStats) -> Move:
+    # the most visited move over all trees
+    if not rootStats:
+        return END_TURN_MOVE
+    return max(rootStats.items(), key=lambda item: item[1][0])[0]
+
+
+def search_root_parallel(executor: Executor, workers: int, state: GameState, turnMoves: int,
+                         seenEvents: Sequence[int], iterations: Optional[int], timeLimit: Optional[float], seed: int,
+                         perfectInformation: bool=False, determinizations: int=8,
+                         deadline: Optional[float]=None, margin: float=0.0,
+                         evaluator: Evaluator=evaluate_states) -> Tuple[Move, SearchStats]:
+    # root parallelization: every worker searches its own tree with its own stream of the seed, the root statistics
+    # of the trees are summed, the iteration budget is split among the workers, the time limit applies to each one
+    # the deadline is passed to the workers as what is left of it less the margin, the margin should cover the process
+    # overhead (the stats of the previous searches tell it) so that the result comes by the deadline
+    if iterations is None and timeLimit is None:
+        iterations = DEFAULT_ITERATIONS
+    workerIterations = -(-iterations // workers) if iterations is not None else None
+    start = perf_counter()
+    if deadline is not None:
+        left = deadline - start - margin
+        timeLimit = max(0.0, left) if timeLimit is None else max(0.0, min(timeLimit, left))
+    futures = [executor.submit(search_worker, state, turnMoves, list(seenEvents), workerIterations, timeLimit, seed,
+                               worker, perfectInformation, determinizations, evaluator) for worker in range(workers)]
+    results = [future.result() for future in futures]
+    rootStats = merge_root_stats([rootStats for rootStats, _ in results])
+    elapsed = perf_counter() - start
+    stats = SearchStats(sum(workerStats.iterations for _, workerStats in results), elapsed,
+                        elapsed - max(workerStats.elapsed for _, workerStats in results))
+    return get_best_move(rootStats), stats
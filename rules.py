@@ -0,0 +1,371 @@
+from random import Random
+from typing import Dict, List, Optional, Tuple
+
+import config
+from commands import create_command, pay_cost
+from config import MAX_LAND_RESOURCES
+from enums import ActionType, DiceEvent
+from game_state import GameState, PLAYABLE_CARDS, LAND_CARDS, EVENT_NAMES, BOARD_WIDTH, EMPTY, SLOT, PATH, VILLAGE, \
+    TOWN, PLAYABLE_BASE, VILLAGE_IDX, PATH_IDX, TOWN_IDX
+from move_generator import Move, RESOURCES, LAND_RESOURCE_IDX, END_TURN_MOVE, INFRA_COSTS, PLAYABLE_COSTS, \
+    generate_build_moves, get_resource_vector, get_trade_rates
+from card import Knight, Fleet
+from util import DiceEvents
+
+# the rules of Game played on a GameState, search simulates whole turns with these
+# decisions the rules ask for (which resource to pick, which card to throw away, ...) are made by simple fixed
+# policies close to the ones of ComputerPlayer
+
+PLAYABLE_NAMES: List[str] = [card.name for card in PLAYABLE_CARDS]
+IS_UNIT: List[bool] = [isinstance(card, (Knight, Fleet)) for card in PLAYABLE_CARDS]
+LAND_DICE: List[int] = [dice for _, _, dice, _ in LAND_CARDS]
+AMBUSH_RESOURCE_IDX: List[int] = [idx for idx, resource in enumerate(RESOURCES)
+                                  if resource.value in config.STOLEN_AMBUSH_RESOURCES]
+# what the rollout policy builds first when it can afford more things
+INFRA_IDX = {ActionType.BUILD_VILLAGE: VILLAGE_IDX, ActionType.BUILD_PATH: PATH_IDX, ActionType.BUILD_TOWN: TOWN_IDX}
+BUILD_ORDER = {ActionType.BUILD_TOWN: 0, ActionType.BUILD_VILLAGE: 1, ActionType.BUILD_FROM_HAND: 2,
+               ActionType.BUILD_PATH: 3}
+
+
+####################################################################################################################
+#################   QUERIES           ##############################################################################
+####################################################################################################################
+
+def count_land_neighbors(state: GameState, land: int, name: str) -> int:
+    return sum(1 for card in state.get_land_neighbors(land) if PLAYABLE_NAMES[card] == name)
+
+def get_settlement_cards(state: GameState, player: int, x: int) -> List[int]:
+    midRow = state.midRows[player]
+    cards = []
+    for dy in (-1, 1, -2, 2):
+        code = state.board[midRow + dy][x]
+        if code >= PLAYABLE_BASE:
+            cards.append(code - PLAYABLE_BASE)
+    return cards
+
+def is_land_protected_from_plaque(state: GameState, land: int) -> bool:
+    # a church in a neighboring settlement protects the land
+    player = state.landOwner[land]
+    x = state.landPos[land] % BOARD_WIDTH
+    row = state.board[state.midRows[player]]
+    for sx in (x - 1, x + 1):
+        if 0 < sx < BOARD_WIDTH - 1 and row[sx] in (VILLAGE, TOWN):
+            if any(PLAYABLE_NAMES[card] == 'church' for card in get_settlement_cards(state, player, sx)):
+                return True
+    return False
+
+def get_played_names(state: GameState, player: int) -> List[str]:
+    return [card.name for card in state.get_played_cards(player)]
+
+def get_hand_limit(state: GameState, player: int) -> int:
+    names = get_played_names(state, player)
+    return config.STARTING_HAND_CARD_CNT + sum(1 for name in names if name in config.CARDS_INCREASING_HAND_CNT)
+
+def get_largest_pile(state: GameState, unavailablePile: int=-1) -> int:
+    # the same choice as ComputerPlayer.select_pile
+    resIdx, maxLen = 0, 0
+    for idx, pile in enumerate(state.piles):
+        if len(pile) > maxLen and idx != unavailablePile:
+            maxLen, resIdx = len(pile), idx
+    return resIdx
+
+def has_village_site(state: GameState, player: int) -> bool:
+    row = state.board[state.midRows[player]]
+    for x in range(1, BOARD_WIDTH - 1):
+        if row[x] == EMPTY and (row[x - 1] == PATH or row[x + 1] == PATH):
+            return True
+    return False
+
+def get_winner(state: GameState) -> Optional[int]:
+    points0, points1 = state.get_victory_points(0), state.get_victory_points(1)
+    if max(points0, points1) < config.VICTORY_POINTS or points0 == points1:
+        return None
+    return 0 if points0 > points1 else 1
+
+
+####################################################################################################################
+#################   RESOURCES         ##############################################################################
+####################################################################################################################
+
+def land_yield(state: GameState, number: int) -> None:
+    for land, owner in enumerate(state.landOwner):
+        if owner >= 0 and LAND_DICE[land] == number and state.landHeld[land] < MAX_LAND_RESOURCES:
+            state.set_land_held(land, min(state.landHeld[land] + state.get_land_yield(land), MAX_LAND_RESOURCES))
+
+def pick_any_resource(state: GameState, player: int) -> None:
+    # one resource to the emptiest land
+    lands = [land for land in state.get_lands(player) if state.landHeld[land] < MAX_LAND_RESOURCES]
+    if lands:
+        land = min(lands, key=lambda l: state.landHeld[l])
+        state.set_land_held(land, state.landHeld[land] + 1)
+
+def grab_any_resource(state: GameState, player: int) -> None:
+    # one resource from the opponent to a land of the same kind, as ComputerPlayer.grab_any_resource_if_possible
+    ownLands = list(state.get_lands(player))
+    for opponentLand in state.get_lands(1 - player):
+        if state.landHeld[opponentLand] > 0:
+            for land in ownLands:
+                if LAND_RESOURCE_IDX[land] == LAND_RESOURCE_IDX[opponentLand] \
+                        and state.landHeld[land] < MAX_LAND_RESOURCES:
+                    state.set_land_held(opponentLand, state.landHeld[opponentLand] - 1)
+                    state.set_land_held(land, state.landHeld[land] + 1)
+                    return
+
+def plan_trades(state: GameState, player: int, cost: Tuple[int, ...]) -> Optional[List[Tuple[int, int]]]:
+    # bank trades (paid resource, bought resource) making the cost affordable, None if there are not enough resources
+    # the same plan as ComputerPlayer._plan_trades
+    resources = get_resource_vector(state, player)
+    surplus = [held - needed for held, needed in zip(resources, cost)]
+    if min(surplus) >= 0:
+        return []
+    rates = get_trade_rates(state, player)
+    space = [0] * len(RESOURCES)
+    for land in state.get_lands(player):
+        space[LAND_RESOURCE_IDX[land]] += MAX_LAND_RESOURCES - state.landHeld[land]
+
+    tradePlan: List[Tuple[int, int]] = []
+    for missing in range(len(RESOURCES)):
+        while surplus[missing] < 0:
+            if space[missing] < 1:
+                return None
+            paid = [idx for idx in range(len(RESOURCES)) if idx != missing and surplus[idx] >= rates[idx]]
+            if not paid:
+                return None
+            # cheapest trade first, among those the resource we have most of
+            toPay = min(paid, key=lambda idx: (rates[idx], -surplus[idx]))
+            surplus[toPay] -= rates[toPay]
+            surplus[missing] += 1
+            space[missing] -= 1
+            space[toPay] += rates[toPay]
+            tradePlan.append((toPay, missing))
+    return tradePlan
+
+def apply_trades(state: GameState, player: int, tradePlan: List[Tuple[int, int]]) -> None:
+    rates = get_trade_rates(state, player)
+    for toPay, toBuy in tradePlan:
+        cost = [0] * len(RESOURCES)
+        cost[toPay] = rates[toPay]
+        pay_cost(state, player, tuple(cost))
+        # the first land with free space, as ComputerPlayer.select_resource_to_purchase
+        land = next(land for land in state.get_lands(player)
+                    if LAND_RESOURCE_IDX[land] == toBuy and state.landHeld[land] < MAX_LAND_RESOURCES)
+        state.set_land_held(land, state.landHeld[land] + 1)
+
+
+####################################################################################################################
+#################   EVENTS            ##############################################################################
+####################################################################################################################
+
+def discard_from_hand(state: GameState, player: int, pile: int) -> None:
+    state.put_to_pile(pile, state.hands[player][0])
+    state.remove_from_hand(player, state.hands[player][0])
+
+def event_tournament(state: GameState) -> None:
+    strength0, strength1 = state.get_tournament_strength(0), state.get_tournament_strength(1)
+    if strength0 != strength1:
+        pick_any_resource(state, 0 if strength0 > strength1 else 1)
+
+def event_trade_profit(state: GameState) -> None:
+    strength0, strength1 = state.get_trade_strength(0), state.get_trade_strength(1)
+    if strength0 != strength1:
+        grab_any_resource(state, 0 if strength0 > strength1 else 1)
+
+def event_ambush(state: GameState) -> None:
+    for player in (0, 1):
+        lands = list(state.get_lands(player))
+        unprotected = sum(state.landHeld[land] for land in lands if not count_land_neighbors(state, land, 'warehouse'))
+        if unprotected > config.AMBUSH_MAX_RESOURCES:
+            for land in lands:
+                if LAND_RESOURCE_IDX[land] in AMBUSH_RESOURCE_IDX:
+                    state.set_land_held(land, 0)
+
+def event_good_harvest(state: GameState) -> None:
+    pick_any_resource(state, 0)
+    pick_any_resource(state, 1)
+
+def card_event_builder(state: GameState) -> None:
+    pile = -1
+    for player in (state.current, 1 - state.current):
+        pile = get_largest_pile(state, pile)
+        if not state.piles[pile]:
+            continue
+        state.add_to_hand(player, state.take_from_pile(pile))
+        discard_from_hand(state, player, pile)
+
+def card_event_civil_war(state: GameState) -> None:
+    for player in (state.current, 1 - state.current):
+        opponent = 1 - player
+        midRow = state.midRows[opponent]
+        for x, code in enumerate(state.board[midRow]):
+            if code != VILLAGE and code != TOWN:
+                continue
+            cards = get_settlement_cards(state, opponent, x)
+            if any(PLAYABLE_NAMES[card] in config.CIVIL_WAR_PROTECTION for card in cards):
+                continue
+            unit = next((card for card in cards if IS_UNIT[card]), None)
+            if unit is not None:
+                take_back_to_hand(state, opponent, unit)
+                if len(state.hands[opponent]) > get_hand_limit(state, opponent):
+                    discard_from_hand(state, opponent, get_largest_pile(state))
+                break
+
+def take_back_to_hand(state: GameState, player: int, card: int) -> None:
+    code = PLAYABLE_BASE + card
+    midRow = state.midRows[player]
+    for y in (midRow - 2, midRow - 1, midRow + 1, midRow + 2):
+        x = state.board[y].find(code)
+        if x >= 0:
+            state.set_square(x, y, SLOT)
+            state.add_to_hand(player, card)
+            return
+    assert False, f'card {PLAYABLE_NAMES[card]} is not on the board'
+
+def card_event_rich_year(state: GameState) -> None:
+    for land, owner in enumerate(state.landOwner):
+        if owner >= 0:
+            warehouses = count_land_neighbors(state, land, 'warehouse')
+            if warehouses:
+                state.set_land_held(land, min(state.landHeld[land] + warehouses, MAX_LAND_RESOURCES))
+
+def card_event_advance(state: GameState) -> None:
+    for player in (state.current, 1 - state.current):
+        names = get_played_names(state, player)
+        for _ in range(sum(1 for name in names if name in config.ADVANCE_BUILDINGS)):
+            pick_any_resource(state, player)
+
+def card_event_conflict(state: GameState) -> None:
+    strength0, strength1 = state.get_battle_strength(0), state.get_battle_strength(1)
+    if strength0 == strength1:
+        return
+    loser = 1 if strength0 > strength1 else 0
+    pile = get_largest_pile(state)
+    for _ in range(min(2, len(state.hands[loser]))):
+        discard_from_hand(state, loser, pile)
+
+def card_event_plaque(state: GameState) -> None:
+    for player in (state.current, 1 - state.current):
+        if 'aquaduct' in get_played_names(state, player):
+            continue
+        for land in list(state.get_lands(player)):
+            if state.landHeld[land] > 0 and not is_land_protected_from_plaque(state, land):
+                state.set_land_held(land, state.landHeld[land] - 1)
+
+def card_event(state: GameState, rng: Random) -> None:
+    name = EVENT_NAMES[state.draw_event()]
+    if name == 'builder':
+        card_event_builder(state)
+    elif name == 'civil_war':
+        card_event_civil_war(state)
+    elif name == 'rich_year':
+        card_event_rich_year(state)
+    elif name == 'advance':
+        card_event_advance(state)
+    elif name == 'new_year':
+        state.shuffle_events(rng)
+    elif name == 'conflict':
+        card_event_conflict(state)
+    elif name == 'plaque':
+        card_event_plaque(state)
+    else:
+        assert False, f'unknown card event: {name}'
+
+def handle_dice_event(state: GameState, event: DiceEvent, rng: Random) -> None:
+    if event == DiceEvent.TOURNAMENT:
+        event_tournament(state)
+    elif event == DiceEvent.TRADE_PROFIT:
+        event_trade_profit(state)
+    elif event == DiceEvent.AMBUSH:
+        event_ambush(state)
+    elif event == DiceEvent.GOOD_HARVEST:
+        event_good_harvest(state)
+    elif event == DiceEvent.CARD_EVENT:
+        card_event(state, rng)
+    else:
+        raise ValueError(f'unknown dice event: {event}')
+
+
+####################################################################################################################
+#################   TURN              ##############################################################################
+####################################################################################################################
+
+def apply_dice(state: GameState, eventRoll: int, yieldRoll: int, rng: Random) -> None:
+    # the event die goes first, then the yield, as in ComputerPlayer.throw_dice
+    # rng is needed only when the event cards get shuffled
+    handle_dice_event(state, DiceEvents[eventRoll], rng)
+    land_yield(state, yieldRoll)
+
+def throw_dice(state: GameState, rng: Random) -> None:
+    apply_dice(state, rng.randint(1, 6), rng.randint(1, 6), rng)
+
+def refill_hand(state: GameState, player: int) -> None:
+    # takes the top cards of the largest piles, never browses nor swaps
+    limit = get_hand_limit(state, player)
+    while len(state.hands[player]) < limit:
+        pile = get_largest_pile(state)
+        if not state.piles[pile]:
+            return
+        state.add_to_hand(player, state.take_from_pile(pile))
+    while len(state.hands[player]) > limit:
+        discard_from_hand(state, player, get_largest_pile(state))
+
+def get_move_cost(move: Move) -> Tuple[int, ...]:
+    if move[0] == ActionType.BUILD_FROM_HAND:
+        cost = PLAYABLE_COSTS[move[1]]
+        assert cost is not None
+        return cost
+    return INFRA_COSTS[INFRA_IDX[move[0]]]
+
+def generate_turn_moves(state: GameState) -> List[Move]:
+    # builds of the current player affordable with bank trades, END_TURN is the last one
+    # a build applied by apply_turn_move does the trades it needs first, as ComputerPlayer.trade_to_cover_cost
+    player = state.current
+    plans: Dict[Tuple[int, ...], bool] = {}
+
+    def is_affordable(cost: Tuple[int, ...]) -> bool:
+        if cost not in plans:
+            plans[cost] = plan_trades(state, player, cost) is not None
+        return plans[cost]
+
+    moves = generate_build_moves(state, player, is_affordable)
+    moves.append(END_TURN_MOVE)
+    return moves
+
+def apply_turn_move(state: GameState, move: Move) -> None:
+    if move[0] == ActionType.END_TURN:
+        finish_turn(state)
+        return
+    tradePlan = plan_trades(state, state.current, get_move_cost(move))
+    assert tradePlan is not None, f'cannot afford {move}'
+    apply_trades(state, state.current, tradePlan)
+    create_command(move).apply(state)
+
+def choose_rollout_move(state: GameState, rng: Random) -> Move:
+    # builds whatever is affordable (with bank trades) in BUILD_ORDER, a path only when there is no free place for
+    # a village, the choice among moves of the same kind is random, action cards are never used
+    best: List[Move] = []
+    bestOrder = len(BUILD_ORDER)
+    for move in generate_turn_moves(state):
+        order = BUILD_ORDER.get(move[0], len(BUILD_ORDER))
+        if order < bestOrder:
+            if move[0] == ActionType.BUILD_PATH and has_village_site(state, state.current):
+                continue
+            best, bestOrder = [move], order
+        elif order == bestOrder and best:
+            best.append(move)
+    return rng.choice(best) if best else END_TURN_MOVE
+
+def play_actions(state: GameState, rng: Random, maxMoves: int=8) -> None:
+    for _ in range(maxMoves):
+        move = choose_rollout_move(state, rng)
+        if move is END_TURN_MOVE:
+            return
+        apply_turn_move(state, move)
+
+def finish_turn(state: GameState) -> None:
+    refill_hand(state, state.current)
+    state.end_turn()
+
+def play_turn(state: GameState, rng: Random) -> None:
+    throw_dice(state, rng)
+    play_actions(state, rng)
+    finish_turn(state)
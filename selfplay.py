@@ -0,0 +1,115 @@
+from __future__ import annotations
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterator, Optional, Tuple
+
+from computer_player import ComputerPlayer
+from event_logger import EventLogger, BufferedFileLogger, NullLogger
+from game import Game
+from util import create_rng
+
+if TYPE_CHECKING:
+    from dataset import GameRecord
+
+DEFAULT_MAX_ROUNDS = 500
+
+
+@dataclass(frozen=True)
+class GameResult:
+    gameNo: int
+    seed: int
+    winner: Optional[int]
+    roundNo: int
+    victoryPoints: Tuple[int, int]
+    # decision points of the game when recorded, see dataset.py
+    record: Optional[GameRecord] = field(default=None, compare=False, repr=False)
+
+    def __str__(self) -> str:
+        winner = f'player{self.winner}' if self.winner is not None else 'nobody'
+        return f'game {self.gameNo}: winner {winner}, rounds {self.roundNo}, ' \
+               f'points {self.victoryPoints[0]}:{self.victoryPoints[1]}'
+
+
+def play_game(gameNo: int, seed: int, maxRounds: Optional[int]=DEFAULT_MAX_ROUNDS,
+              logDir: Optional[str]=None, record: bool=False) -> GameResult:
+    logger: EventLogger = NullLogger() if logDir is None else \
+        BufferedFileLogger(os.path.join(logDir, f'game_{seed}_{gameNo}.log'))
+    # numpy is needed only for recording
+    recorder = None
+    if record:
+        from dataset import GameRecorder
+        recorder = GameRecorder(gameNo)
+
+    # every game plays its own substream of the common seed -> any single game can be replayed from its result
+    game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=seed, stream=gameNo, logger=logger)
+    try:
+        winner = game.play(maxRounds, onMove=recorder.on_move if recorder is not None else None)
+    finally:
+        logger.close()
+
+    return GameResult(
+        gameNo=gameNo,
+        seed=seed,
+        winner=winner.number if winner is not None else None,
+        roundNo=game.roundNo,
+        victoryPoints=(game.player1.get_victory_points(), game.player2.get_victory_points()),
+        record=recorder.finish(game.get_player_idx(winner) if winner is not None else None)
+        if recorder is not None else None
+    )
+
+
+def run_games(gamesCnt: int, workers: Optional[int]=None, seed: Optional[int]=None,
+              maxRounds: Optional[int]=DEFAULT_MAX_ROUNDS, logDir: Optional[str]=None,
+              record: bool=False) -> Iterator[GameResult]:
+    # results are yielded as soon as the workers finish them, i.e. not in the order of game numbers
+    _, seed = create_rng(seed)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(play_game, gameNo, seed, maxRounds, logDir, record) for gameNo in range(gamesCnt)]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='play computer vs computer games without display')
+    parser.add_argument('-n', '--games', type=int, default=100, help='number of games to play')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='worker processes (default: cpu count)')
+    parser.add_argument('-s', '--seed', type=int, default=None, help='seed of the whole run (default: random)')
+    parser.add_argument('--max-rounds', type=int, default=DEFAULT_MAX_ROUNDS,
+                        help='games not decided after this many rounds have no winner')
+    parser.add_argument('--log-dir', default=None, help='write the event log of every game to this directory')
+    parser.add_argument('--dataset', default=None,
+                        help='write the decision points of all games to .npy files in this directory')
+    args = parser.parse_args()
+    if args.log_dir is not None:
+        os.makedirs(args.log_dir, exist_ok=True)
+    # numpy is needed only for the dataset, the writer is closed (the headers get the row counts) on any exit
+    with ExitStack() as stack:
+        writer = None
+        if args.dataset is not None:
+            from dataset import DatasetWriter
+            writer = stack.enter_context(DatasetWriter(args.dataset))
+
+        _, seed = create_rng(args.seed)
+        print(f'playing {args.games} games, seed {seed}', flush=True)
+
+        wins = {1: 0, 2: 0, None: 0}
+        rounds = 0
+        start = time.perf_counter()
+        for result in run_games(args.games, args.workers, seed, args.max_rounds, args.log_dir, writer is not None):
+            print(result, flush=True)
+            wins[result.winner] += 1
+            rounds += result.roundNo
+            if writer is not None and result.record is not None:
+                writer.write(result.record)
+
+    elapsed = time.perf_counter() - start
+    print(f'player1 won {wins[1]}, player2 won {wins[2]}, undecided {wins[None]}, '
+          f'average rounds {rounds / max(args.games, 1):.1f}, {args.games / elapsed:.1f} games/s')
+
+
+if __name__ == '__main__':
+    main()
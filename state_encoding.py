@@ -0,0 +1,104 @@
+from __future__ import annotations
+from array import array
+from typing import List
+
+import config
+from enums import Resource
+from game_state import GameState, LAND_CARDS, BOARD_WIDTH, BOARD_HEIGHT, OWN_ALL, get_row_owners
+
+# layout of an encoded position (all values are single bytes unless stated otherwise):
+#   header     version, midRow of both players, current player, roundNo (2 bytes little endian), 3 infra counters
+#   lands      23 slots of (resource, dice, held, owner + 1, board index or 255)
+#   board      13x11 square codes, row by row
+#   lists      land deck, 2 hands, 5 piles, event deck - each as its length followed by the ids
+ENCODING_VERSION = 1
+HEADER_SIZE = 9
+LAND_SLOT_SIZE = 5
+LANDS_SIZE = LAND_SLOT_SIZE * len(LAND_CARDS)
+BOARD_SIZE = BOARD_WIDTH * BOARD_HEIGHT
+NO_POS = 255
+# land deck, both hands, all piles and events
+LISTS_CNT = 1 + 2 + config.PILE_COUNT + 1
+
+RESOURCE_CODES = {resource: idx for idx, resource in enumerate(Resource)}
+# resource and dice of a land never change, this part of the slots is prepared just once
+LAND_SLOTS_TEMPLATE = bytes(value for _, resource, dice, _ in LAND_CARDS
+                            for value in (RESOURCE_CODES[resource], dice, 0, 0, NO_POS))
+
+
+def encode_state(state: GameState) -> bytes:
+    out = bytearray(HEADER_SIZE)
+    out[0] = ENCODING_VERSION
+    out[1], out[2] = state.midRows
+    out[3] = state.current
+    out[4], out[5] = state.roundNo & 0xff, state.roundNo >> 8
+    out[6:9] = bytes(state.infraLeft)
+
+    lands = bytearray(LAND_SLOTS_TEMPLATE)
+    lands[2::LAND_SLOT_SIZE] = bytes(state.landHeld)
+    lands[3::LAND_SLOT_SIZE] = bytes(owner + 1 for owner in state.landOwner)
+    lands[4::LAND_SLOT_SIZE] = bytes(pos if pos >= 0 else NO_POS for pos in state.landPos)
+    out += lands
+
+    for row in state.board:
+        out += row
+
+    for lst in [state.landDeck, *state.hands, *state.piles, state.events]:
+        out.append(len(lst))
+        out += bytes(lst)
+    return bytes(out)
+
+
+def decode_state(data: bytes) -> GameState:
+    assert data[0] == ENCODING_VERSION, f'unknown encoding version {data[0]}'
+    state = GameState.__new__(GameState)
+    state.midRows = (data[1], data[2])
+    state.rowOwners = get_row_owners(state.midRows)
+    state.current = data[3]
+    state.roundNo = data[4] | data[5] << 8
+    state.infraLeft = list(data[6:9])
+
+    offset = HEADER_SIZE
+    state.landHeld = list(data[offset + 2:offset + LANDS_SIZE:LAND_SLOT_SIZE])
+    state.landOwner = [owner - 1 for owner in data[offset + 3:offset + LANDS_SIZE:LAND_SLOT_SIZE]]
+    state.landPos = [pos if pos != NO_POS else -1 for pos in data[offset + 4:offset + LANDS_SIZE:LAND_SLOT_SIZE]]
+    offset += LANDS_SIZE
+
+    state.board = [bytearray(data[offset + y * BOARD_WIDTH:offset + (y + 1) * BOARD_WIDTH]) for y in range(BOARD_HEIGHT)]
+    offset += BOARD_SIZE
+
+    lists: List[List[int]] = []
+    for _ in range(LISTS_CNT):
+        length = data[offset]
+        lists.append(list(data[offset + 1:offset + 1 + length]))
+        offset += 1 + length
+    assert offset == len(data), 'encoded state has unexpected length'
+
+    state.landDeck = lists[0]
+    state.hands = lists[1:3]
+    state.piles = lists[3:-1]
+    state.events = lists[-1]
+    state.owned = OWN_ALL
+    state.rehash()
+    return state
+
+
+class PositionBuffer:
+    # many encoded positions in one contiguous buffer, a position costs its encoded size plus one offset
+    def __init__(self):
+        self.data: bytearray = bytearray()
+        self.offsets: array = array('Q', [0])
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def append(self, state: GameState) -> int:
+        self.data += encode_state(state)
+        self.offsets.append(len(self.data))
+        return len(self.offsets) - 2
+
+    def get_encoded(self, idx: int) -> bytes:
+        return bytes(self.data[self.offsets[idx]:self.offsets[idx + 1]])
+
+    def __getitem__(self, idx: int) -> GameState:
+        return decode_state(self.get_encoded(idx))
@@ -0,0 +1,297 @@
+from __future__ import annotations
+import argparse
+import math
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
+
+from computer_player import ComputerPlayer
+from expectimax_player import ExpectimaxPlayer
+from game import Game
+from heuristics import HeuristicParams
+from mcts_player import MctsPlayer
+from opening_book import OpeningBook
+from player import Player
+from tuning import load_params
+from util import create_rng
+
+# every pairing is played twice on one seed substream with the seats swapped - the same deal and dice, player1 and
+# player2 differ in their midPos and starting lands
+# the ratings are a Bradley-Terry model fitted to all results so far, on the Elo scale with the mean at BASE_RATING,
+# a game without a winner counts as a draw
+DEFAULT_MAX_ROUNDS = 300
+BASE_RATING = 1500.0
+ELO_SCALE = 400 / math.log(10)
+# the fit starts every entrant with this many virtual draws against an average one, so that an entrant without a win
+# or a loss still gets a finite rating
+PRIOR_GAMES = 2.0
+# z of the 95% confidence interval
+DEFAULT_CONFIDENCE = 1.96
+FIT_ITERATIONS = 100
+FIT_TOLERANCE = 1e-6
+
+# anything Game takes as a player type, e.g. partial(MctsPlayer, iterations=200), must be picklable
+PlayerFactory = Callable[..., Player]
+
+
+@dataclass(frozen=True)
+class MatchResult:
+    # first sat as player1, second as player2
+    first: str
+    second: str
+    stream: int
+    winner: Optional[int]
+    roundNo: int
+
+    def __str__(self) -> str:
+        winner = {1: self.first, 2: self.second}.get(self.winner, 'nobody')
+        return f'{self.first} - {self.second} (stream {self.stream}): winner {winner}, rounds {self.roundNo}'
+
+    def get_score(self) -> float:
+        # score of first
+        return 0.5 if self.winner is None else (1.0 if self.winner == 1 else 0.0)
+
+
+@dataclass(frozen=True)
+class Rating:
+    name: str
+    rating: float
+    # half width of the confidence interval
+    error: float
+    games: int
+    score: float
+
+    def __str__(self) -> str:
+        return f'{self.name:20} {self.rating:7.1f} +- {self.error:5.1f}  games {self.games:4}  score {self.score:.3f}'
+
+
+def play_match(first: PlayerFactory, second: PlayerFactory, seed: int, stream: int,
+               maxRounds: Optional[int]=DEFAULT_MAX_ROUNDS) -> Tuple[Optional[int], int]:
+    # number of the winner (None for nobody) and the number of rounds
+    game = Game(first, second, headless=True, seed=seed, stream=stream)
+    winner = game.play(maxRounds)
+    return (winner.number if winner is not None else None), game.roundNo
+
+
+class Ratings:
+    def __init__(self, names: List[str]):
+        self.names: List[str] = list(names)
+        self.index: Dict[str, int] = {name: idx for idx, name in enumerate(self.names)}
+        cnt = len(self.names)
+        # wins[i][j] - points of i against j, games[i][j] - games of i against j (draws give both half a point)
+        self.wins: List[List[float]] = [[0.0] * cnt for _ in range(cnt)]
+        self.games: List[List[int]] = [[0] * cnt for _ in range(cnt)]
+        # log strengths of the last fit, the next fit starts from them
+        self.strengths: List[float] = [0.0] * cnt
+
+    def add(self, result: MatchResult) -> None:
+        first, second = self.index[result.first], self.index[result.second]
+        score = result.get_score()
+        self.wins[first][second] += score
+        self.wins[second][first] += 1 - score
+        self.games[first][second] += 1
+        self.games[second][first] += 1
+
+    def fit(self) -> List[float]:
+        # minorization-maximization of the Bradley-Terry likelihood (Hunter 2004), the prior draws are games against
+        # an opponent of strength 1
+        cnt = len(self.names)
+        strengths = [math.exp(value) for value in self.strengths]
+        for _ in range(FIT_ITERATIONS):
+            change = 0.0
+            for i in range(cnt):
+                points = PRIOR_GAMES / 2 + sum(self.wins[i])
+                denominator = PRIOR_GAMES / (strengths[i] + 1) + \
+                    sum(self.games[i][j] / (strengths[i] + strengths[j]) for j in range(cnt) if self.games[i][j])
+                strength = points / denominator
+                change = max(change, abs(math.log(strength / strengths[i])))
+                strengths[i] = strength
+            if change < FIT_TOLERANCE:
+                break
+        self.strengths = [math.log(strength) for strength in strengths]
+        return self.strengths
+
+    def get_table(self, confidence: float=DEFAULT_CONFIDENCE) -> List[Rating]:
+        # the best first, the interval from the Fisher information of the own strength (the others taken for known)
+        strengths = self.fit()
+        mean = sum(strengths) / len(strengths) if strengths else 0.0
+        table = []
+        for i, name in enumerate(self.names):
+            information = PRIOR_GAMES * self._get_variance(strengths[i], 0.0)
+            information += sum(self.games[i][j] * self._get_variance(strengths[i], strengths[j])
+                               for j in range(len(self.names)) if self.games[i][j])
+            games = sum(self.games[i])
+            table.append(Rating(
+                name=name,
+                rating=BASE_RATING + ELO_SCALE * (strengths[i] - mean),
+                error=confidence * ELO_SCALE / math.sqrt(information),
+                games=games,
+                score=sum(self.wins[i]) / games if games else 0.5
+            ))
+        return sorted(table, key=lambda rating: rating.rating, reverse=True)
+
+    @staticmethod
+    def _get_variance(strength: float, opponentStrength: float) -> float:
+        probability = 1 / (1 + math.exp(opponentStrength - strength))
+        return probability * (1 - probability)
+
+
+class Tournament:
+    def __init__(self, seed: Optional[int]=None, maxRounds: Optional[int]=DEFAULT_MAX_ROUNDS,
+                 workers: Optional[int]=None):
+        _, self.seed = create_rng(seed)
+        self.maxRounds: Optional[int] = maxRounds
+        self.workers: Optional[int] = workers
+        self.entrants: Dict[str, PlayerFactory] = {}
+        self.results: List[MatchResult] = []
+        self.ratings: Ratings = Ratings([])
+        # every pairing gets its own substream
+        self.nextStream: int = 0
+
+    def register(self, name: str, playerType: PlayerFactory) -> None:
+        assert name not in self.entrants, f'{name} is registered already'
+        assert not self.results, 'cannot register after the first game'
+        self.entrants[name] = playerType
+        self.ratings = Ratings(list(self.entrants))
+
+    def register_params(self, name: str, params: HeuristicParams, book: Optional[OpeningBook]=None) -> None:
+        self.register(name, partial(ComputerPlayer, params=params, book=book))
+
+    def get_table(self, confidence: float=DEFAULT_CONFIDENCE) -> List[Rating]:
+        return self.ratings.get_table(confidence)
+
+    def round_robin(self, cycles: int=1, onResult: Optional[Callable[[MatchResult], None]]=None) -> List[Rating]:
+        # every entrant against every other one, twice per cycle (once in each seat)
+        names = list(self.entrants)
+        pairings = [(first, second) for _ in range(cycles)
+                    for i, first in enumerate(names) for second in names[i + 1:]]
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            self._play(executor, pairings, onResult)
+        return self.get_table()
+
+    def swiss(self, rounds: int, onResult: Optional[Callable[[MatchResult], None]]=None) -> List[Rating]:
+        # every round pairs the neighbours in the current ratings, the same pair plays again only when nothing else
+        # is left, with an odd number of entrants the last one sits the round out
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for _ in range(rounds):
+                self._play(executor, self._get_swiss_pairings(), onResult)
+        return self.get_table()
+
+    def _get_swiss_pairings(self) -> List[Tuple[str, str]]:
+        # sorted() is stable -> the order of registration decides the ties
+        unpaired = [rating.name for rating in self.get_table()]
+        pairings = []
+        while len(unpaired) > 1:
+            first = unpaired.pop(0)
+            firstIdx = self.ratings.index[first]
+            opponents = [name for name in unpaired if not self.ratings.games[firstIdx][self.ratings.index[name]]]
+            second = opponents[0] if opponents else unpaired[0]
+            unpaired.remove(second)
+            pairings.append((first, second))
+        return pairings
+
+    def _play(self, executor: Executor, pairings: List[Tuple[str, str]],
+              onResult: Optional[Callable[[MatchResult], None]]) -> None:
+        # the ratings change as soon as a game is finished, not in the order of the pairings
+        futures = {}
+        for first, second in pairings:
+            stream = self.nextStream
+            self.nextStream += 1
+            for seated in [(first, second), (second, first)]:
+                future = executor.submit(play_match, self.entrants[seated[0]], self.entrants[seated[1]], self.seed,
+                                         stream, self.maxRounds)
+                futures[future] = (*seated, stream)
+        for future in as_completed(futures):
+            first, second, stream = futures[future]
+            winner, roundNo = future.result()
+            result = MatchResult(first, second, stream, winner, roundNo)
+            self.results.append(result)
+            self.ratings.add(result)
+            if onResult is not None:
+                onResult(result)
+
+
+# player types of the command line, options are passed as keyword arguments
+PLAYER_TYPES: Dict[str, PlayerFactory] = {
+    'computer': ComputerPlayer,
+    'mcts': MctsPlayer,
+    'expectimax': ExpectimaxPlayer,
+}
+
+
+def parse_entrant(spec: str) -> Tuple[str, PlayerFactory]:
+    # [name=]type[:option=value,...], e.g. fast=mcts:iterations=100 or tuned=computer:params=tuned.json,book=book.json
+    # the values are taken for numbers when they look like them, params and book are JSON files, learned takes model
+    name, _, spec = spec.partition('=') if '=' in spec.split(':')[0] else ('', '', spec)
+    typeName, _, optionsSpec = spec.partition(':')
+    options: Dict[str, object] = {}
+    for option in filter(None, optionsSpec.split(',')):
+        key, _, value = option.partition('=')
+        if key == 'params':
+            options[key] = load_params(value)
+        elif key == 'book':
+            options[key] = OpeningBook.load(value)
+        elif key == 'model':
+            # numpy is needed only by the learned player
+            from value_function import ValueFunction
+            options[key] = ValueFunction.load(value)
+        else:
+            options[key] = _parse_value(value)
+
+    if typeName == 'learned':
+        from learned_player import LearnedPlayer
+        playerType: PlayerFactory = LearnedPlayer
+    else:
+        assert typeName in PLAYER_TYPES, f'unknown player type {typeName}, known: {", ".join(PLAYER_TYPES)}, learned'
+        playerType = PLAYER_TYPES[typeName]
+    return name or spec, partial(playerType, **options) if options else playerType
+
+
+def _parse_value(value: str) -> object:
+    for convert in (int, float):
+        try:
+            return convert(value)
+        except ValueError:
+            pass
+    return {'true': True, 'false': False}.get(value.lower(), value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='rate computer players by a tournament')
+    parser.add_argument('entrants', nargs='+',
+                        help='[name=]type[:option=value,...], types: computer, mcts, expectimax, learned, e.g. '
+                             'computer tuned=computer:params=tuned.json mcts:iterations=200')
+    parser.add_argument('-f', '--format', choices=['round-robin', 'swiss'], default='round-robin',
+                        help='pairing system (default: round-robin)')
+    parser.add_argument('-r', '--rounds', type=int, default=1,
+                        help='cycles of the round robin or rounds of the swiss system, every pairing is two games')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='worker processes (default: cpu count)')
+    parser.add_argument('-s', '--seed', type=int, default=None, help='seed of the whole run (default: random)')
+    parser.add_argument('--max-rounds', type=int, default=DEFAULT_MAX_ROUNDS,
+                        help='games not decided after this many rounds have no winner')
+    parser.add_argument('--report', type=int, default=10, help='print the ratings after this many games')
+    args = parser.parse_args()
+
+    tournament = Tournament(args.seed, args.max_rounds, args.workers)
+    for spec in args.entrants:
+        tournament.register(*parse_entrant(spec))
+    print(f'{args.format} of {len(tournament.entrants)} entrants, seed {tournament.seed}', flush=True)
+
+    def report(result: MatchResult) -> None:
+        print(result, flush=True)
+        if len(tournament.results) % args.report == 0:
+            print('\n'.join(map(str, tournament.get_table())), flush=True)
+
+    start = time.perf_counter()
+    if args.format == 'swiss':
+        table = tournament.swiss(args.rounds, report)
+    else:
+        table = tournament.round_robin(args.rounds, report)
+    print(f'final ratings after {len(tournament.results)} games, {time.perf_counter() - start:.0f} s')
+    print('\n'.join(map(str, table)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+from array import array
+from typing import Optional, Tuple
+
+# value, visits, depth
+TableEntry = Tuple[float, int, int]
+
+# bytes used by one slot in the arrays below: key, value, visits, depth, generation
+SLOT_SIZE = 8 + 8 + 4 + 1 + 2
+EMPTY_DEPTH = -1
+MAX_DEPTH = 127
+
+
+class TranspositionTable:
+    # search results keyed by GameState.zobrist, all slots are allocated up front so the memory never grows
+    # every bucket has two slots: the first keeps the deepest entry of the current search, the second takes whatever
+    # did not fit into the first one (two-tier replacement)
+    def __init__(self, maxBytes: int=64 * 1024 * 1024):
+        self.bucketsCnt: int = max(1, maxBytes // (2 * SLOT_SIZE))
+        slotsCnt = 2 * self.bucketsCnt
+        self.keys: array = array('Q', bytes(8 * slotsCnt))
+        self.values: array = array('d', bytes(8 * slotsCnt))
+        self.visits: array = array('I', bytes(4 * slotsCnt))
+        self.depths: array = array('b', [EMPTY_DEPTH]) * slotsCnt
+        self.generations: array = array('H', bytes(2 * slotsCnt))
+        self.generation: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.replacements: int = 0
+
+    def __len__(self) -> int:
+        return len(self.depths) - self.depths.count(EMPTY_DEPTH)
+
+    def get_memory_size(self) -> int:
+        return len(self.depths) * SLOT_SIZE
+
+    def new_search(self) -> None:
+        # entries of older searches are replaced first, even when they are deeper
+        self.generation = (self.generation + 1) & 0xffff
+
+    def clear(self) -> None:
+        self.depths = array('b', [EMPTY_DEPTH]) * len(self.depths)
+        self.hits = self.misses = self.replacements = 0
+
+    def _find(self, key: int) -> int:
+        slot = 2 * (key % self.bucketsCnt)
+        if self.keys[slot] == key and self.depths[slot] != EMPTY_DEPTH:
+            return slot
+        if self.keys[slot + 1] == key and self.depths[slot + 1] != EMPTY_DEPTH:
+            return slot + 1
+        return -1
+
+    def _copy_slot(self, source: int, target: int) -> None:
+        self.keys[target] = self.keys[source]
+        self.values[target] = self.values[source]
+        self.visits[target] = self.visits[source]
+        self.depths[target] = self.depths[source]
+        self.generations[target] = self.generations[source]
+
+    def lookup(self, key: int) -> Optional[TableEntry]:
+        slot = self._find(key)
+        if slot < 0:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self.values[slot], self.visits[slot], self.depths[slot]
+
+    def store(self, key: int, value: float, visits: int, depth: int=0) -> None:
+        depth = min(depth, MAX_DEPTH)
+        slot = self._find(key)
+        if slot < 0:
+            slot = 2 * (key % self.bucketsCnt)
+            if self.depths[slot] != EMPTY_DEPTH:
+                if self.depths[slot + 1] != EMPTY_DEPTH:
+                    self.replacements += 1
+                if self.generations[slot] == self.generation and self.depths[slot] > depth:
+                    # the deep entry stays, the shallow one goes to the always-replace slot
+                    slot += 1
+                else:
+                    # the replaced entry moves down to the always-replace slot
+                    self._copy_slot(slot, slot + 1)
+            self.keys[slot] = key
+        self.values[slot] = value
+        self.visits[slot] = min(visits, 0xffffffff)
+        self.depths[slot] = depth
+        self.generations[slot] = self.generation
+
+    def add_result(self, key: int, result: float, depth: int=0) -> None:
+        # one more rollout result of the position, the stored value is the mean of all of them
+        entry = self.lookup(key)
+        if entry is None:
+            self.store(key, result, 1, depth)
+        else:
+            value, visits, storedDepth = entry
+            self.store(key, value + (result - value) / (visits + 1), visits + 1, max(depth, storedDepth))
@@ -0,0 +1,221 @@
+from __future__ import annotations
+import argparse
+import json
+import math
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from functools import partial
+from random import Random
+from typing import Callable, Dict, List, Optional, Tuple
+
+from computer_player import ComputerPlayer
+from game import Game
+from heuristics import HeuristicParams, DEFAULT_PARAMS, PARAM_NAMES, PARAM_BOUNDS
+from util import create_rng
+
+# every candidate plays the same games against a fixed opponent (the default params unless given) - candidate
+# gameNo i plays the seed substream i, sitting first in the even games and second in the odd ones
+DEFAULT_MAX_ROUNDS = 300
+DEFAULT_MAX_GAMES = 40
+DEFAULT_BATCH_SIZE = 8
+# width of the confidence interval of the score in standard deviations
+DEFAULT_CONFIDENCE = 2.0
+# the step of the evolution strategy at the start as a part of the parameter range
+INITIAL_STEP = 0.3
+METHODS = ['random', 'es']
+
+
+def play_match(candidate: HeuristicParams, opponent: HeuristicParams, seed: int, gameNo: int,
+               maxRounds: Optional[int]=DEFAULT_MAX_ROUNDS) -> float:
+    # 1 the candidate won, 0 lost, 0.5 nobody won
+    candidateFirst = gameNo % 2 == 0
+    first, second = (candidate, opponent) if candidateFirst else (opponent, candidate)
+    game = Game(partial(ComputerPlayer, params=first), partial(ComputerPlayer, params=second), headless=True,
+                seed=seed, stream=gameNo)
+    winner = game.play(maxRounds)
+    if winner is None:
+        return 0.5
+    return 1.0 if (winner is game.player1) == candidateFirst else 0.0
+
+
+@dataclass
+class Evaluation:
+    params: HeuristicParams
+    scoreSum: float = 0.0
+    scoreSquares: float = 0.0
+    games: int = 0
+    # stopped early, it cannot be better than the best one
+    stopped: bool = False
+
+    def __str__(self) -> str:
+        low, high = self.get_interval()
+        stopped = ', stopped' if self.stopped else ''
+        return f'score {self.get_score():.3f} [{low:.3f}, {high:.3f}] in {self.games} games{stopped}'
+
+    def add(self, score: float) -> None:
+        self.scoreSum += score
+        self.scoreSquares += score * score
+        self.games += 1
+
+    def get_score(self) -> float:
+        return self.scoreSum / self.games if self.games else 0.5
+
+    def get_interval(self, confidence: float=DEFAULT_CONFIDENCE) -> Tuple[float, float]:
+        if not self.games:
+            return 0.0, 1.0
+        score = self.get_score()
+        # a floor on the variance so that a few equal results are not taken for certain
+        variance = max(self.scoreSquares / self.games - score * score, 0.05)
+        halfWidth = confidence * math.sqrt(variance / self.games)
+        return max(score - halfWidth, 0.0), min(score + halfWidth, 1.0)
+
+
+def evaluate_candidates(executor: Executor, candidates: List[HeuristicParams], opponent: HeuristicParams, seed: int,
+                        maxGames: int=DEFAULT_MAX_GAMES, batchSize: int=DEFAULT_BATCH_SIZE,
+                        maxRounds: Optional[int]=DEFAULT_MAX_ROUNDS, bestScore: float=0.5,
+                        confidence: float=DEFAULT_CONFIDENCE) -> List[Evaluation]:
+    # the candidates play their games in batches side by side, a candidate stops once the upper bound of its score
+    # falls below bestScore (the score to beat, 0.5 is the opponent itself) or the lower bound of another candidate
+    evaluations = [Evaluation(params) for params in candidates]
+    active = list(evaluations)
+    while active:
+        futures = {}
+        for evaluation in active:
+            for gameNo in range(evaluation.games, min(evaluation.games + batchSize, maxGames)):
+                futures[executor.submit(play_match, evaluation.params, opponent, seed, gameNo, maxRounds)] = \
+                    evaluation
+        wait(futures)
+        for future, evaluation in futures.items():
+            evaluation.add(future.result())
+
+        threshold = max([bestScore] + [evaluation.get_interval(confidence)[0] for evaluation in active])
+        for evaluation in active:
+            if evaluation.games < maxGames and evaluation.get_interval(confidence)[1] < threshold:
+                evaluation.stopped = True
+        active = [evaluation for evaluation in active if not evaluation.stopped and evaluation.games < maxGames]
+    return evaluations
+
+
+def clip_vector(vector: List[float]) -> List[float]:
+    return [min(max(value, PARAM_BOUNDS[name][0]), PARAM_BOUNDS[name][1]) for name, value in zip(PARAM_NAMES, vector)]
+
+
+class RandomSearch:
+    # candidates drawn uniformly from PARAM_BOUNDS, the start params are only the score to beat (see tune)
+    def __init__(self, rng: Random):
+        self.rng: Random = rng
+
+    def ask(self, count: int) -> List[HeuristicParams]:
+        return [HeuristicParams.from_vector([self.rng.uniform(*PARAM_BOUNDS[name]) for name in PARAM_NAMES])
+                for _ in range(count)]
+
+    def tell(self, evaluations: List[Evaluation]) -> None:
+        pass
+
+
+class EvolutionStrategy:
+    # (mu, lambda) evolution strategy with a step size per parameter, a diagonal simplification of CMA-ES:
+    # the mean moves to the weighted mean of the better half, the steps follow the spread of the better half
+    def __init__(self, rng: Random, start: HeuristicParams, learningRate: float=0.3):
+        self.rng: Random = rng
+        self.mean: List[float] = start.to_vector()
+        self.steps: List[float] = [INITIAL_STEP * (PARAM_BOUNDS[name][1] - PARAM_BOUNDS[name][0])
+                                   for name in PARAM_NAMES]
+        self.learningRate: float = learningRate
+
+    def ask(self, count: int) -> List[HeuristicParams]:
+        return [HeuristicParams.from_vector(clip_vector([self.rng.gauss(mean, step)
+                                                         for mean, step in zip(self.mean, self.steps)]))
+                for _ in range(count)]
+
+    def tell(self, evaluations: List[Evaluation]) -> None:
+        ranked = sorted(evaluations, key=lambda evaluation: evaluation.get_score(), reverse=True)
+        selected = ranked[:max(len(ranked) // 2, 1)]
+        # log-linear recombination weights as in CMA-ES
+        weights = [math.log(len(selected) + 0.5) - math.log(rank + 1) for rank in range(len(selected))]
+        total = sum(weights)
+        weights = [weight / total for weight in weights]
+
+        vectors = [evaluation.params.to_vector() for evaluation in selected]
+        oldMean = self.mean
+        self.mean = [sum(weight * vector[i] for weight, vector in zip(weights, vectors)) for i in range(len(oldMean))]
+        for i, step in enumerate(self.steps):
+            spread = math.sqrt(sum(weight * (vector[i] - oldMean[i]) ** 2 for weight, vector in zip(weights, vectors)))
+            self.steps[i] = (1 - self.learningRate) * step + self.learningRate * spread
+
+
+def tune(method: str='es', generations: int=10, populationSize: int=8, workers: Optional[int]=None,
+         seed: Optional[int]=None, maxGames: int=DEFAULT_MAX_GAMES, batchSize: int=DEFAULT_BATCH_SIZE,
+         maxRounds: Optional[int]=DEFAULT_MAX_ROUNDS, start: HeuristicParams=DEFAULT_PARAMS,
+         opponent: HeuristicParams=DEFAULT_PARAMS,
+         onGeneration: Optional[Callable[[int, List[Evaluation], Evaluation], None]]=None) -> Evaluation:
+    # returns the best fully evaluated candidate, the start params when no candidate beat them
+    assert method in METHODS, f'unknown method {method}'
+    rng, seed = create_rng(seed)
+    search = RandomSearch(rng) if method == 'random' else EvolutionStrategy(rng, start)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        best = evaluate_candidates(executor, [start], opponent, seed, maxGames, batchSize, maxRounds, bestScore=0.0)[0]
+        for generation in range(generations):
+            evaluations = evaluate_candidates(executor, search.ask(populationSize), opponent, seed, maxGames,
+                                              batchSize, maxRounds, bestScore=best.get_score())
+            search.tell(evaluations)
+            for evaluation in evaluations:
+                if not evaluation.stopped and evaluation.get_score() > best.get_score():
+                    best = evaluation
+            if onGeneration is not None:
+                onGeneration(generation, evaluations, best)
+    return best
+
+
+def save_params(params: HeuristicParams, path: str) -> None:
+    with open(path, 'w') as file:
+        json.dump(params.to_dict(), file, indent=2)
+
+
+def load_params(path: str) -> HeuristicParams:
+    with open(path) as file:
+        return HeuristicParams.from_dict(json.load(file))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='tune the heuristics of the computer player by self-play')
+    parser.add_argument('-m', '--method', choices=METHODS, default='es',
+                        help='random search or evolution strategy (default)')
+    parser.add_argument('-g', '--generations', type=int, default=10, help='number of generations')
+    parser.add_argument('-p', '--population', type=int, default=8, help='candidates per generation')
+    parser.add_argument('-n', '--games', type=int, default=DEFAULT_MAX_GAMES,
+                        help='games of a candidate unless stopped early')
+    parser.add_argument('-b', '--batch', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='games of a candidate between two early stopping checks')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='worker processes (default: cpu count)')
+    parser.add_argument('-s', '--seed', type=int, default=None, help='seed of the whole run (default: random)')
+    parser.add_argument('--max-rounds', type=int, default=DEFAULT_MAX_ROUNDS,
+                        help='games not decided after this many rounds have no winner')
+    parser.add_argument('--start', default=None, help='JSON file with the params to start from (default: defaults)')
+    parser.add_argument('--opponent', default=None, help='JSON file with the params of the opponent')
+    parser.add_argument('-o', '--output', default='heuristic_params.json', help='JSON file for the best params')
+    args = parser.parse_args()
+
+    start = load_params(args.start) if args.start is not None else DEFAULT_PARAMS
+    opponent = load_params(args.opponent) if args.opponent is not None else DEFAULT_PARAMS
+    _, seed = create_rng(args.seed)
+    print(f'tuning by {args.method}, seed {seed}', flush=True)
+
+    def report(generation: int, evaluations: List[Evaluation], best: Evaluation) -> None:
+        played = sum(evaluation.games for evaluation in evaluations)
+        print(f'generation {generation}: {played} games, best {best}', flush=True)
+        save_params(best.params, args.output)
+
+    begin = time.perf_counter()
+    best = tune(args.method, args.generations, args.population, args.workers, seed, args.games, args.batch,
+                args.max_rounds, start, opponent, report)
+    save_params(best.params, args.output)
+    changed: Dict[str, float] = {name: value for name, value in best.params.to_dict().items()
+                                 if value != getattr(DEFAULT_PARAMS, name)}
+    print(f'best {best}, changed params {changed}, {time.perf_counter() - begin:.0f} s')
+
+
+if __name__ == '__main__':
+    main()
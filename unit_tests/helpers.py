@@ -0,0 +1,9 @@
+from computer_player import ComputerPlayer
+from game import Game
+
+
+def create_game(seed: int, rounds: int) -> Game:
+    # a game of the heuristic players stopped after the rounds, the same seed gives the same position
+    game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=seed)
+    game.play(maxRounds=rounds)
+    return game
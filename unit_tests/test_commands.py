@@ -0,0 +1,116 @@
+import unittest
+
+from card import Village, Path
+from commands import PlayCard, BuildVillage, BuildTown, BuildPath, BankTrade, EndTurn, create_command, pay_cost
+from computer_player import ComputerPlayer
+from enums import ActionType
+from game import Game
+from game_state import BOARD_WIDTH, SLOT, TOWN, PLAYABLE_BASE, LAND_BASE, PLAYABLE_CARDS, VILLAGE_IDX
+from move_generator import generate_moves, get_resource_vector, RESOURCES, LAND_RESOURCE_IDX
+
+
+def index(x: int, y: int) -> int:
+    return x + y * BOARD_WIDTH
+
+
+class TestStack(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=1)
+        self.state = self.game.get_state()
+        for land in self.state.get_lands(0):
+            self.state.set_land_held(land, 3)
+
+    def test_generated_moves_are_valid(self):
+        for seed in range(4):
+            game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=seed)
+            game.play(maxRounds=30)
+            state = game.get_state()
+            for land in state.get_lands(state.current):
+                state.set_land_held(land, 2)
+            for move in generate_moves(state):
+                if move[0] == ActionType.ACTION_CARD:
+                    self.assertRaises(ValueError, create_command, move)
+                    continue
+                command = create_command(move)
+                self.assertEqual(command.to_move(), move)
+                self.assertTrue(command.validate(state), move)
+                child = state.fork()
+                command.apply(child)
+                self.assertNotEqual(child, state)
+
+    def test_invalid(self):
+        self.assertFalse(BuildVillage(index(4, 8)).validate(self.state))
+        self.assertFalse(BuildVillage(index(3, 2)).validate(self.state))
+        self.assertFalse(BuildTown(index(5, 2)).validate(self.state))
+        self.assertFalse(BuildPath(index(3, 8)).validate(self.state))
+        self.assertFalse(PlayCard(0, index(5, 7)).validate(self.state))
+        self.assertTrue(BuildTown(index(5, 8)).validate(self.state))
+        self.assertTrue(BuildPath(index(4, 8)).validate(self.state))
+
+        spa = next(card for card, playable in enumerate(PLAYABLE_CARDS) if playable.name == 'spa')
+        self.state.add_to_hand(0, spa)
+        self.assertFalse(PlayCard(spa, index(5, 7)).validate(self.state))
+
+        for land in self.state.get_lands(0):
+            self.state.set_land_held(land, 0)
+        self.assertFalse(BuildTown(index(5, 8)).validate(self.state))
+
+    def test_build(self):
+        resources = sum(get_resource_vector(self.state, 0))
+        for command in [BuildPath(index(4, 8)), BuildVillage(index(3, 8)), BuildTown(index(3, 8))]:
+            self.assertTrue(command.validate(self.state), command)
+            command.apply(self.state)
+
+        self.assertEqual(self.state.get_square(3, 8), TOWN)
+        for y in [6, 7, 9, 10]:
+            self.assertEqual(self.state.get_square(3, y), SLOT)
+        for y in [7, 9]:
+            self.assertEqual(self.state.get_square(2, y) - LAND_BASE, self.state.landPos.index(index(2, y)))
+        self.assertEqual(len(self.state.landDeck), 9)
+        self.assertEqual(self.state.infraLeft[VILLAGE_IDX], self.game.infraCardsLeft[Village] - 1)
+        # path 3, village 4, town 5
+        self.assertEqual(sum(get_resource_vector(self.state, 0)), resources - 12)
+
+        hubert = next(card for card, playable in enumerate(PLAYABLE_CARDS) if playable.name == 'hubert')
+        self.state.add_to_hand(0, hubert)
+        for land in self.state.get_lands(0):
+            self.state.set_land_held(land, 1)
+        PlayCard(hubert, index(3, 6)).apply(self.state)
+        self.assertEqual(self.state.get_square(3, 6), PLAYABLE_BASE + hubert)
+        self.assertNotIn(hubert, self.state.hands[0])
+
+    def test_bank_trade_and_pay(self):
+        land = next(self.state.get_lands(0))
+        self.state.set_land_held(land, 0)
+        paid = next(resource for resource in range(len(RESOURCES)) if resource != LAND_RESOURCE_IDX[land])
+        self.assertTrue(BankTrade(land, paid).validate(self.state))
+        BankTrade(land, paid).apply(self.state)
+        self.assertEqual(self.state.landHeld[land], 1)
+
+        resources = get_resource_vector(self.state, 0)
+        pay_cost(self.state, 0, tuple(resources))
+        self.assertEqual(sum(get_resource_vector(self.state, 0)), 0)
+
+        EndTurn().apply(self.state)
+        self.assertEqual((self.state.current, self.state.roundNo), (1, 2))
+
+    def test_execute(self):
+        self.game.set_state(self.state)
+        BuildPath(index(4, 8)).execute(self.game)
+        self.assertEqual(self.game.mainBoard.get_square(self.game.player1.midPos.left(2)).name, 'path')
+        self.assertEqual(len(self.game.player1.paths), 2)
+        self.assertRaises(ValueError, BuildPath(index(4, 8)).execute, self.game)
+
+    def test_scout(self):
+        # with a scout in hand the village gets the lands the real ComputerPlayer picks
+        scout = next(card for card, playable in enumerate(PLAYABLE_CARDS) if playable.name == 'scout')
+        withoutScout = self.state.fork()
+        self.state.add_to_hand(0, scout)
+        self.game.set_state(self.state)
+        for state in [self.state, withoutScout]:
+            for command in [BuildPath(index(4, 8)), BuildVillage(index(3, 8))]:
+                command.apply(state)
+        self.game.player1.build_infrastructure(Path, self.game.mainBoard.to_pos(index(4, 8)))
+        self.game.player1.build_infrastructure(Village, self.game.mainBoard.to_pos(index(3, 8)))
+        self.assertEqual(self.game.get_state().landPos, self.state.landPos)
+        self.assertNotEqual(withoutScout.landPos, self.state.landPos)
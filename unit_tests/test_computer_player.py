@@ -2,7 +2,7 @@ import unittest
 
 from unittest.mock import MagicMock
 import config
-from card import Building, Fleet, Knight, Action
+from card import Building, Fleet, Knight, Action, Landscape
 from computer_player import ComputerPlayer
 from enums import Resource
 from util import Pos, Cost
@@ -88,3 +88,59 @@ class TestStack(unittest.TestCase):
         self.assertEqual(list(map(lambda c: c.name, p.cardsInHand)), ['cloister', 'scout', 'fleet_wood'])
         self.assertEqual(list(map(lambda c: c.name, pile)), ['arson', 'jose'])
 
+
+    def test_select_card_to_pay(self):
+        p = ComputerPlayer(MagicMock(), MagicMock(), 2, Pos(7, 2))
+        p.landscapeCards = [
+            Landscape('wood', Resource.WOOD, 1),
+            Landscape('wood', Resource.WOOD, 2),
+            Landscape('rock', Resource.ROCK, 3)
+        ]
+        p.landscapeCards[0].resourcesHeld = 1
+        p.landscapeCards[1].resourcesHeld = 2
+        p.landscapeCards[2].resourcesHeld = 3
+
+        self.assertIs(p.select_card_to_pay(Cost(wood=1)), p.landscapeCards[1])
+        self.assertIs(p.select_card_to_pay(), p.landscapeCards[2])
+
+    def test_plan_trades(self):
+        p = ComputerPlayer(MagicMock(), MagicMock(), 2, Pos(7, 2))
+        p.landscapeCards = [
+            Landscape('wood', Resource.WOOD, 1),
+            Landscape('rock', Resource.ROCK, 2),
+            Landscape('grain', Resource.GRAIN, 3),
+            Landscape('brick', Resource.BRICK, 4)
+        ]
+        p.landscapeCards[0].resourcesHeld = 3
+        p.landscapeCards[1].resourcesHeld = 3
+        p.landscapeCards[2].resourcesHeld = 3
+
+        self.assertEqual(p._plan_trades(Cost(wood=1)), [])
+        self.assertEqual(p._plan_trades(Cost(brick=1)), [(Resource.GRAIN, Resource.BRICK)])
+        self.assertEqual(p._plan_trades(Cost(brick=2, wood=1, rock=1)), None)
+        self.assertEqual(p._plan_trades(Cost(brick=2, grain=1)), [(Resource.ROCK, Resource.BRICK), (Resource.WOOD, Resource.BRICK)])
+
+        # no space left on a land
+        self.assertEqual(p._plan_trades(Cost(sheep=1)), None)
+
+        # fleet makes the trade cheaper
+        p.fleetPlayed.append(Fleet('fleet_wood', Cost(), Resource.WOOD, 1))
+        self.assertEqual(p._plan_trades(Cost(brick=1)), [(Resource.WOOD, Resource.BRICK)])
+
+    def test_can_grab_resources(self):
+        p1 = ComputerPlayer(MagicMock(), MagicMock(), 1, Pos(2, 2))
+        p2 = ComputerPlayer(MagicMock(), MagicMock(), 2, Pos(7, 2))
+        p1.opponent = p2
+        p1.landscapeCards = [Landscape('wood', Resource.WOOD, 1), Landscape('rock', Resource.ROCK, 2)]
+        p2.landscapeCards = [Landscape('wood', Resource.WOOD, 1), Landscape('grain', Resource.GRAIN, 2)]
+        p1.landscapeCards[0].resourcesHeld = config.MAX_LAND_RESOURCES - 1
+        p2.landscapeCards[0].resourcesHeld = 2
+        p2.landscapeCards[1].resourcesHeld = 3
+
+        # only one wood fits, the grain has no land to go to
+        self.assertTrue(p1._can_grab_resources(1))
+        self.assertFalse(p1._can_grab_resources(2))
+
+        p1.landscapeCards[0].resourcesHeld = 0
+        self.assertTrue(p1._can_grab_resources(2))
+        self.assertFalse(p1._can_grab_resources(3))
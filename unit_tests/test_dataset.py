@@ -0,0 +1,75 @@
+import os, tempfile, unittest, sys
+from unittest.mock import patch
+
+from enums import ActionType
+import selfplay
+from selfplay import play_game
+
+# numpy is needed only by the dataset
+try:
+    import numpy as np
+    from dataset import ArrayFileWriter, DatasetWriter, open_dataset, COLUMNS
+    from value_function import VECTOR_SIZE
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestStack(unittest.TestCase):
+    def test_record(self):
+        result = play_game(1, 42, record=True)
+        record = result.record
+        assert record is not None
+        rows = len(record['actions'])
+        self.assertEqual({name: array.shape for name, array in record.items()},
+                         {'features': (rows, VECTOR_SIZE), 'actions': (rows, 3), 'outcomes': (rows,),
+                          'games': (rows, 3)})
+        # every turn ends by END_TURN of the player on turn
+        ends = record['actions'][:, 0] == ActionType.END_TURN.value
+        self.assertEqual(ends.sum(), result.roundNo - 1)
+        self.assertTrue((np.diff(record['games'][ends, 1]) == 1).all())
+        winner = result.winner - 1
+        self.assertTrue((record['outcomes'] == np.where(record['games'][:, 2] == winner, 1, -1)).all())
+        # the record does not change the game
+        self.assertEqual(play_game(1, 42), result)
+
+    def test_write(self):
+        records = [play_game(gameNo, 7, maxRounds=15, record=True).record for gameNo in range(2)]
+        with tempfile.TemporaryDirectory() as directory:
+            with DatasetWriter(directory) as writer:
+                for record in records:
+                    writer.write(record)
+            dataset = open_dataset(directory)
+            for name in COLUMNS:
+                self.assertIsInstance(dataset[name], np.memmap)
+                self.assertTrue((dataset[name] == np.concatenate([record[name] for record in records])).all())
+            self.assertTrue((dataset['outcomes'] == 0).all())
+
+            # a plain memmap after the header reads the same rows
+            header = os.path.getsize(os.path.join(directory, 'features.npy')) - dataset['features'].nbytes
+            features = np.memmap(os.path.join(directory, 'features.npy'), dtype=np.float32, mode='r', offset=header,
+                                 shape=dataset['features'].shape)
+            self.assertTrue((features == dataset['features']).all())
+            del dataset, features
+
+    def test_empty(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'empty.npy')
+            ArrayFileWriter(path, np.dtype(np.int16), (3,)).close()
+            self.assertEqual(np.load(path).shape, (0, 3))
+
+    def test_interrupted(self):
+        # the games written before an interrupt stay readable
+        result = play_game(0, 9, maxRounds=10, record=True)
+
+        def run_games(*args):
+            yield result
+            raise KeyboardInterrupt
+
+        with tempfile.TemporaryDirectory() as directory:
+            with patch.object(sys, 'argv', ['selfplay', '--dataset', directory]), \
+                    patch.object(selfplay, 'run_games', run_games), patch('builtins.print'):
+                self.assertRaises(KeyboardInterrupt, selfplay.main)
+            dataset = open_dataset(directory)
+            self.assertEqual(len(dataset['actions']), len(result.record['actions']))
+            del dataset
@@ -0,0 +1,48 @@
+import os, tempfile, unittest
+from unittest.mock import MagicMock, patch
+
+from event_logger import EVENT_FORMATS, NullLogger, StdoutLogger, BufferedFileLogger, format_event
+
+
+class TestStack(unittest.TestCase):
+    def test_format_event(self):
+        self.assertEqual(format_event('battle_strength', (1, 5)), 'player 1 battle strength: 5')
+        self.assertEqual(format_event('battle_no_winner', ()), 'battle has no winner')
+
+    def test_null_logger(self):
+        logger = NullLogger()
+        logger.log('battle_winner', 1)
+        logger.close()
+
+    def test_stdout_logger(self):
+        logger = StdoutLogger()
+        with patch('builtins.print') as printMock:
+            logger.log('yield_dice', 4)
+        printMock.assert_called_once_with('yield: 4')
+
+    def test_buffered_file_logger(self):
+        with tempfile.TemporaryDirectory() as tmpDir:
+            path = os.path.join(tmpDir, 'game.log')
+            logger = BufferedFileLogger(path, bufferSize=3)
+
+            # arguments are formatted only when the buffer is written
+            card = MagicMock()
+            card.__str__ = MagicMock(return_value='konrad')
+            logger.log('card_event', card)
+            logger.log('round', 2)
+            card.__str__.assert_not_called()
+            with open(path) as f:
+                self.assertEqual(f.read(), '')
+
+            logger.log('trade_started')
+            card.__str__.assert_called_once()
+            logger.log('toss_failed', 6)
+            logger.close()
+
+            with open(path) as f:
+                self.assertEqual(f.read().splitlines(), [
+                    'card_event\tcard event: konrad',
+                    'round\t' + EVENT_FORMATS['round'].format(2),
+                    'trade_started\ttrading started',
+                    'toss_failed\ttossed 6, action failed'
+                ])
@@ -0,0 +1,90 @@
+import unittest
+from functools import partial
+from random import Random
+from time import perf_counter
+
+from computer_player import ComputerPlayer
+from enums import ActionType
+from expectimax import ExpectimaxSearch, DICE_OUTCOMES
+from expectimax_player import ExpectimaxPlayer
+from game import Game
+from game_state import GameState
+from helpers import create_game
+from evaluation import evaluate
+from mcts import get_tree_moves
+from rules import apply_dice, apply_turn_move, get_winner
+
+
+def expectimax(state: GameState, turnsLeft: int, turnMoves: int=0) -> float:
+    # the same search without any pruning
+    values = []
+    for move in get_tree_moves(state, turnMoves):
+        child = state.fork()
+        apply_turn_move(child, move)
+        if move[0] != ActionType.END_TURN:
+            values.append(expectimax(child, turnsLeft, turnMoves + 1))
+        elif get_winner(child) is not None:
+            values.append(1.0 if get_winner(child) == 0 else 0.0)
+        elif turnsLeft == 1:
+            values.append(evaluate(child))
+        else:
+            value = 0.0
+            for probability, eventRoll, yieldRoll in DICE_OUTCOMES:
+                outcome = child.fork()
+                apply_dice(outcome, eventRoll, yieldRoll, Random(0))
+                value += probability * expectimax(outcome, turnsLeft - 1)
+            values.append(value)
+    return max(values) if state.current == 0 else min(values)
+
+
+class TestStack(unittest.TestCase):
+    def test_dice_outcomes(self):
+        self.assertAlmostEqual(sum(probability for probability, _, _ in DICE_OUTCOMES), 1.0)
+        self.assertEqual(len(DICE_OUTCOMES), 5 * 6)
+
+    def test_pruning_is_exact(self):
+        for seed in range(3):
+            state = create_game(seed, 15 + seed).get_state()
+            search = ExpectimaxSearch(depth=2, maxNodes=None)
+            move, value, stats = search.search(state)
+            self.assertAlmostEqual(value, expectimax(state, 2))
+            self.assertEqual(search.completedDepth, 2)
+            self.assertIn(move, get_tree_moves(state, 0))
+            self.assertEqual(stats.iterations, search.nodes)
+
+    def test_node_budget(self):
+        # the same budget gives the same answer, an exhausted budget falls back to the last completed depth
+        state = create_game(3, 20).get_state()
+        for land in state.get_lands(state.current):
+            state.set_land_held(land, 2)
+        results = [ExpectimaxSearch(depth=3, maxNodes=300).search(state)[:2] for _ in range(2)]
+        self.assertEqual(results[0], results[1])
+
+        search = ExpectimaxSearch(depth=5, maxNodes=50)
+        move, _, _ = search.search(state)
+        self.assertLess(search.completedDepth, 5)
+        self.assertIn(move, get_tree_moves(state, 0))
+
+    def test_deadline(self):
+        # nothing is searched after a passed deadline, the rollout policy chooses the move
+        state = create_game(3, 20).get_state()
+        for land in state.get_lands(state.current):
+            state.set_land_held(land, 2)
+        search = ExpectimaxSearch(depth=5, maxNodes=None)
+        start = perf_counter()
+        move, _, _ = search.search(state, 0, perf_counter() - 1)
+        self.assertEqual(search.completedDepth, 0)
+        self.assertIn(move, get_tree_moves(state, 0))
+        self.assertNotEqual(move[0], ActionType.END_TURN)
+
+        move, _, _ = search.search(state, 0, perf_counter() + 0.05)
+        self.assertLess(perf_counter() - start, 0.5)
+        self.assertIn(move, get_tree_moves(state, 0))
+
+    def test_player(self):
+        game = Game(partial(ExpectimaxPlayer, depth=1, maxNodes=200), ComputerPlayer, headless=True, seed=4)
+        game.play(maxRounds=30)
+        player = game.player1
+        assert isinstance(player, ExpectimaxPlayer)
+        self.assertGreater(player.totalIterations, 0)
+        self.assertGreater(len(player.table), 0)
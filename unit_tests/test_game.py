@@ -1,7 +1,9 @@
-import unittest, sys
+import os, unittest, subprocess, sys
 from unittest.mock import MagicMock
 from card import Action, Fleet, Knight, Building, Town, SettlementSlot, Landscape, Village
+from computer_player import ComputerPlayer
 from enums import Resource
+from null_display_handler import NullDisplayHandler
 from util import Cost, Pos
 
 sys.modules['display_handler'] = MagicMock()
@@ -209,3 +211,94 @@ class TestStack(unittest.TestCase):
         self.assertEqual(len(village.cards), 1)
         self.assertTrue(isinstance(village.cards[0], SettlementSlot))
         self.assertIs(village.cards[0].settlement, village)
+
+    def test_headless(self):
+        displayHandlerMock = sys.modules['display_handler'].DisplayHandler
+        displayHandlerMock.reset_mock()
+
+        game = Game(ComputerPlayer, ComputerPlayer, headless=True)
+        self.assertTrue(game.headless)
+        self.assertIsInstance(game.display, NullDisplayHandler)
+        self.assertIsInstance(game.player1, ComputerPlayer)
+        self.assertIsInstance(game.player2, ComputerPlayer)
+        displayHandlerMock.assert_not_called()
+
+        self.assertEqual(len(game.display.boards), 6)
+        self.assertTrue(game.mainBoard.editedSquares)
+        game.display.refresh_screen()
+        self.assertEqual(game.mainBoard.editedSquares, [])
+        game.display.print_msg('nobody will see this')
+
+        with self.assertRaises(RuntimeError):
+            game.display.get_mouse_click()
+
+    def test_seeded_rng(self):
+        def snapshot(game: Game):
+            return ([[c.name for c in pile] for pile in game.cardPiles],
+                    [e.name for e in game.eventCards],
+                    [(l.name, l.diceNumber) for l in game.landscapeCards],
+                    [game.throw_yield_dice() for _ in range(10)],
+                    [game.throw_event_dice() for _ in range(10)])
+
+        game1 = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=42)
+        game2 = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=42)
+        self.assertEqual(game1.seed, 42)
+        self.assertEqual(snapshot(game1), snapshot(game2))
+
+        game3 = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=42, stream=1)
+        game4 = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=42, stream=2)
+        self.assertNotEqual(snapshot(game3), snapshot(game4))
+
+        # unseeded games pick a seed that can be used to replay them
+        game5 = Game(ComputerPlayer, ComputerPlayer, headless=True)
+        game6 = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=game5.seed)
+        self.assertEqual(snapshot(game5), snapshot(game6))
+
+    def test_observe_before_trades(self):
+        # a build needing bank trades is observed in the position it was decided in, before the trades
+        from enums import ActionType
+        from player import INFRA_ACTIONS
+        costs = {action: infraType.cost for infraType, action in INFRA_ACTIONS.items()}
+        observed = []
+
+        def on_move(game: Game, player, move) -> None:
+            if move[0] in costs:
+                observed.append(player.can_cover_cost(costs[move[0]]))
+            elif move[0] == ActionType.BUILD_FROM_HAND:
+                observed.append(player.can_cover_cost(game.playableCardsById[move[1]].cost))
+
+        for seed in range(3):
+            Game(ComputerPlayer, ComputerPlayer, headless=True, seed=seed).play(maxRounds=100, onMove=on_move)
+        self.assertIn(True, observed)
+        self.assertIn(False, observed)
+
+    def test_decision_deadlines(self):
+        # every decision gets a deadline from the game, not only the action phase
+        names = ['select_pile', 'select_card_to_throw_away', 'select_card_to_pay',
+                 'decide_use_scout', 'select_new_land', 'pick_any_resource', 'grab_any_resource_if_possible',
+                 'select_resource_to_trade_for', 'select_resource_to_purchase']
+        deadlines = {name: [] for name in names}
+
+        def record(name, method):
+            def decide(*args, deadline=None):
+                deadlines[name].append(deadline)
+                return method(*args, deadline=deadline)
+            return decide
+
+        for seed in range(3):
+            game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=seed, decisionTime=10)
+            for player in [game.player1, game.player2]:
+                for name in names:
+                    setattr(player, name, record(name, getattr(player, name)))
+            game.play(maxRounds=100)
+        for name in names:
+            self.assertTrue(deadlines[name], name)
+            self.assertNotIn(None, deadlines[name], name)
+
+    def test_lazy_display_import(self):
+        # importing the game and playing headless must not pull in pygame
+        code = 'import sys, game; ' \
+               'game.Game(game.ComputerPlayer, game.ComputerPlayer, headless=True); ' \
+               'sys.exit("pygame" in sys.modules or "display_handler" in sys.modules)'
+        result = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(sys.modules[Game.__module__].__file__)))
+        self.assertEqual(result.returncode, 0)
@@ -0,0 +1,215 @@
+import unittest
+from random import Random
+
+from computer_player import ComputerPlayer
+from game import Game
+from game_state import GameState, PLAYABLE_CARDS, LAND_CARDS, EMPTY, VILLAGE, PATH, SLOT, TOWN, LAND_BASE, PLAYABLE_BASE, \
+    is_land
+from helpers import create_game
+from rules import play_turn
+
+
+class TestStack(unittest.TestCase):
+    def test_catalog(self):
+        self.assertEqual(len(PLAYABLE_CARDS), 62)
+        self.assertEqual(len(LAND_CARDS), 23)
+        self.assertEqual([card.cardId for card in PLAYABLE_CARDS], list(range(62)))
+
+        game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=1)
+        self.assertEqual([card.cardId for card in game.playableCardsById], list(range(62)))
+        self.assertEqual([card.name for card in game.playableCardsById], [card.name for card in PLAYABLE_CARDS])
+        self.assertEqual([(card.name, card.diceNumber) for card in game.landscapeCardsById],
+                         [(name, dice) for name, _, dice, _ in LAND_CARDS])
+
+    def test_initial_state(self):
+        game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=1)
+        state = game.get_state()
+
+        self.assertEqual(state.midRows, (8, 2))
+        self.assertEqual(state.current, 0)
+        self.assertEqual(state.roundNo, 1)
+        self.assertEqual(state.get_square(6, 8), PATH)
+        self.assertEqual(state.get_square(5, 8), VILLAGE)
+        self.assertEqual(state.get_square(7, 2), VILLAGE)
+        self.assertEqual(state.get_square(5, 7), SLOT)
+        self.assertTrue(LAND_BASE <= state.get_square(6, 7) < PLAYABLE_BASE)
+        self.assertEqual(len(state.landDeck), 11)
+        self.assertEqual(sum(map(len, state.piles)), 62)
+        self.assertEqual(len(state.events), 10)
+
+        for player in [0, 1]:
+            self.assertEqual(len(list(state.get_lands(player))), 6)
+            self.assertEqual(state.get_victory_points(player), 2)
+
+    def test_round_trip(self):
+        for seed in range(5):
+            game = create_game(seed, 40)
+            state = game.get_state()
+            self.assertEqual(state, state.clone())
+
+            for player, playerIdx in [(game.player1, 0), (game.player2, 1)]:
+                self.assertEqual(state.get_victory_points(playerIdx), player.get_victory_points())
+                self.assertEqual(state.get_trade_strength(playerIdx), player.get_trade_strength())
+                self.assertEqual(state.get_battle_strength(playerIdx), player.get_battle_strength())
+                self.assertEqual(state.get_tournament_strength(playerIdx), player.get_tournament_strength())
+                available = player.get_resources_available()
+                for resource, cnt in state.get_resources_available(playerIdx).items():
+                    self.assertEqual(available.get(resource), cnt)
+
+            # the state can be loaded into any game, all games share the card ids
+            other = create_game(seed + 100, 10)
+            other.set_state(state)
+            self.assertEqual(other.get_state(), state)
+            self.assertEqual(other.player1.get_victory_points(), game.player1.get_victory_points())
+            self.assertEqual(len(other.player2.settlements), len(game.player2.settlements))
+            for settlement in other.player1.settlements + other.player2.settlements:
+                self.assertEqual(len(settlement.cards), 2 if settlement.name == 'village' else 4)
+                for card in settlement.cards:
+                    self.assertIs(card.settlement, settlement)
+
+            # and the game goes on from there
+            other.play(maxRounds=60)
+
+    def test_clone_is_independent(self):
+        state = create_game(3, 20).get_state()
+        clone = state.clone()
+        clone.board[0][0] = TOWN
+        clone.hands[0].append(5)
+        clone.piles[1].pop()
+        clone.landHeld[0] += 1
+        self.assertNotEqual(state, clone)
+        self.assertNotEqual(state.board, clone.board)
+        self.assertNotEqual(state.hands, clone.hands)
+        self.assertNotEqual(state.piles, clone.piles)
+
+    def test_fork(self):
+        state = create_game(4, 20).get_state()
+        original = state.clone()
+        child = state.fork()
+        self.assertEqual(child, state)
+
+        # nothing is copied until something changes
+        self.assertIs(child.board, state.board)
+        self.assertIs(child.hands, state.hands)
+        self.assertIs(child.piles, state.piles)
+
+        child.set_square(3, 8, TOWN)
+        self.assertIsNot(child.board[8], state.board[8])
+        for y in range(len(state.board)):
+            if y != 8:
+                self.assertIs(child.board[y], state.board[y])
+
+        card = child.take_from_pile(2)
+        child.add_to_hand(1, card)
+        self.assertIs(child.piles[0], state.piles[0])
+        self.assertIsNot(child.piles[2], state.piles[2])
+        self.assertIs(child.hands[0], state.hands[0])
+        self.assertIsNot(child.hands[1], state.hands[1])
+
+        child.set_land_held(0, 3)
+        child.use_infra(0)
+        child.draw_event()
+        child.end_turn()
+        self.assertEqual(state, original)
+        self.assertNotEqual(child, original)
+
+        # the parent copies on write as well, its changes are not seen by the child
+        childCopy = child.clone()
+        state.set_square(3, 8, VILLAGE)
+        state.remove_from_hand(0, state.hands[0][0])
+        state.put_to_pile(2, 0)
+        self.assertEqual(child, childCopy)
+
+        # forks of forks
+        grandchild = child.fork()
+        grandchild.set_square(4, 8, PATH)
+        self.assertEqual(child, childCopy)
+        self.assertEqual(grandchild.get_square(3, 8), TOWN)
+        self.assertEqual(grandchild.get_square(4, 8), PATH)
+
+    def test_place_land(self):
+        state = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=1).get_state()
+        child = state.fork()
+        land = child.landDeck[-1]
+        child.place_land(land, 0, 2, 7)
+
+        self.assertEqual(child.get_square(2, 7), LAND_BASE + land)
+        self.assertEqual(child.landOwner[land], 0)
+        self.assertEqual(child.landPos[land], 2 + 7 * 13)
+        self.assertNotIn(land, child.landDeck)
+        self.assertIn(land, state.landDeck)
+        self.assertEqual(state.landOwner[land], -1)
+
+    def test_incremental_hash(self):
+        state = create_game(6, 30).get_state()
+        self.assertEqual(state.zobrist, create_game(6, 30).get_state().zobrist)
+        rng = Random(1)
+
+        for _ in range(300):
+            child = state.fork()
+            action = rng.randrange(7)
+            if action == 0:
+                child.set_square(rng.randrange(13), rng.randrange(11), rng.randrange(PLAYABLE_BASE))
+            elif action == 1:
+                child.set_land_held(rng.randrange(len(LAND_CARDS)), rng.randrange(4))
+            elif action == 2:
+                pile = rng.randrange(len(child.piles))
+                if child.piles[pile]:
+                    child.add_to_hand(0, child.take_from_pile(pile, rng.randrange(min(2, len(child.piles[pile])))))
+            elif action == 3 and child.hands[0]:
+                card = rng.choice(child.hands[0])
+                child.remove_from_hand(0, card)
+                child.put_to_pile(rng.randrange(len(child.piles)), card)
+            elif action == 4:
+                child.draw_event()
+            elif action == 5:
+                child.end_turn()
+            else:
+                child.shuffle_events(rng)
+
+            expected = child.clone()
+            expected.rehash()
+            self.assertEqual(child.zobrist, expected.zobrist)
+            self.assertEqual(state.zobrist != child.zobrist, state != child)
+            state = child
+
+    def test_incremental_features(self):
+        # the evaluation terms kept up to date by the mutators are the ones counted from scratch
+        state = create_game(8, 20).get_state()
+        rng = Random(2)
+        mills = [PLAYABLE_BASE + card.cardId for card in PLAYABLE_CARDS if card.name.endswith('mill')]
+        for _ in range(40):
+            child = state.fork()
+            if rng.randrange(2):
+                play_turn(child, rng)
+            else:
+                # a mill next to some land or the card it replaces taken away
+                y = child.midRows[rng.randrange(2)] + rng.choice([-2, -1, 1, 2])
+                x = rng.randrange(13)
+                if not is_land(child.get_square(x, y)):
+                    child.set_square(x, y, rng.choice(mills + [EMPTY]))
+            expected = child.clone()
+            expected.rehash()
+            self.assertEqual(child.features, expected.features)
+            state = child
+
+        game = create_game(9, 40)
+        state = game.get_state()
+        for player, playerIdx in [(game.player1, 0), (game.player2, 1)]:
+            self.assertEqual([state.get_land_yield(land.cardId) for land in player.landscapeCards],
+                             [game.get_land_yield(land) for land in player.landscapeCards])
+            self.assertEqual(state.get_resources_total(playerIdx),
+                             sum(land.resourcesHeld for land in player.landscapeCards))
+
+    def test_hash_transposition(self):
+        # the same position reached in a different order has the same hash
+        state = create_game(7, 20).get_state()
+        first, second = state.fork(), state.fork()
+        first.set_land_held(0, 2)
+        first.set_square(3, 8, TOWN)
+        second.set_square(3, 8, TOWN)
+        second.set_land_held(0, 2)
+        self.assertEqual(first.zobrist, second.zobrist)
+        self.assertNotEqual(first.zobrist, state.zobrist)
+        first.end_turn()
+        self.assertNotEqual(first.zobrist, second.zobrist)
@@ -0,0 +1,76 @@
+import os, tempfile, unittest
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import partial
+
+from card_data import CardData
+from computer_player import ComputerPlayer
+from game import Game
+from heuristics import HeuristicParams, DEFAULT_PARAMS, PARAM_NAMES, get_card_priority
+from tuning import Evaluation, evaluate_candidates, play_match, tune, save_params, load_params
+
+
+class TestStack(unittest.TestCase):
+    def test_params(self):
+        self.assertEqual(HeuristicParams.from_vector(DEFAULT_PARAMS.to_vector()), DEFAULT_PARAMS)
+        params = replace(DEFAULT_PARAMS, millPriority=-1.5, townOrder=3)
+        self.assertEqual(HeuristicParams.from_dict(params.to_dict()), params)
+        self.assertEqual(HeuristicParams.from_dict({'millPriority': -1.5, 'townOrder': 3}), params)
+        self.assertRaises(ValueError, HeuristicParams.from_dict, {'milPriority': -1.5})
+        self.assertRaises(ValueError, HeuristicParams.from_vector, [1.0])
+        self.assertEqual(len(params.to_vector()), len(PARAM_NAMES))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'params.json')
+            save_params(params, path)
+            self.assertEqual(load_params(path), params)
+
+    def test_priorities(self):
+        cards = {card.name: card for card in CardData.create_playable_catalog()}
+        self.assertEqual(get_card_priority(cards['warehouse']), 5)
+        self.assertEqual(get_card_priority(cards['scout']), 4)
+        self.assertEqual(get_card_priority(cards['smithy']), 1)
+        params = replace(DEFAULT_PARAMS, warehousePriority=-3)
+        self.assertEqual(get_card_priority(cards['warehouse'], params), -3)
+
+    def test_params_change_game(self):
+        def play(first, second):
+            game = Game(first, second, headless=True, seed=3)
+            game.play(maxRounds=15)
+            return game.get_state().zobrist
+
+        # the default params are the ones ComputerPlayer always played by
+        self.assertEqual(play(partial(ComputerPlayer, params=DEFAULT_PARAMS), ComputerPlayer),
+                         play(ComputerPlayer, ComputerPlayer))
+        params = replace(DEFAULT_PARAMS, villageOrder=-1, cardOrder=-1, millPriority=-2, warehousePriority=-2)
+        self.assertNotEqual(play(partial(ComputerPlayer, params=params), ComputerPlayer),
+                            play(ComputerPlayer, ComputerPlayer))
+
+    def test_early_stopping(self):
+        evaluation = Evaluation(DEFAULT_PARAMS)
+        for score in [0.0, 1.0, 0.5, 1.0]:
+            evaluation.add(score)
+        self.assertEqual(evaluation.get_score(), 0.625)
+        low, high = evaluation.get_interval()
+        self.assertTrue(0 <= low < 0.625 < high <= 1)
+
+        # the candidate sits first in the even games and second in the odd ones
+        for gameNo in range(2):
+            game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=5, stream=gameNo)
+            winner = game.play(100)
+            self.assertIsNotNone(winner)
+            self.assertEqual(play_match(DEFAULT_PARAMS, DEFAULT_PARAMS, 5, gameNo, 100),
+                             float((winner is game.player1) == (gameNo == 0)))
+        # a score above 1 cannot be reached -> the candidates stop after their first batch
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            evaluations = evaluate_candidates(executor, [DEFAULT_PARAMS, DEFAULT_PARAMS], DEFAULT_PARAMS, 5,
+                                              maxGames=8, batchSize=2, maxRounds=100, bestScore=1.5)
+        self.assertEqual([(evaluation.games, evaluation.stopped) for evaluation in evaluations], [(2, True), (2, True)])
+
+    def test_tune(self):
+        for method in ['random', 'es']:
+            generations = []
+            best = tune(method, generations=2, populationSize=2, workers=1, seed=1, maxGames=4, batchSize=2,
+                        maxRounds=60, onGeneration=lambda generation, evaluations, best: generations.append(generation))
+            self.assertEqual(generations, [0, 1])
+            self.assertIsInstance(best.params, HeuristicParams)
+            self.assertEqual(best.games, 4)
@@ -0,0 +1,71 @@
+import unittest
+from random import Random
+
+from computer_player import ComputerPlayer
+from game import Game
+from ismcts import IsmctsSearch, determinize
+from move_generator import END_TURN_MOVE
+from rules import generate_turn_moves, apply_turn_move
+
+
+class TestStack(unittest.TestCase):
+    def setUp(self):
+        game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=2)
+        game.play(maxRounds=10)
+        self.state = game.get_state()
+
+    def test_determinize(self):
+        state = self.state
+        observer = state.current
+        seen = state.events[-3:]
+        rng = Random(1)
+        orders = set()
+        for _ in range(20):
+            determinized = determinize(state, observer, rng, seen)
+            self.assertEqual(determinized.board, state.board)
+            self.assertEqual(determinized.landHeld, state.landHeld)
+            self.assertEqual(determinized.hands[observer], state.hands[observer])
+            # the same hidden cards in the same amounts, somewhere else
+            self.assertEqual(len(determinized.hands[1 - observer]), len(state.hands[1 - observer]))
+            self.assertEqual([len(pile) for pile in determinized.piles], [len(pile) for pile in state.piles])
+            self.assertEqual(sorted(determinized.hands[1 - observer] + sum(determinized.piles, [])),
+                             sorted(state.hands[1 - observer] + sum(state.piles, [])))
+            self.assertEqual(sorted(determinized.events), sorted(state.events))
+            self.assertEqual(determinized.events[-3:], seen)
+            orders.add(tuple(determinized.hands[1 - observer]))
+
+            check = determinized.clone()
+            check.rehash()
+            self.assertEqual(determinized.zobrist, check.zobrist)
+            # the observer cannot tell the determinizations apart
+            self.assertEqual(determinized.get_observed_hash(observer), state.get_observed_hash(observer))
+            self.assertNotEqual(determinized.get_observed_hash(1 - observer), state.get_observed_hash(1 - observer))
+        self.assertGreater(len(orders), 1)
+        self.assertIsNot(determinized.hands, state.hands)
+
+    def test_search(self):
+        search = IsmctsSearch(Random(2), determinizationsCnt=4)
+        search.set_root(self.state, seenEvents=self.state.events[-2:])
+        stats = search.run(iterations=60)
+        self.assertEqual(stats.iterations, 60)
+        self.assertEqual(len(search.determinizations), 4)
+        self.assertEqual(sum(visits for visits, _ in search.get_root_stats().values()), 60)
+        self.assertIn(search.best_move(), generate_turn_moves(self.state))
+
+    def test_reuse(self):
+        # the tree is of information sets, the subtree is found whatever the hidden cards are
+        for land in self.state.get_lands(self.state.current):
+            self.state.set_land_held(land, 3)
+        search = IsmctsSearch(Random(3), determinizationsCnt=4)
+        search.set_root(self.state)
+        search.run(iterations=80)
+        move = search.best_move()
+        self.assertNotEqual(move, END_TURN_MOVE)
+        child = search.root.children[move]
+        state = determinize(self.state, self.state.current, Random(4))
+        apply_turn_move(state, move)
+        search.set_root(state, 1, reuse=True)
+        self.assertIs(search.root, child)
+        self.assertEqual(len(search.determinizations), 4)
+        self.assertTrue(all(determinized.get_observed_hash(search.observer) == child.key
+                            for determinized in search.determinizations))
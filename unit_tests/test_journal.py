@@ -0,0 +1,146 @@
+import unittest
+
+from card import Village, Town, Buildable
+from config import MAX_LAND_RESOURCES
+from computer_player import ComputerPlayer
+from game import Game
+from journal import Journal, NullJournal
+
+
+class Item:
+    def __init__(self, value: int):
+        self.value = value
+
+
+class TestStack(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=3)
+        self.game.play(maxRounds=30)
+        self.game.journal = Journal()
+
+    def assert_undone(self, mark: int, before) -> None:
+        self.game.journal.undo(mark)
+        self.assertEqual(self.game.get_state(), before)
+        self.assertEqual(self.game.journal.mark(), mark)
+
+    def test_primitives(self):
+        journal = Journal()
+        item, lst, dct = Item(1), [1, 2, 3], {'a': 1}
+
+        journal.set_attr(item, 'value', 5)
+        mark = journal.mark()
+        journal.append(lst, 4)
+        journal.remove(lst, 2)
+        self.assertEqual(journal.pop(lst, 0), 1)
+        journal.set_item(dct, 'a', 7)
+        self.assertEqual((item.value, lst, dct), (5, [3, 4], {'a': 7}))
+
+        journal.undo(mark)
+        self.assertEqual((item.value, lst, dct), (5, [1, 2, 3], {'a': 1}))
+        journal.undo()
+        self.assertEqual(item.value, 1)
+        self.assertEqual(journal.entries, [])
+
+    def test_null_journal(self):
+        journal = NullJournal()
+        item, lst = Item(1), [1, 2]
+        journal.set_attr(item, 'value', 2)
+        journal.append(lst, 3)
+        journal.remove(lst, 1)
+        self.assertEqual((item.value, lst, journal.entries), (2, [2, 3], []))
+        self.assertRaises(RuntimeError, journal.undo)
+
+    def player_pay_all(self, player) -> None:
+        player.pay(sum(land.resourcesHeld for land in player.landscapeCards))
+
+    def test_undo_land_changes(self):
+        before = self.game.get_state()
+        mark = self.game.journal.mark()
+        for number in range(1, 7):
+            self.game.land_yield(number)
+        self.game.card_event_rich_year()
+        self.game.card_event_plaque()
+        self.player_pay_all(self.game.currentPlayer)
+        self.assertNotEqual(self.game.get_state(), before)
+        self.assert_undone(mark, before)
+
+    def test_undo_resource_moves(self):
+        # the resources moved by action cards and bank trades go through the journal as well
+        for player in [self.game.player1, self.game.player2]:
+            for idx, land in enumerate(player.landscapeCards):
+                land.resourcesHeld = MAX_LAND_RESOURCES if idx == 0 else 1
+        before = self.game.get_state()
+        player = self.game.currentPlayer
+        player.play_action_card_caravan()
+        self.assertNotEqual(self.game.get_state(), before)
+        self.assert_undone(0, before)
+
+        player.play_action_card_ambush()
+        player.play_action_card_trader()
+        land = player.landscapeCards[0]
+        for _ in range(MAX_LAND_RESOURCES - land.resourcesHeld):
+            player.move_resource(None, land)
+        other = next(other for other in player.landscapeCards
+                     if other.resource != land.resource and other.resourcesHeld < MAX_LAND_RESOURCES)
+        player.tradePlan = [(land.resource, other.resource)]
+        player.trade()
+        self.assertEqual(player.tradePlan, [])
+        player.lose_ambush_resources()
+        self.assertNotEqual(self.game.get_state(), before)
+        self.assert_undone(0, before)
+
+    def test_undo_building(self):
+        player = self.game.currentPlayer
+        before = self.game.get_state()
+        settlements, lands, deck = player.settlements[:], player.landscapeCards[:], self.game.landscapeCards[:]
+
+        villagePos = player.select_new_card_position(Village)
+        assert villagePos is not None
+        player.place_village_to_board(villagePos)
+        player.place_new_land(villagePos)
+        village = self.game.mainBoard.get_square(villagePos)
+        player.place_town_to_board(villagePos)
+        self.assertIsInstance(village, Town)
+
+        self.assert_undone(0, before)
+        self.assertEqual((player.settlements, player.landscapeCards, self.game.landscapeCards),
+                         (settlements, lands, deck))
+        self.assertNotIsInstance(village, Town)
+
+        town = player.settlements[0]
+        cards = town.cards[:]
+        player.place_town_to_board(town.pos)
+        self.assertIsInstance(town, Town)
+        self.assert_undone(0, before)
+        self.assertIs(type(town), Village)
+        self.assertEqual(town.name, 'village')
+        self.assertEqual(town.cards, cards)
+
+    def test_undo_card_play(self):
+        # a fresh game still has free slots next to the starting villages
+        self.game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=3)
+        self.game.journal = Journal()
+        player = self.game.currentPlayer
+        for land in player.landscapeCards:
+            land.resourcesHeld = 3
+        pile = self.game.cardPiles[0]
+        card = next(card for card in pile if isinstance(card, Buildable) and not getattr(card, 'townOnly', False))
+        pile.remove(card)
+        player.cardsInHand.append(card)
+        before = self.game.get_state()
+        hand = player.cardsInHand[:]
+
+        pos = player._find_pos_for_building(card)
+        assert pos is not None
+        slot = self.game.mainBoard.get_square(pos)
+        player.play_card_from_hand(card, pos)
+        self.assertIs(card.player, player)
+        player.take_back_to_hand(card)
+        player.play_card_from_hand(card, pos)
+
+        self.assert_undone(0, before)
+        self.assertEqual(player.cardsInHand, hand)
+        self.assertIs(self.game.mainBoard.get_square(pos), slot)
+        self.assertIn(slot, slot.settlement.cards)
+        self.assertIsNone(card.player)
+        self.assertIsNone(card.pos)
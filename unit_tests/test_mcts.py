@@ -0,0 +1,168 @@
+import unittest
+from functools import partial
+from random import Random
+from time import perf_counter
+from unittest.mock import patch
+
+from computer_player import ComputerPlayer
+from enums import ActionType
+from game import Game
+from game_state import EVENT_TYPES, BOARD_WIDTH, VILLAGE, TOWN, PATH
+from evaluation import evaluate
+from mcts import MctsSearch
+from mcts_player import MctsPlayer
+from move_generator import END_TURN_MOVE
+from rules import generate_turn_moves, apply_turn_move
+
+
+class TestStack(unittest.TestCase):
+    def setUp(self):
+        self.state = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=1).get_state()
+
+    def test_budget(self):
+        search = MctsSearch(Random(1))
+        search.set_root(self.state)
+        stats = search.run(iterations=50)
+        self.assertEqual(stats.iterations, 50)
+        self.assertGreater(stats.iterationsPerSecond, 0)
+        self.assertEqual(sum(visits for visits, _ in search.get_root_stats().values()), 50)
+        self.assertIn(search.best_move(), generate_turn_moves(self.state))
+
+        stats = search.run(timeLimit=0.05)
+        self.assertGreater(stats.iterations, 0)
+        self.assertLess(stats.elapsed, 0.5)
+
+    def test_deadline(self):
+        # a passed deadline stops the search before any iteration, a later one bounds the latency
+        search = MctsSearch(Random(1))
+        search.set_root(self.state)
+        stats = search.run(iterations=10 ** 6, deadline=perf_counter() - 1)
+        self.assertEqual(stats.iterations, 0)
+        self.assertEqual(search.best_move(), END_TURN_MOVE)
+
+        start = perf_counter()
+        stats = search.run(iterations=10 ** 6, timeLimit=10, deadline=start + 0.05)
+        self.assertGreater(stats.iterations, 0)
+        self.assertLess(perf_counter() - start, 0.5)
+        self.assertIn(search.best_move(), generate_turn_moves(self.state))
+
+    def test_player_deadline(self):
+        # every action phase ends in time even with a budget far too big for it
+        game = Game(partial(MctsPlayer, iterations=10 ** 6), ComputerPlayer, headless=True, seed=6,
+                    decisionTime=0.05)
+        game.play(maxRounds=6)
+        player = game.player1
+        assert isinstance(player, MctsPlayer)
+        self.assertLess(player.lastStats.elapsed, 0.5)
+
+        for land in player.landscapeCards:
+            land.resourcesHeld = 3
+        player.reuseTree = False
+        start = perf_counter()
+        move = player.search_move(0, perf_counter() - 1)
+        self.assertLess(perf_counter() - start, 0.5)
+        self.assertEqual(player.lastStats.iterations, 0)
+        self.assertIn(move, generate_turn_moves(game.get_state()))
+        self.assertNotEqual(move, END_TURN_MOVE)
+
+    def test_winning_move(self):
+        # one more victory point wins, only the town gives it in this turn
+        state = self.state
+        for x, code in [(1, VILLAGE), (3, TOWN), (5, TOWN), (7, TOWN), (9, TOWN), (11, TOWN)]:
+            state.set_square(x, 8, code)
+        for x in range(0, BOARD_WIDTH, 2):
+            state.set_square(x, 8, PATH)
+        for card in list(state.hands[0]):
+            state.remove_from_hand(0, card)
+        for land in state.get_lands(0):
+            state.set_land_held(land, 3)
+        self.assertEqual(state.get_victory_points(0), 11)
+        self.assertGreater(evaluate(state), 0.5)
+
+        search = MctsSearch(Random(2))
+        search.set_root(state)
+        search.run(iterations=300)
+        self.assertEqual(search.best_move(), (ActionType.BUILD_TOWN, -1, 1 + 8 * BOARD_WIDTH))
+
+    def test_reuse(self):
+        for land in self.state.get_lands(0):
+            self.state.set_land_held(land, 3)
+        search = MctsSearch(Random(5))
+        search.set_root(self.state)
+        search.run(iterations=100)
+        move = search.best_move()
+        child = search.root.children[move]
+
+        state = self.state.fork()
+        apply_turn_move(state, move)
+        search.set_root(state, 1, reuse=True)
+        self.assertIs(search.root, child)
+        self.assertGreater(search.root.visits, 0)
+        search.run(iterations=20)
+        self.assertEqual(search.root.visits, child.visits)
+
+        # a position the tree does not know starts a new tree
+        other = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=9).get_state()
+        search.set_root(other, reuse=True)
+        self.assertEqual(search.root.visits, 0)
+        search.set_root(state, 1)
+        self.assertEqual(search.root.visits, 0)
+
+        # the tree is not searched for the root after the deadline
+        search = MctsSearch(Random(5))
+        search.set_root(self.state)
+        search.run(iterations=100)
+        with patch('mcts.FIND_CHECK_NODES', 1):
+            search.set_root(state, 1, reuse=True, deadline=perf_counter() - 1)
+        self.assertEqual(search.root.visits, 0)
+
+    def test_no_moves(self):
+        for land in range(len(self.state.landHeld)):
+            self.state.set_land_held(land, 0)
+        search = MctsSearch(Random(3))
+        search.set_root(self.state)
+        search.run(iterations=10)
+        self.assertEqual(search.best_move(), END_TURN_MOVE)
+
+    def test_player(self):
+        game = Game(partial(MctsPlayer, iterations=5), ComputerPlayer, headless=True, seed=4)
+        game.play(maxRounds=40)
+        player = game.player1
+        assert isinstance(player, MctsPlayer)
+        self.assertGreater(player.totalIterations, 0)
+        self.assertIsNotNone(player.lastStats)
+        self.assertIsNotNone(player.search)
+        self.assertGreater(player.get_iterations_per_second(), 0)
+        # the search does not touch the game dice, the same seed plays the same game
+        replay = Game(partial(MctsPlayer, iterations=5), ComputerPlayer, headless=True, seed=4)
+        replay.play(maxRounds=40)
+        self.assertEqual(replay.get_state().zobrist, game.get_state().zobrist)
+
+    def test_observed_state(self):
+        # the searched moves are observed with the state the player searched, it is the position before the move
+        observed = []
+
+        def on_move(game: Game, player, move) -> None:
+            if player is game.player1 and move[0] not in [ActionType.END_TURN, ActionType.ACTION_CARD]:
+                observed.append(game.observedState)
+                self.assertEqual(game.get_observed_state(), game.get_state())
+
+        Game(partial(MctsPlayer, iterations=5), ComputerPlayer, headless=True, seed=4).play(maxRounds=20,
+                                                                                           onMove=on_move)
+        self.assertTrue(observed)
+        self.assertNotIn(None, observed)
+
+    def test_seen_events(self):
+        # the player remembers the drawn events, new_year shuffles the deck and the memory is gone
+        game = Game(MctsPlayer, ComputerPlayer, headless=True, seed=5)
+        player = game.player1
+        assert isinstance(player, MctsPlayer)
+        for _ in range(len(game.eventCards) + 3):
+            drawn = game.eventCards[0].name
+            game.card_event()
+            events = [EVENT_TYPES[event.name] for event in game.eventCards]
+            if drawn == 'new_year':
+                self.assertEqual(player.seenEvents, [])
+            else:
+                self.assertGreater(len(player.seenEvents), 0)
+                self.assertEqual(events[-len(player.seenEvents):], player.seenEvents[-len(events):])
@@ -0,0 +1,124 @@
+import unittest
+
+from card import Action, Building, Village, Town, Path
+from computer_player import ComputerPlayer
+from enums import ActionType
+from game import Game
+from game_state import PLAYABLE_CARDS, PLAYABLE_BASE, BOARD_WIDTH, SLOT, PATH, TOWN, VILLAGE_IDX
+from move_generator import generate_moves, get_trade_rates, RESOURCES, GOLD_IDX, END_TURN_MOVE
+
+
+def index(x: int, y: int) -> int:
+    return x + y * BOARD_WIDTH
+
+def find_card(name: str) -> int:
+    return next(card for card, playable in enumerate(PLAYABLE_CARDS) if playable.name == name)
+
+def moves_of(moves, actionType: ActionType):
+    return [move for move in moves if move[0] == actionType]
+
+
+class TestStack(unittest.TestCase):
+    def setUp(self):
+        self.state = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=1).get_state()
+        # enough of everything for any building
+        for land in self.state.get_lands(0):
+            self.state.set_land_held(land, 3)
+
+    def test_nothing_affordable(self):
+        for land in range(len(self.state.landHeld)):
+            self.state.set_land_held(land, 0)
+        self.assertEqual(generate_moves(self.state), [END_TURN_MOVE])
+
+    def test_infrastructure(self):
+        # player1 starts with villages at (5, 8) and (7, 8) around the path at (6, 8)
+        moves = generate_moves(self.state)
+        self.assertEqual(moves[-1], END_TURN_MOVE)
+        self.assertEqual(moves_of(moves, ActionType.BUILD_TOWN),
+                         [(ActionType.BUILD_TOWN, -1, index(5, 8)), (ActionType.BUILD_TOWN, -1, index(7, 8))])
+        self.assertEqual(moves_of(moves, ActionType.BUILD_PATH),
+                         [(ActionType.BUILD_PATH, -1, index(4, 8)), (ActionType.BUILD_PATH, -1, index(8, 8))])
+        self.assertEqual(moves_of(moves, ActionType.BUILD_VILLAGE), [])
+
+        self.state.set_square(4, 8, PATH)
+        villages = moves_of(generate_moves(self.state), ActionType.BUILD_VILLAGE)
+        self.assertEqual(villages, [(ActionType.BUILD_VILLAGE, -1, index(3, 8))])
+
+        while self.state.infraLeft[VILLAGE_IDX]:
+            self.state.use_infra(VILLAGE_IDX)
+        self.assertEqual(moves_of(generate_moves(self.state), ActionType.BUILD_VILLAGE), [])
+
+        # the opponent builds on its own row
+        for land in self.state.get_lands(1):
+            self.state.set_land_held(land, 3)
+        self.assertEqual(moves_of(generate_moves(self.state, 1), ActionType.BUILD_TOWN),
+                         [(ActionType.BUILD_TOWN, -1, index(5, 2)), (ActionType.BUILD_TOWN, -1, index(7, 2))])
+
+    def test_build_from_hand(self):
+        knight = find_card('hubert')
+        spa = find_card('spa')
+        self.state.add_to_hand(0, knight)
+        self.state.add_to_hand(0, spa)
+
+        builds = moves_of(generate_moves(self.state), ActionType.BUILD_FROM_HAND)
+        slots = [index(5, 7), index(5, 9), index(7, 7), index(7, 9)]
+        self.assertEqual(builds, [(ActionType.BUILD_FROM_HAND, knight, pos) for pos in slots])
+
+        # town only buildings need a town, towns have four slots
+        self.state.set_square(7, 8, TOWN)
+        self.state.set_square(7, 6, SLOT)
+        self.state.set_square(7, 10, SLOT)
+        builds = moves_of(generate_moves(self.state), ActionType.BUILD_FROM_HAND)
+        townSlots = [index(7, 7), index(7, 9), index(7, 6), index(7, 10)]
+        self.assertEqual([move for move in builds if move[1] == spa],
+                         [(ActionType.BUILD_FROM_HAND, spa, pos) for pos in townSlots])
+        self.assertEqual(len([move for move in builds if move[1] == knight]), 6)
+
+    def test_trade_and_actions(self):
+        arson, bishop = find_card('arson'), find_card('bishop')
+        self.state.add_to_hand(0, arson)
+        self.state.add_to_hand(0, bishop)
+        moves = generate_moves(self.state)
+        self.assertEqual(moves_of(moves, ActionType.ACTION_CARD), [(ActionType.ACTION_CARD, arson, -1)])
+        # full lands cannot receive anything
+        self.assertEqual(moves_of(moves, ActionType.BANK_TRADE), [])
+
+        land = next(self.state.get_lands(0))
+        self.state.set_land_held(land, 0)
+        trades = moves_of(generate_moves(self.state), ActionType.BANK_TRADE)
+        self.assertEqual(len(trades), len(RESOURCES) - 1)
+        self.assertTrue(all(move[1] == land for move in trades))
+
+        mint = find_card('mint')
+        self.assertEqual(get_trade_rates(self.state, 0)[GOLD_IDX], 3)
+        self.state.set_square(7, 7, PLAYABLE_BASE + mint)
+        self.assertEqual(get_trade_rates(self.state, 0)[GOLD_IDX], 1)
+
+    def test_computer_choices_are_legal(self):
+        # whatever the computer player builds during a game has to be among the generated moves
+        for seed in range(3):
+            game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=seed)
+            for player in [game.player1, game.player2]:
+                player.initial_land_setup()
+                player.pick_starting_cards()
+
+            for _ in range(40):
+                player = game.currentPlayer
+                player.throw_dice()
+                playerIdx = game.get_player_idx(player)
+                moves = set(generate_moves(game.get_state(), playerIdx))
+                for infraType, actionType in [(Village, ActionType.BUILD_VILLAGE), (Town, ActionType.BUILD_TOWN),
+                                              (Path, ActionType.BUILD_PATH)]:
+                    pos = player.select_new_card_position(infraType)
+                    if pos is not None and player._can_build(infraType) and player.can_cover_cost(infraType.cost):
+                        self.assertIn((actionType, -1, index(pos.x, pos.y)), moves)
+                for card in player.cardsInHand:
+                    if isinstance(card, Action) and card.name in ['spy', 'arson']:
+                        self.assertIn((ActionType.ACTION_CARD, card.cardId, -1), moves)
+                    elif isinstance(card, Building) and player.can_cover_cost(card.cost):
+                        pos = player._find_pos_for_building(card)
+                        if pos is not None:
+                            self.assertIn((ActionType.BUILD_FROM_HAND, card.cardId, index(pos.x, pos.y)), moves)
+                player.do_actions()
+                player.refill_hand()
+                game.currentPlayer = player.opponent
@@ -0,0 +1,62 @@
+import os, tempfile, unittest
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from book_builder import build_land_book, build_hand_book, get_land_candidates, get_hand_candidates
+from computer_player import ComputerPlayer
+from game import Game
+from opening_book import OpeningBook, get_card_class, get_hand_key, get_land_key
+
+
+class TestStack(unittest.TestCase):
+    def test_lands(self):
+        game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=1)
+        player = game.player2
+        key = get_land_key(player.landscapeCards)
+        arrangement = tuple(reversed(key))
+        # player1 has other lands
+        self.assertNotEqual(get_land_key(game.player1.landscapeCards), key)
+        game = Game(ComputerPlayer, partial(ComputerPlayer, book=OpeningBook(lands={key: arrangement})),
+                    headless=True, seed=1)
+        game.player2.initial_land_setup()
+        state = game.get_state()
+        for pos, land in zip(game.player2.get_initial_land_positions(), arrangement):
+            self.assertEqual(game.mainBoard.get_square(pos).cardId, land)
+            self.assertEqual(state.landPos[land], game.mainBoard.to_int(pos))
+        self.assertEqual(len(get_land_candidates(key)), 45)
+        self.assertEqual(len(set(map(frozenset, get_land_candidates(key)))), 1)
+
+    def test_hands(self):
+        game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=4)
+        pile = game.player1.select_pile()
+        key = get_hand_key(pile)
+        self.assertIn('other', key)
+        hand = ('other', 'other', key[0])
+        book = OpeningBook(hands={key: hand})
+        game = Game(partial(ComputerPlayer, book=book), ComputerPlayer, headless=True, seed=4)
+        game.player1.pick_starting_cards()
+        self.assertEqual(sorted(map(get_card_class, game.player1.cardsInHand)), sorted(hand))
+        candidates = get_hand_candidates(key, 3)
+        self.assertEqual(len(candidates), 3)
+        self.assertTrue(all(len(hand) == 3 and set(hand) <= set(key) for hand in candidates))
+
+    def test_save(self):
+        book = OpeningBook(lands={(1, 2, 3): (3, 2, 1)}, hands={('mill', 'other'): ('mill', 'mill', 'other')})
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'book.json')
+            book.save(path)
+            self.assertEqual(OpeningBook.load(path), book)
+
+    def test_build(self):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            book = build_land_book(executor, 3, maxGames=2, firstGames=1, maxRounds=30)
+            book.update(build_hand_book(executor, 3, deals=20, maxGames=4, firstGames=2, candidates=2, maxKeys=2,
+                                        maxRounds=30))
+        game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=3)
+        for key, arrangement in book.lands.items():
+            self.assertIn(key, [get_land_key(game.player1.landscapeCards), get_land_key(game.player2.landscapeCards)])
+            self.assertEqual(sorted(arrangement), list(key))
+        self.assertLessEqual(len(book.hands), 2)
+        # the book plays a whole game
+        game = Game(partial(ComputerPlayer, book=book), ComputerPlayer, headless=True, seed=3)
+        game.play(maxRounds=20)
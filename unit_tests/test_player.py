@@ -7,6 +7,7 @@ import config
 from board import Board
 from card import Town, Village, Building, Landscape, Knight, Fleet, Action, SettlementSlot
 from enums import Resource
+from journal import NullJournal
 from player import Player
 from util import Pos, Cost
 
@@ -14,6 +15,7 @@ from util import Pos, Cost
 class TestStack(unittest.TestCase):
     def setUp(self):
         self.gameMock = MagicMock()
+        self.gameMock.journal = NullJournal()
         self.handBoardMock = MagicMock()
         Player.__abstractmethods__ = set()
 
@@ -205,6 +207,7 @@ class TestStack(unittest.TestCase):
 
     def test_place_new_land_no_scout(self):
         gameMock = MagicMock()
+        gameMock.journal = NullJournal()
         gameMock.landscapeCards = [
             Landscape('brick', Resource.BRICK, 3),
             Landscape('sheep', Resource.SHEEP, 4),
@@ -254,6 +257,7 @@ class TestStack(unittest.TestCase):
 
     def test_place_new_land_with_scout(self):
         gameMock = MagicMock()
+        gameMock.journal = NullJournal()
         gameMock.landscapeCards = [
             Landscape('brick', Resource.BRICK, 3),
             Landscape('sheep', Resource.SHEEP, 4),
@@ -365,13 +369,13 @@ class TestStack(unittest.TestCase):
             p1.action_card_get_toss_winner('bad_name')
 
         for i in range(1, 6):
-            sys.modules[Player.__module__].randint = MagicMock(return_value=i)
+            self.gameMock.rng.randint = MagicMock(return_value=i)
             winner = p1.action_card_get_toss_winner('ambush')
             self.assertIs(winner, p1 if i <= 5 else p2)
 
         p1.opponent.use_defence = MagicMock(return_value=True)
         for i in range(1, 6):
-            sys.modules[Player.__module__].randint = MagicMock(return_value=i)
+            self.gameMock.rng.randint = MagicMock(return_value=i)
             winner = p1.action_card_get_toss_winner('black_knight')
             self.assertIs(winner, p1 if i <= 2 else p2)
 
@@ -0,0 +1,69 @@
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from time import perf_counter
+
+from computer_player import ComputerPlayer
+from enums import ActionType
+from game import Game
+from mcts_player import MctsPlayer
+from move_generator import END_TURN_MOVE
+from root_parallel import search_worker, merge_root_stats, get_best_move, search_root_parallel
+from rules import generate_turn_moves
+
+
+class TestStack(unittest.TestCase):
+    def setUp(self):
+        game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=6)
+        game.play(maxRounds=12)
+        self.state = game.get_state()
+        for land in self.state.get_lands(self.state.current):
+            self.state.set_land_held(land, 2)
+
+    def test_merge(self):
+        town, path = (ActionType.BUILD_TOWN, -1, 5), (ActionType.BUILD_PATH, -1, 4)
+        merged = merge_root_stats([{town: (3, 2.0), END_TURN_MOVE: (5, 1.0)}, {town: (4, 1.5), path: (1, 1.0)}])
+        self.assertEqual(merged, {town: (7, 3.5), END_TURN_MOVE: (5, 1.0), path: (1, 1.0)})
+        self.assertEqual(get_best_move(merged), town)
+        self.assertEqual(get_best_move({}), END_TURN_MOVE)
+
+    def test_worker_seeds(self):
+        # every worker has its own stream of the seed, the same worker repeats its search
+        results = [search_worker(self.state, 0, [], 40, None, 7, worker, False, 4)[0] for worker in [0, 0, 1]]
+        self.assertEqual(results[0], results[1])
+        self.assertNotEqual(results[0], results[2])
+        self.assertEqual(sum(visits for visits, _ in results[0].values()), 40)
+
+    def test_process_pool(self):
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            move, stats = search_root_parallel(executor, 2, self.state, 0, [], 41, None, 7)
+        self.assertIn(move, generate_turn_moves(self.state))
+        # the budget is split, every worker rounds its share up
+        self.assertEqual(stats.iterations, 42)
+
+    def test_player(self):
+        game = Game(partial(MctsPlayer, iterations=10, workers=2), ComputerPlayer, headless=True, seed=4)
+        player = game.player1
+        assert isinstance(player, MctsPlayer)
+        game.play(maxRounds=6)
+        # Game.play stops the workers
+        self.assertIsNone(player.executor)
+        self.assertGreater(player.totalIterations, 0)
+
+    def test_deadline(self):
+        # the workers are started with the land setup, the decision keeps to its deadline with them
+        game = Game(partial(MctsPlayer, workers=2), ComputerPlayer, headless=True, seed=5)
+        player = game.player1
+        assert isinstance(player, MctsPlayer)
+        try:
+            player.initial_land_setup()
+            assert player.executor is not None
+            self.assertEqual(len(player.executor._processes), 2)
+            for _ in range(3):
+                start = perf_counter()
+                player.search_move(0, start + 0.2)
+                self.assertLess(perf_counter() - start, 0.3)
+                self.assertGreater(player.lastStats.overhead, 0.0)
+            self.assertGreaterEqual(player.dispatchMargin, player.lastStats.overhead)
+        finally:
+            player.close()
@@ -0,0 +1,91 @@
+import unittest
+from random import Random
+
+from card import Buildable
+from computer_player import ComputerPlayer
+from enums import ActionType
+from game import Game
+from move_generator import RESOURCES, get_resource_vector
+from commands import BuildPath, BuildVillage, BuildTown, PlayCard
+from game_state import BOARD_WIDTH, PLAYABLE_CARDS
+from helpers import create_game
+from rules import land_yield, plan_trades, generate_turn_moves, apply_turn_move, play_turn, get_winner, \
+    get_move_cost, card_event_plaque
+
+
+class TestStack(unittest.TestCase):
+    def test_land_yield(self):
+        for seed in range(4):
+            game = create_game(seed, 20)
+            for number in range(1, 7):
+                state = game.get_state()
+                land_yield(state, number)
+                game.land_yield(number)
+                self.assertEqual(state.landHeld, game.get_state().landHeld)
+
+    def test_plan_trades(self):
+        # the same trades as ComputerPlayer plans for the live game
+        for seed in range(6):
+            game = create_game(seed, 10 + seed)
+            state = game.get_state()
+            player = game.currentPlayer
+            assert isinstance(player, ComputerPlayer)
+            for card in game.playableCardsById:
+                if not isinstance(card, Buildable):
+                    continue
+                expected = player._plan_trades(card.cost)
+                tradePlan = plan_trades(state, state.current, tuple(card.cost.get(r) for r in RESOURCES))
+                if expected is None:
+                    self.assertIsNone(tradePlan)
+                else:
+                    self.assertEqual(tradePlan, [(RESOURCES.index(paid), RESOURCES.index(bought))
+                                                 for paid, bought in expected])
+
+    def test_turn_moves(self):
+        for seed in range(4):
+            state = create_game(seed, 30).get_state()
+            moves = generate_turn_moves(state)
+            self.assertEqual(moves[-1][0], ActionType.END_TURN)
+            for move in moves[:-1]:
+                child = state.fork()
+                apply_turn_move(child, move)
+                self.assertTrue(all(held >= 0 for held in child.landHeld))
+                self.assertLess(sum(get_resource_vector(child, state.current)),
+                                sum(get_resource_vector(state, state.current)))
+                self.assertGreater(sum(get_move_cost(move)), 0)
+
+    def test_play_turn(self):
+        state = create_game(3, 4).get_state()
+        rng = Random(1)
+        for turn in range(60):
+            current = state.current
+            play_turn(state, rng)
+            self.assertEqual(state.current, 1 - current)
+            check = state.fork()
+            check.rehash()
+            self.assertEqual(state.zobrist, check.zobrist)
+            self.assertTrue(all(0 <= held for held in state.landHeld))
+            if get_winner(state) is not None:
+                break
+
+    def test_plaque(self):
+        # a church protects the lands next to its town in the game as in the rules
+        game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=1)
+        state = game.get_state()
+        church = next(card for card, playable in enumerate(PLAYABLE_CARDS) if playable.name == 'church')
+        state.add_to_hand(0, church)
+        town = 3 + 8 * BOARD_WIDTH
+        for command in [BuildPath(town + 1), BuildVillage(town), BuildTown(town), PlayCard(church, town - BOARD_WIDTH)]:
+            for land in state.get_lands(0):
+                state.set_land_held(land, 3)
+            command.apply(state)
+        for land in state.get_lands(0):
+            state.set_land_held(land, 1)
+        game.set_state(state)
+
+        card_event_plaque(state)
+        game.card_event_plaque()
+        self.assertEqual(game.get_state().landHeld, state.landHeld)
+        protected = [land for land in state.get_lands(0) if state.landPos[land] % BOARD_WIDTH == 2]
+        self.assertEqual(len(protected), 2)
+        self.assertEqual([state.landHeld[land] for land in protected], [1, 1])
@@ -0,0 +1,28 @@
+import unittest
+
+from selfplay import play_game, run_games
+
+
+class TestStack(unittest.TestCase):
+    def test_play_game(self):
+        result = play_game(3, 42)
+        self.assertEqual(result.gameNo, 3)
+        self.assertEqual(result.seed, 42)
+        self.assertIn(result.winner, [1, 2])
+        self.assertGreater(result.roundNo, 1)
+        self.assertEqual(max(result.victoryPoints), result.victoryPoints[result.winner - 1])
+
+        # the same game number and seed replay the same game
+        self.assertEqual(play_game(3, 42), result)
+
+    def test_max_rounds(self):
+        result = play_game(0, 42, maxRounds=3)
+        self.assertIsNone(result.winner)
+        self.assertEqual(result.roundNo, 4)
+
+    def test_run_games(self):
+        results = list(run_games(4, workers=2, seed=7, maxRounds=20))
+        self.assertEqual(sorted(r.gameNo for r in results), [0, 1, 2, 3])
+        self.assertTrue(all(r.seed == 7 for r in results))
+        for result in results:
+            self.assertEqual(result, play_game(result.gameNo, 7, maxRounds=20))
@@ -0,0 +1,48 @@
+import unittest
+
+from computer_player import ComputerPlayer
+from game import Game
+from state_encoding import encode_state, decode_state, PositionBuffer, HEADER_SIZE, LAND_SLOT_SIZE, NO_POS
+
+
+class TestStack(unittest.TestCase):
+    def test_round_trip(self):
+        game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=5)
+        for _ in range(4):
+            game.play(maxRounds=game.roundNo + 30)
+            state = game.get_state()
+            data = encode_state(state)
+            self.assertIsInstance(data, bytes)
+            self.assertEqual(decode_state(data), state)
+            self.assertEqual(encode_state(decode_state(data)), data)
+
+    def test_land_slots(self):
+        game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=5)
+        state = game.get_state()
+        state.roundNo = 300
+        data = encode_state(state)
+        self.assertEqual(decode_state(data).roundNo, 300)
+
+        for land in game.landscapeCardsById:
+            slot = data[HEADER_SIZE + land.cardId * LAND_SLOT_SIZE:HEADER_SIZE + (land.cardId + 1) * LAND_SLOT_SIZE]
+            self.assertEqual(slot[1], land.diceNumber)
+            self.assertEqual(slot[2], land.resourcesHeld)
+            if land.player is None:
+                self.assertEqual((slot[3], slot[4]), (0, NO_POS))
+            else:
+                self.assertEqual(slot[3], land.player.number)
+                self.assertEqual(slot[4], game.mainBoard.to_int(land.pos))
+
+    def test_position_buffer(self):
+        game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=6)
+        buffer = PositionBuffer()
+        states = []
+        for _ in range(5):
+            game.play(maxRounds=game.roundNo + 10)
+            states.append(game.get_state())
+            self.assertEqual(buffer.append(states[-1]), len(states) - 1)
+
+        self.assertEqual(len(buffer), 5)
+        for idx, state in enumerate(states):
+            self.assertEqual(buffer[idx], state)
+            self.assertEqual(buffer.get_encoded(idx), encode_state(state))
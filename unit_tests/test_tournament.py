@@ -0,0 +1,65 @@
+import unittest
+from dataclasses import replace
+from functools import partial
+
+from computer_player import ComputerPlayer
+from heuristics import DEFAULT_PARAMS
+from mcts_player import MctsPlayer
+from tournament import MatchResult, Ratings, Tournament, parse_entrant, play_match, BASE_RATING
+
+
+class TestStack(unittest.TestCase):
+    def test_ratings(self):
+        ratings = Ratings(['a', 'b', 'c'])
+        for stream in range(20):
+            ratings.add(MatchResult('a', 'b', stream, 1 if stream % 4 else 2, 10))
+            ratings.add(MatchResult('c', 'b', stream, None, 10))
+        table = ratings.get_table()
+        self.assertEqual([rating.name for rating in table], ['a', 'c', 'b'])
+        self.assertAlmostEqual(sum(rating.rating for rating in table) / 3, BASE_RATING)
+        self.assertEqual([rating.games for rating in table], [20, 20, 40])
+        self.assertEqual(table[0].score, 0.75)
+        # a 3:1 score is about 190 Elo points
+        self.assertAlmostEqual(table[0].rating - table[2].rating, 190, delta=25)
+        # more games, narrower interval
+        self.assertLess(table[2].error, table[0].error)
+        # without any game everybody is equal
+        self.assertEqual({rating.rating for rating in Ratings(['a', 'b']).get_table()}, {BASE_RATING})
+
+    def test_play_match(self):
+        winner, roundNo = play_match(ComputerPlayer, ComputerPlayer, 5, 0, 100)
+        self.assertIn(winner, [1, 2])
+        self.assertEqual(play_match(ComputerPlayer, ComputerPlayer, 5, 0, 100), (winner, roundNo))
+
+    def test_round_robin(self):
+        tournament = Tournament(seed=3, maxRounds=60, workers=1)
+        tournament.register('computer', ComputerPlayer)
+        tournament.register_params('mills', replace(DEFAULT_PARAMS, millPriority=-2))
+        tournament.register('villages', partial(ComputerPlayer, params=replace(DEFAULT_PARAMS, villageOrder=-1)))
+        results = []
+        table = tournament.round_robin(onResult=results.append)
+        self.assertEqual(len(results), 6)
+        self.assertEqual(sorted(rating.name for rating in table), ['computer', 'mills', 'villages'])
+        self.assertEqual(sum(rating.games for rating in table), 12)
+        # both seats of every pairing on one stream
+        for stream in range(3):
+            seats = [(result.first, result.second) for result in results if result.stream == stream]
+            self.assertEqual(len(seats), 2)
+            self.assertEqual(seats[0], tuple(reversed(seats[1])))
+
+    def test_swiss(self):
+        tournament = Tournament(seed=4, maxRounds=40, workers=1)
+        for idx in range(5):
+            tournament.register_params(f'p{idx}', replace(DEFAULT_PARAMS, cardOrder=idx - 2))
+        table = tournament.swiss(2)
+        # 2 pairings a round, one entrant sits out
+        self.assertEqual(len(tournament.results), 8)
+        self.assertEqual(len(table), 5)
+        pairs = {frozenset((result.first, result.second)) for result in tournament.results}
+        self.assertEqual(len(pairs), 4)
+
+    def test_parse_entrant(self):
+        self.assertEqual(parse_entrant('computer'), ('computer', ComputerPlayer))
+        name, playerType = parse_entrant('fast=mcts:iterations=20,reuseTree=false')
+        self.assertEqual(name, 'fast')
+        self.assertEqual((playerType.func, playerType.keywords), (MctsPlayer, {'iterations': 20, 'reuseTree': False}))
@@ -0,0 +1,57 @@
+import unittest
+
+from transposition import TranspositionTable, SLOT_SIZE
+
+
+class TestStack(unittest.TestCase):
+    def test_store_and_lookup(self):
+        table = TranspositionTable(1024)
+        self.assertIsNone(table.lookup(12345))
+        table.store(12345, 0.5, 10, 3)
+        self.assertEqual(table.lookup(12345), (0.5, 10, 3))
+        table.store(12345, 0.25, 11, 3)
+        self.assertEqual(table.lookup(12345), (0.25, 11, 3))
+        self.assertEqual(len(table), 1)
+        self.assertEqual((table.hits, table.misses), (2, 1))
+
+    def test_memory_cap(self):
+        table = TranspositionTable(100 * SLOT_SIZE)
+        self.assertEqual(table.get_memory_size(), 100 * SLOT_SIZE)
+        for key in range(10000):
+            table.store(key * 7919 + 1, 1.0, 1)
+        self.assertEqual(len(table), 100)
+        self.assertEqual(table.get_memory_size(), 100 * SLOT_SIZE)
+
+    def test_two_tier_replacement(self):
+        table = TranspositionTable(2 * SLOT_SIZE)  # a single bucket
+        table.store(1, 1.0, 1, depth=5)
+        table.store(2, 2.0, 1, depth=1)
+        table.store(3, 3.0, 1, depth=2)
+        # the deep entry stays, the always-replace slot keeps only the latest shallow one
+        self.assertEqual(table.lookup(1), (1.0, 1, 5))
+        self.assertIsNone(table.lookup(2))
+        self.assertEqual(table.lookup(3), (3.0, 1, 2))
+
+        # a deeper entry takes the first slot, the replaced one moves down
+        table.store(4, 4.0, 1, depth=7)
+        self.assertEqual(table.lookup(4), (4.0, 1, 7))
+        self.assertEqual(table.lookup(1), (1.0, 1, 5))
+        self.assertIsNone(table.lookup(3))
+
+        # entries of a previous search do not block the first slot
+        table.new_search()
+        table.store(5, 5.0, 1, depth=0)
+        self.assertEqual(table.lookup(5), (5.0, 1, 0))
+        self.assertEqual(table.lookup(4), (4.0, 1, 7))
+        self.assertIsNone(table.lookup(1))
+        self.assertEqual(table.replacements, 3)
+
+    def test_add_result(self):
+        table = TranspositionTable(1024)
+        for result in [1.0, 0.0, 1.0, 1.0]:
+            table.add_result(99, result, 2)
+        self.assertEqual(table.lookup(99), (0.75, 4, 2))
+
+        table.clear()
+        self.assertEqual(len(table), 0)
+        self.assertIsNone(table.lookup(99))
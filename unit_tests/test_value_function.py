@@ -0,0 +1,114 @@
+import os, tempfile, unittest
+from functools import partial
+from random import Random
+
+from computer_player import ComputerPlayer
+from expectimax import ExpectimaxSearch
+from game import Game
+from mcts import MctsSearch
+from mcts_player import MctsPlayer
+
+# numpy is needed only by the learned value function
+try:
+    import numpy as np
+    from learned_player import LearnedPlayer
+    from value_function import ValueFunction, collect_samples, encode_states, HAND_OFFSET, VECTOR_SIZE
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestStack(unittest.TestCase):
+    def setUp(self):
+        game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=2)
+        game.play(maxRounds=20)
+        self.state = game.get_state()
+
+    def test_encoding(self):
+        vectors = encode_states([self.state, self.state.fork()], 1)
+        self.assertEqual(vectors.shape, (2, VECTOR_SIZE))
+        self.assertTrue((vectors[0] == vectors[1]).all())
+        self.assertEqual(vectors[0, HAND_OFFSET:].sum(), len(self.state.hands[1]))
+        self.assertFalse((vectors[0] == encode_states([self.state], 0)[0]).all())
+
+    def test_fit(self):
+        # the outcome depends on a few of the features only, both models find it
+        rng = np.random.default_rng(1)
+        x = rng.standard_normal((2000, VECTOR_SIZE)).astype(np.float32)
+        y = (x[:, 0] - x[:, 3] + 0.5 * x[:, HAND_OFFSET] > 0).astype(np.float32)
+        for hiddenSize in (0, 8):
+            model = ValueFunction(hiddenSize)
+            loss = model.fit(x[:1500], y[:1500], epochs=30, learningRate=0.03)
+            self.assertLess(loss, 0.3)
+            accuracy = np.mean((model.predict(x[1500:]) > 0.5) == (y[1500:] > 0.5))
+            self.assertGreater(accuracy, 0.9)
+
+    def test_batch(self):
+        # a batch gives the same values as the positions one by one
+        model = ValueFunction(8)
+        x, y = collect_samples(2, seed=3)
+        self.assertEqual(len(x), len(y))
+        self.assertEqual(x.shape[1], VECTOR_SIZE)
+        # the games are the substreams, a later first game continues them
+        second, _ = collect_samples(1, seed=3, firstGame=1)
+        self.assertTrue((second == x[len(x) - len(second):]).all())
+        # undecided games give no positions and nothing can be fitted to them
+        empty, _ = collect_samples(1, seed=3, maxRounds=2)
+        self.assertEqual(empty.shape, (0, VECTOR_SIZE))
+        self.assertRaises(AssertionError, ValueFunction(0).fit, empty, np.zeros(0, dtype=np.float32))
+        model.fit(x, y, epochs=2)
+        states = [self.state, self.state.clone()]
+        states[1].set_land_held(next(states[1].get_lands(0)), 0)
+        values = model.evaluate_states(states)
+        self.assertEqual(values.shape, (2,))
+        self.assertAlmostEqual(float(values[1]), model.evaluate(states[1]), places=5)
+        self.assertTrue(((values > 0) & (values < 1)).all())
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'value.npz')
+            model.save(path)
+            loaded = ValueFunction.load(path)
+        self.assertTrue(np.allclose(loaded.evaluate_states(states), values))
+
+    def test_player(self):
+        model = ValueFunction(0)
+        x, y = collect_samples(2, seed=4)
+        model.fit(x, y, epochs=2)
+        game = Game(partial(LearnedPlayer, model=model), ComputerPlayer, headless=True, seed=5)
+        game.play(maxRounds=10)
+        self.assertGreater(len(game.player1.cardsInHand), 0)
+
+    def test_search(self):
+        # both searches take the model as their evaluator, expectimax passes it the leaves in batches
+        model = ValueFunction(0)
+        x, y = collect_samples(2, seed=4)
+        model.fit(x, y, epochs=2)
+        batches = []
+
+        def evaluator(states):
+            batches.append(len(states))
+            return model.evaluate_states(states)
+
+        search = ExpectimaxSearch(2, maxNodes=None, evaluator=evaluator)
+        move, value, _ = search.search(self.state)
+        self.assertTrue(0 <= value <= 1)
+        self.assertGreater(max(batches), 10)
+        # the same values one position at a time (up to the float32 rounding of the batches)
+        batches.clear()
+        search = ExpectimaxSearch(2, maxNodes=None, evaluator=evaluator)
+        search.batchLeaves = False
+        singleMove, singleValue, _ = search.search(self.state)
+        self.assertEqual(singleMove, move)
+        self.assertAlmostEqual(singleValue, value, places=5)
+        self.assertEqual(max(batches), 1)
+
+        batches.clear()
+        mcts = MctsSearch(Random(1), evaluator=evaluator)
+        mcts.set_root(self.state)
+        self.assertEqual(mcts.run(iterations=20).iterations, 20)
+        self.assertGreater(len(batches), 0)
+
+        game = Game(partial(MctsPlayer, iterations=5, evaluator=model.evaluate_states), ComputerPlayer, headless=True,
+                    seed=5)
+        game.play(maxRounds=3)
+        self.assertGreater(game.player1.totalIterations, 0)
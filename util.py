@@ -1,13 +1,13 @@
 from __future__ import annotations
-from typing import Union, Tuple, TYPE_CHECKING, Dict, Type, List
+from typing import Union, Tuple, TYPE_CHECKING, Dict, Type, List, Optional, Iterable
 from dataclasses import dataclass
-from random import randint
+from random import Random, SystemRandom
 import config
 from config import RESOURCE_LIST
 from enums import DiceEvent, Resource
 if TYPE_CHECKING:
     from board import Board
-    from card import Knight, Fleet, Landscape, Playable
+    from card import Knight, Fleet, Landscape, Playable, Settlement
     Pile = List[Playable]
 
 MILLS_EFFECTS: Dict[Resource, str] = {
@@ -22,21 +22,31 @@ MILLS_EFFECTS: Dict[Resource, str] = {
 # TODO - unit test
 def display_cards_on_board(pile: Pile | List[Landscape], board: Board) -> None:
     board.clear()
-    for idx, card in enumerate(pile):
+    # hands and piles can outgrow their boards, the cards that do not fit are not shown
+    for idx, card in enumerate(pile[:len(board.squares)]):
         board.set_square(board.to_pos(idx), card)
 
 # TODO - unit test
-def is_land_protected_from_plaque(self, land: Landscape) -> bool:
-    for settlement in land.settlements:
+def is_land_protected_from_plaque(settlements: Iterable[Settlement]) -> bool:
+    # settlements - the ones next to the land, see Game.get_land_settlements
+    for settlement in settlements:
         if 'church' in map(lambda x: x.name, settlement.cards):
             return True
     return False
 
-def throw_yield_dice() -> int:
-    return randint(1, 6)
+def create_rng(seed: Optional[int]=None, stream: Optional[int]=None) -> Tuple[Random, int]:
+    # every game owns its random stream, the global random module is never seeded nor used
+    # stream allows independent substreams of one seed, e.g. one per worker process
+    if seed is None:
+        seed = SystemRandom().getrandbits(63)
+    # seeding by str goes through sha512 -> nearby seeds/streams give unrelated sequences in every process
+    return Random(f'{seed}/{stream if stream is not None else 0}'), seed
 
-def throw_event_dice() -> DiceEvent:
-    return DiceEvents[randint(1, 6)]
+def throw_yield_dice(rng: Random) -> int:
+    return rng.randint(1, 6)
+
+def throw_event_dice(rng: Random) -> DiceEvent:
+    return DiceEvents[rng.randint(1, 6)]
 
 def is_next_to(board: Board, pos: Pos, cardType: Type) -> bool:
     if pos.x + 1 < board.size.x and isinstance(board.get_square(pos.right()), cardType):
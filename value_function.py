@@ -0,0 +1,199 @@
+from __future__ import annotations
+import argparse
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from computer_player import ComputerPlayer
+from game import Game
+from game_state import GameState, PLAYABLE_CARDS, FEATURES_CNT
+from util import create_rng
+
+# the feature vector of a position from the point of view of one player:
+#   own evaluation terms (GameState.features), the opponent's terms, victory points and battle strength of both,
+#   whether the player is on turn, a 0/1 slot of every playable card for the own hand (the opponent's one is hidden)
+OPPONENT_OFFSET = FEATURES_CNT
+EXTRA_OFFSET = 2 * FEATURES_CNT
+EXTRA_CNT = 5
+HAND_OFFSET = EXTRA_OFFSET + EXTRA_CNT
+VECTOR_SIZE = HAND_OFFSET + len(PLAYABLE_CARDS)
+
+DEFAULT_HIDDEN = 8
+DEFAULT_EPOCHS = 5
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_LEARNING_RATE = 0.003
+DEFAULT_MAX_ROUNDS = 300
+
+
+def fill_feature_vector(state: GameState, player: int, vector: np.ndarray) -> None:
+    # vector has to be zeroed
+    opponent = 1 - player
+    features = state.features
+    vector[:FEATURES_CNT] = features[player * FEATURES_CNT:(player + 1) * FEATURES_CNT]
+    vector[OPPONENT_OFFSET:EXTRA_OFFSET] = features[opponent * FEATURES_CNT:(opponent + 1) * FEATURES_CNT]
+    vector[EXTRA_OFFSET:HAND_OFFSET] = (state.get_victory_points(player), state.get_victory_points(opponent),
+                                        state.get_battle_strength(player), state.get_battle_strength(opponent),
+                                        state.current == player)
+    for card in state.hands[player]:
+        vector[HAND_OFFSET + card] = 1
+
+def encode_states(states: Sequence[GameState], player: int=0) -> np.ndarray:
+    # one row per state, the input of ValueFunction.predict
+    vectors = np.zeros((len(states), VECTOR_SIZE), dtype=np.float32)
+    for row, state in enumerate(states):
+        fill_feature_vector(state, player, vectors[row])
+    return vectors
+
+
+class ValueFunction:
+    # probability that the player of the feature vector wins, a logistic regression without hidden units or an MLP
+    # with one hidden ReLU layer, everything is plain NumPy and works on whole batches of positions
+    # the inputs are standardized with the mean and scale of the training data
+    def __init__(self, hiddenSize: int=DEFAULT_HIDDEN, seed: int=0):
+        rng = np.random.default_rng(seed)
+        self.hiddenSize: int = hiddenSize
+        self.mean: np.ndarray = np.zeros(VECTOR_SIZE, dtype=np.float32)
+        self.scale: np.ndarray = np.ones(VECTOR_SIZE, dtype=np.float32)
+        # weights and biases of the layers, the last layer has one output
+        self.params: List[np.ndarray] = []
+        inputSize = VECTOR_SIZE
+        if hiddenSize > 0:
+            weights = rng.standard_normal((VECTOR_SIZE, hiddenSize)) * np.sqrt(2 / VECTOR_SIZE)
+            self.params += [weights.astype(np.float32), np.zeros(hiddenSize, dtype=np.float32)]
+            inputSize = hiddenSize
+        self.params += [np.zeros((inputSize, 1), dtype=np.float32), np.zeros(1, dtype=np.float32)]
+
+    def _forward(self, x: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        # logits and the hidden activations
+        x = (x - self.mean) / self.scale
+        hidden = None
+        if self.hiddenSize > 0:
+            hidden = np.maximum(x @ self.params[0] + self.params[1], 0)
+            x = hidden
+        return (x @ self.params[-2] + self.params[-1])[:, 0], hidden
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        logits, _ = self._forward(x)
+        return 1 / (1 + np.exp(-logits))
+
+    def evaluate_states(self, states: Sequence[GameState], player: int=0) -> np.ndarray:
+        return self.predict(encode_states(states, player))
+
+    def evaluate(self, state: GameState) -> float:
+        # value for player 0 as evaluation.evaluate, one position is a batch of one
+        return float(self.evaluate_states([state])[0])
+
+    def fit(self, x: np.ndarray, y: np.ndarray, epochs: int=DEFAULT_EPOCHS, batchSize: int=DEFAULT_BATCH_SIZE,
+            learningRate: float=DEFAULT_LEARNING_RATE, seed: int=0) -> float:
+        # minimizes the cross entropy of the predictions and the outcomes (1 won, 0 lost) by Adam, returns the loss of
+        # the last epoch
+        assert len(x) > 0, 'no positions to fit'
+        rng = np.random.default_rng(seed)
+        self.mean = x.mean(axis=0).astype(np.float32)
+        self.scale = np.maximum(x.std(axis=0), 1e-3).astype(np.float32)
+        moments = [np.zeros_like(param) for param in self.params]
+        squares = [np.zeros_like(param) for param in self.params]
+        beta1, beta2, step = 0.9, 0.999, 0
+        loss = 0.0
+        for _ in range(epochs):
+            order = rng.permutation(len(x))
+            losses = []
+            for start in range(0, len(x), batchSize):
+                batch = order[start:start + batchSize]
+                grads, batchLoss = self._get_gradients(x[batch], y[batch])
+                losses.append(batchLoss * len(batch))
+                step += 1
+                for param, grad, moment, square in zip(self.params, grads, moments, squares):
+                    moment *= beta1
+                    moment += (1 - beta1) * grad
+                    square *= beta2
+                    square += (1 - beta2) * grad * grad
+                    param -= learningRate * (moment / (1 - beta1 ** step)) / \
+                        (np.sqrt(square / (1 - beta2 ** step)) + 1e-8)
+            loss = sum(losses) / len(x)
+        return loss
+
+    def _get_gradients(self, x: np.ndarray, y: np.ndarray) -> Tuple[List[np.ndarray], float]:
+        logits, hidden = self._forward(x)
+        predictions = 1 / (1 + np.exp(-logits))
+        eps = 1e-7
+        loss = float(-np.mean(y * np.log(predictions + eps) + (1 - y) * np.log(1 - predictions + eps)))
+        dLogits = ((predictions - y) / len(x))[:, None].astype(np.float32)
+        inputs = (x - self.mean) / self.scale
+        if hidden is None:
+            return [inputs.T @ dLogits, dLogits.sum(axis=0)], loss
+        dHidden = (dLogits @ self.params[2].T) * (hidden > 0)
+        return [inputs.T @ dHidden, dHidden.sum(axis=0), hidden.T @ dLogits, dLogits.sum(axis=0)], loss
+
+    def get_card_scores(self, state: GameState, player: int, cards: Sequence[int]) -> np.ndarray:
+        # value of the position with each of the cards added to the player's hand, all in one batch
+        vectors = np.zeros((len(cards), VECTOR_SIZE), dtype=np.float32)
+        for row, card in enumerate(cards):
+            child = state.fork()
+            child.add_to_hand(player, card)
+            fill_feature_vector(child, player, vectors[row])
+        return self.predict(vectors)
+
+    def save(self, path: str) -> None:
+        np.savez(path, *self.params, hiddenSize=self.hiddenSize, mean=self.mean, scale=self.scale)
+
+    @staticmethod
+    def load(path: str) -> ValueFunction:
+        with np.load(path) as data:
+            model = ValueFunction(int(data['hiddenSize']))
+            model.mean, model.scale = data['mean'], data['scale']
+            model.params = [data[f'arr_{idx}'] for idx in range(len(model.params))]
+        return model
+
+
+def collect_samples(gamesCnt: int, seed: int, maxRounds: int=DEFAULT_MAX_ROUNDS,
+                    firstGame: int=0) -> Tuple[np.ndarray, np.ndarray]:
+    # the position after every turn of ComputerPlayer self-play games from the point of view of both players,
+    # labeled by the outcome of the game, undecided games are left out
+    # the games are the seed substreams firstGame, firstGame + 1, ...
+    vectors: List[np.ndarray] = []
+    outcomes: List[float] = []
+    for gameNo in range(firstGame, firstGame + gamesCnt):
+        game = Game(ComputerPlayer, ComputerPlayer, headless=True, seed=seed, stream=gameNo)
+        states: List[GameState] = []
+        winner = game.play(maxRounds, lambda played: states.append(played.get_state()))
+        if winner is None:
+            continue
+        for player in (0, 1):
+            vectors.append(encode_states(states, player))
+            outcomes += [1.0 if winner is (game.player1, game.player2)[player] else 0.0] * len(states)
+    if not vectors:
+        return np.zeros((0, VECTOR_SIZE), dtype=np.float32), np.zeros(0, dtype=np.float32)
+    return np.concatenate(vectors), np.array(outcomes, dtype=np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='train the value function on self-play games')
+    parser.add_argument('-n', '--games', type=int, default=200, help='number of self-play games')
+    parser.add_argument('-s', '--seed', type=int, default=None, help='seed of the games (default: random)')
+    parser.add_argument('--hidden', type=int, default=DEFAULT_HIDDEN, help='hidden units, 0 for a linear model')
+    parser.add_argument('--epochs', type=int, default=DEFAULT_EPOCHS)
+    parser.add_argument('-o', '--output', default='value_function.npz', help='file the weights are saved to')
+    args = parser.parse_args()
+
+    _, seed = create_rng(args.seed)
+    start = time.perf_counter()
+    # the last tenth of the games (whole games, both points of view) checks the fit
+    heldOutGames = args.games // 10
+    x, y = collect_samples(args.games - heldOutGames, seed)
+    xHeldOut, yHeldOut = collect_samples(heldOutGames, seed, firstGame=args.games - heldOutGames)
+    print(f'{len(x)} + {len(xHeldOut)} held out positions from {args.games} games, seed {seed}, '
+          f'{time.perf_counter() - start:.1f}s', flush=True)
+    if not len(x):
+        print('no decided game to train on')
+        return
+    model = ValueFunction(args.hidden)
+    loss = model.fit(x, y, args.epochs)
+    accuracy = float(np.mean((model.predict(xHeldOut) > 0.5) == (yHeldOut > 0.5))) if len(xHeldOut) else 0.0
+    print(f'training loss {loss:.4f}, held out accuracy {accuracy:.3f}')
+    model.save(args.output)
+
+
+if __name__ == '__main__':
+    main()